@@ -1,78 +1,474 @@
-class Link:
+import itertools
+import sys
+
+_UNSET = object()
+
+# Source of the uid of every Link and Card; unique for the life of the process
+_uids = itertools.count(1)
+
+
+def _interned(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Tracked:
+    """Base class that reports changes of the fields named in _tracked_fields.
+
+    The first assignment of a field (from __init__) is not a change; later
+    assignments of a different value call self._field_changed(name, old, new).
+    Fields in _interned_fields store interned strings, so the few style
+    values repeated across thousands of links share one object each.
+
+    Only assignment goes through Python code; reading a field is a plain
+    slot or instance attribute lookup.
+    """
+
+    __slots__ = ()
+    _tracked_fields = frozenset()
+    _interned_fields = frozenset()
+
+    def __setattr__(self, name, value):
+        if name not in self._tracked_fields:
+            object.__setattr__(self, name, value)
+            return
+        if name in self._interned_fields:
+            value = _interned(value)
+        old = getattr(self, name, _UNSET)
+        object.__setattr__(self, name, value)
+        if old is not _UNSET and old != value:
+            self._field_changed(name, old, value)
+
+
+class Change:
+    """One entry of the change journal of a StartupPageModel.
+
+    op is one of 'set', 'add_link', 'remove_link', 'reorder_links',
+    'add_card', 'remove_card', 'move_card' and 'reorder_cards'. card is the
+    card affected (None for page-level changes), target the object that
+    changed and detail holds op-specific values, e.g. (field, old, new)
+    for 'set'. Batched operations record one entry per card or link.
+    """
+
+    __slots__ = ('op', 'card', 'target', 'detail')
+
+    def __init__(self, op, card, target, detail=None):
+        self.op = op
+        self.card = card
+        self.target = target
+        self.detail = detail
+
+    def __repr__(self):
+        title = self.card.title if self.card is not None else None
+        return f"Change(op='{self.op}', card='{title}', detail={self.detail!r})"
+
+
+class Link(_Tracked):
     """Represents a link item within a card section."""
     
+    __slots__ = ('uid', 'name', 'url', 'font_size', 'font_color', 'dirty', '_card')
+    _tracked_fields = frozenset(('name', 'url', 'font_size', 'font_color'))
+    _interned_fields = frozenset(('font_size', 'font_color'))
+    
     def __init__(self, name="", url="", font_size="", font_color=""):
-        self.name = name
-        self.url = url
-        self.font_size = font_size  # Empty string means default size
-        self.font_color = font_color  # Empty string means default color
+        # Initial values are not changes, so the slots are set directly
+        init = object.__setattr__
+        init(self, 'uid', next(_uids))
+        init(self, '_card', None)  # Card the link belongs to
+        init(self, 'dirty', False)
+        init(self, 'name', name)
+        init(self, 'url', url)
+        init(self, 'font_size', _interned(font_size))  # Empty string means default size
+        init(self, 'font_color', _interned(font_color))  # Empty string means default color
+    
+    def _field_changed(self, name, old, new):
+        self.dirty = True
+        if self._card is not None:
+            self._card._record('set', self, (name, old, new))
+    
+    def to_dict(self):
+        """Return a JSON-serializable dict; empty style fields are omitted."""
+        data = {"name": self.name, "url": self.url}
+        if self.font_size:
+            data["font_size"] = self.font_size
+        if self.font_color:
+            data["font_color"] = self.font_color
+        return data
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create a Link from a dict produced by to_dict()."""
+        return cls(
+            name=data.get("name", ""),
+            url=data.get("url", ""),
+            font_size=data.get("font_size", ""),
+            font_color=data.get("font_color", ""),
+        )
     
     def __repr__(self):
         return f"Link(name='{self.name}', url='{self.url}', font_size='{self.font_size}', font_color='{self.font_color}')"
 
 
-class Card:
-    """Represents a card section in the startup page."""
+class Card(_Tracked):
+    """Represents a card section in the startup page.
+    
+    links and subsections should be changed through the methods below (or by
+    assigning a new list to links) so the change is recorded.
+    
+    A card created with Card.lazy() reads its links on first access to
+    links or subsections; until then only its title is known.
+    """
+    
+    __slots__ = ('uid', 'title', 'icon', 'background_color', 'dirty',
+                 '_links', '_subsections', '_loader', '_model')
+    _tracked_fields = frozenset(('title', 'icon', 'background_color'))
+    _interned_fields = frozenset(('icon', 'background_color'))
     
     def __init__(self, title="", icon="", background_color=""):
-        self.title = title
-        self.icon = icon
-        self.background_color = background_color  # Card background color
-        self.links = []  # List of Link objects
-        self.subsections = {}  # Dictionary of title -> list of Link objects
+        # Initial values are not changes, so the slots are set directly
+        init = object.__setattr__
+        init(self, 'uid', next(_uids))
+        init(self, '_model', None)  # StartupPageModel the card belongs to
+        init(self, 'dirty', False)
+        init(self, 'title', title)
+        init(self, 'icon', _interned(icon))
+        init(self, 'background_color', _interned(background_color))  # Card background color
+        init(self, '_links', [])  # List of Link objects
+        init(self, '_subsections', {})  # Dictionary of title -> list of Link objects
+        init(self, '_loader', None)  # Returns (links, subsections) of a lazy card
+    
+    @classmethod
+    def lazy(cls, title, loader, background_color="", icon=""):
+        """Create a card whose links are read by loader() when first needed.
+        
+        loader returns (links, subsections) as they would be passed to
+        add_link() and set_subsection_links(); loading is not a change.
+        """
+        card = cls(title=title, icon=icon, background_color=background_color)
+        object.__setattr__(card, '_loader', loader)
+        return card
+    
+    @property
+    def is_loaded(self):
+        """False for a lazy card whose links have not been read yet."""
+        return self._loader is None
+    
+    def _load(self):
+        loader = self._loader
+        object.__setattr__(self, '_loader', None)
+        links, subsections = loader()
+        for link in links:
+            link._card = self
+        for section in subsections.values():
+            for link in section:
+                link._card = self
+        object.__setattr__(self, '_links', list(links))
+        object.__setattr__(self, '_subsections', dict(subsections))
+    
+    @property
+    def links(self):
+        """Links of the main section of the card."""
+        if self._loader is not None:
+            self._load()
+        return self._links
+    
+    @property
+    def subsections(self):
+        """Dictionary of subsection title -> list of Link objects."""
+        if self._loader is not None:
+            self._load()
+        return self._subsections
+    
+    @links.setter
+    def links(self, links):
+        links = list(links)
+        for link in links:
+            link._card = self
+        if self._loader is not None:
+            # The subsections are kept, so they have to be read first
+            self._load()
+        self._links = links
+        self._record('reorder_links', self, None)
+    
+    def _field_changed(self, name, old, new):
+        self._record('set', self, (name, old, new))
+    
+    def _record(self, op, target, detail=None):
+        self.dirty = True
+        if self._model is not None:
+            self._model._record(op, self, target, detail)
     
     def add_link(self, link):
         """Add a link to the main section of the card."""
+        link._card = self
         self.links.append(link)
+        self._record('add_link', link, None)
     
     def add_subsection_link(self, subsection_title, link):
         """Add a link to a subsection of the card."""
         if subsection_title not in self.subsections:
             self.subsections[subsection_title] = []
         
+        link._card = self
         self.subsections[subsection_title].append(link)
+        self._record('add_link', link, subsection_title)
+    
+    def set_subsection_links(self, subsection_title, links):
+        """Replace the links of a subsection, e.g. to reorder them."""
+        links = list(links)
+        for link in links:
+            link._card = self
+        self.subsections[subsection_title] = links
+        self._record('reorder_links', self, subsection_title)
     
     def remove_link(self, link):
         """Remove a link from the main section of the card."""
-        if link in self.links:
-            self.links.remove(link)
+        self.remove_links([link])
     
     def remove_subsection_link(self, subsection_title, link):
         """Remove a link from a subsection of the card."""
-        if subsection_title in self.subsections and link in self.subsections[subsection_title]:
-            self.subsections[subsection_title].remove(link)
-            
-            # Remove subsection if it's empty
-            if not self.subsections[subsection_title]:
-                del self.subsections[subsection_title]
+        self.remove_links([link], subsection_title)
+    
+    def remove_links(self, links, subsection_title=None):
+        """Remove several links from the main section or a subsection at once.
+        
+        The section is rebuilt in a single pass, so removing k links costs
+        O(n + k) rather than a scan of the section per link.
+        """
+        if subsection_title is None:
+            section = self.links
+        elif subsection_title in self.subsections:
+            section = self.subsections[subsection_title]
+        else:
+            return
+        
+        doomed = {link.uid for link in links if link._card is self}
+        if not doomed:
+            return
+        removed = [link for link in section if link.uid in doomed]
+        section[:] = [link for link in section if link.uid not in doomed]
+        
+        # Remove subsection if it's empty
+        if subsection_title is not None and not section:
+            del self.subsections[subsection_title]
+        for link in removed:
+            self._record('remove_link', link, subsection_title)
+    
+    def mark_clean(self):
+        """Clear the dirty flags of the card and its links."""
+        self.dirty = False
+        if self._loader is not None:
+            # Links read later start out clean
+            return
+        for link in self._links:
+            link.dirty = False
+        for links in self._subsections.values():
+            for link in links:
+                link.dirty = False
+    
+    def to_dict(self):
+        """Return a JSON-serializable dict of the card and its links.
+        
+        The card's own fields come before its links, so a reader can take
+        them from the start of the serialized card (see model_store). A lazy
+        card that has not been loaded yet stays unloaded.
+        """
+        if self._loader is not None:
+            links, subsections = self._loader()
+        else:
+            links, subsections = self._links, self._subsections
+        data = {"title": self.title}
+        if self.icon:
+            data["icon"] = self.icon
+        if self.background_color:
+            data["background_color"] = self.background_color
+        data["links"] = [link.to_dict() for link in links]
+        if subsections:
+            # A list of pairs keeps the subsection order explicit
+            data["subsections"] = [
+                [title, [link.to_dict() for link in section]]
+                for title, section in subsections.items()
+            ]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create a Card from a dict produced by to_dict()."""
+        card = cls(
+            title=data.get("title", ""),
+            icon=data.get("icon", ""),
+            background_color=data.get("background_color", ""),
+        )
+        for link_data in data.get("links", []):
+            card.add_link(Link.from_dict(link_data))
+        for title, links in data.get("subsections", []):
+            card.set_subsection_links(title, [Link.from_dict(link_data) for link_data in links])
+        card.mark_clean()
+        return card
     
     def __repr__(self):
         return f"Card(title='{self.title}', links={len(self.links)}, subsections={len(self.subsections)})"
 
 
-class StartupPageModel:
-    """Model representing the entire Startup Page."""
+class StartupPageModel(_Tracked):
+    """Model representing the entire Startup Page.
+    
+    Every change made through the model, its cards or their links is
+    appended to journal as a Change and passed to the registered listeners.
+    dirty is True while there are changes that have not been saved.
+    """
+    
+    _tracked_fields = frozenset(('css_styles', 'dark_mode_enabled', 'last_updated'))
     
     def __init__(self):
-        self.cards = []  # List of Card objects
+        self.journal = []  # Change objects recorded since the last mark_clean()
+        self.dirty = False
+        self._listeners = []
+        self._cards = []  # List of Card objects
+        self._cards_by_uid = {}  # uid -> Card, for every card in _cards
+        self._positions = None  # uid -> index in _cards, rebuilt when needed
         self.css_styles = ""  # CSS styles from the HTML file
         self.dark_mode_enabled = False
         self.last_updated = ""
+        self.layout = None  # PageLayout of the HTML file last loaded or saved
+        self.model_layout = None  # PageLayout of the model file last loaded or saved
+    
+    @property
+    def cards(self):
+        """Cards of the page, in order."""
+        return self._cards
+    
+    @cards.setter
+    def cards(self, cards):
+        cards = list(cards)
+        for card in cards:
+            card._model = self
+        self._cards = cards
+        self._cards_by_uid = {card.uid: card for card in cards}
+        self._positions = None
+        self._record('reorder_cards', None, self)
+    
+    def _field_changed(self, name, old, new):
+        self._record('set', None, self, (name, old, new))
+    
+    def _record(self, op, card, target, detail=None):
+        change = Change(op, card, target, detail)
+        self.dirty = True
+        self.journal.append(change)
+        for listener in self._listeners:
+            listener(change)
+    
+    def add_listener(self, listener):
+        """Call listener(change) for every change recorded from now on."""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        """Stop calling a listener added with add_listener()."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def mark_clean(self):
+        """Forget recorded changes, e.g. after the page has been saved.
+        
+        Only the cards and links named in the journal are visited, so this
+        is cheap when little has changed.
+        """
+        for change in self.journal:
+            if change.card is not None:
+                change.card.dirty = False
+            if isinstance(change.target, Link):
+                change.target.dirty = False
+        self.journal = []
+        self.dirty = False
+    
+    def dirty_cards(self):
+        """Return the cards changed since the last mark_clean(), in page order."""
+        changed = {id(change.card) for change in self.journal if change.card is not None}
+        return [card for card in self._cards if id(card) in changed]
+    
+    def card_by_uid(self, uid):
+        """Return the card with the given uid, or None."""
+        return self._cards_by_uid.get(uid)
+    
+    def index_of(self, card):
+        """Return the position of a card in cards, or None if it is not there."""
+        if self._cards_by_uid.get(card.uid) is not card:
+            return None
+        if self._positions is None:
+            self._positions = {card.uid: i for i, card in enumerate(self._cards)}
+        return self._positions[card.uid]
     
     def add_card(self, card):
         """Add a card to the model."""
-        self.cards.append(card)
+        card._model = self
+        self._cards.append(card)
+        self._cards_by_uid[card.uid] = card
+        if self._positions is not None:
+            self._positions[card.uid] = len(self._cards) - 1
+        self._record('add_card', card, card)
     
     def remove_card(self, card):
         """Remove a card from the model."""
-        if card in self.cards:
-            self.cards.remove(card)
+        self.remove_cards([card])
+    
+    def remove_cards(self, cards):
+        """Remove several cards in one pass over the card list."""
+        removed = [card for card in cards if self._cards_by_uid.get(card.uid) is card]
+        if not removed:
+            return
+        for card in removed:
+            del self._cards_by_uid[card.uid]
+        if len(removed) == 1:
+            self._cards.remove(removed[0])
+        else:
+            self._cards[:] = [card for card in self._cards if card.uid in self._cards_by_uid]
+        self._positions = None
+        
+        for card in removed:
+            self._record('remove_card', card, card)
+            card._model = None
     
     def move_card(self, card, new_position):
         """Move a card to a new position in the list."""
-        if card in self.cards:
-            self.cards.remove(card)
-            self.cards.insert(new_position, card)
+        self.move_cards([card], new_position)
+    
+    def move_cards(self, cards, new_position):
+        """Move several cards, in the given order, to a position in the list.
+        
+        As with move_card, new_position is an index into the list with the
+        moved cards taken out.
+        """
+        moving = [card for card in cards if self._cards_by_uid.get(card.uid) is card]
+        if not moving:
+            return
+        moving_uids = {card.uid for card in moving}
+        rest = [card for card in self._cards if card.uid not in moving_uids]
+        rest[new_position:new_position] = moving
+        self._cards[:] = rest
+        self._positions = None
+        
+        for card in moving:
+            self._record('move_card', card, card, new_position)
+    
+    def to_dict(self):
+        """Return a JSON-serializable dict of the whole page."""
+        return {
+            "css_styles": self.css_styles,
+            "dark_mode_enabled": self.dark_mode_enabled,
+            "last_updated": self.last_updated,
+            "cards": [card.to_dict() for card in self.cards],
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create a StartupPageModel from a dict produced by to_dict()."""
+        model = cls()
+        model.css_styles = data.get("css_styles", "")
+        model.dark_mode_enabled = data.get("dark_mode_enabled", False)
+        model.last_updated = data.get("last_updated", "")
+        for card_data in data.get("cards", []):
+            model.add_card(Card.from_dict(card_data))
+        model.mark_clean()
+        return model
     
     def __repr__(self):
         return f"StartupPageModel(cards={len(self.cards)})"
@@ -0,0 +1,100 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from src.models.card_model import StartupPageModel
+from src.utils.html_parser import HtmlParser
+from src.utils.html_writer import PageLayout
+
+
+class BatchResult:
+    """The outcome of parsing one file of a batch.
+
+    model is None and error holds the message if the file could not be
+    parsed. parse_seconds is the time spent parsing (in the worker process
+    when run on a pool); load_seconds is the time spent rebuilding the model
+    from the worker's data.
+    """
+    __slots__ = ('path', 'model', 'error', 'parse_seconds', 'load_seconds')
+
+    def __init__(self, path, model=None, error=None, parse_seconds=0.0, load_seconds=0.0):
+        self.path = path
+        self.model = model
+        self.error = error
+        self.parse_seconds = parse_seconds
+        self.load_seconds = load_seconds
+
+    def __repr__(self):
+        return f"BatchResult(path='{self.path}', error={self.error!r}, parse_seconds={self.parse_seconds:.4f})"
+
+
+def _parse_in_worker(file_path, streaming):
+    """Parse one file in a worker process and return picklable results.
+
+    The model travels back as to_dict() data rather than pickled objects,
+    which would carry change-tracking state and back-references along; the
+    positions of its cards in the file come back with it.
+    """
+    start = time.perf_counter()
+    try:
+        stat = os.stat(file_path)
+        model = HtmlParser.load_from_file(file_path, streaming=streaming)
+        data = model.to_dict()
+        positions = (model.layout.bounds, model.layout.regions)
+    except Exception as e:
+        return None, None, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return stat, data, positions, None, time.perf_counter() - start
+
+
+def _result_from_worker(file_path, outcome):
+    """Build a BatchResult from what _parse_in_worker() returned."""
+    stat, data, positions, error, parse_seconds = outcome
+    if error is not None:
+        return BatchResult(file_path, error=error, parse_seconds=parse_seconds)
+
+    start = time.perf_counter()
+    model = StartupPageModel.from_dict(data)
+    model.layout = PageLayout(file_path, stat, model.cards, *positions)
+    return BatchResult(file_path, model, parse_seconds=parse_seconds,
+                       load_seconds=time.perf_counter() - start)
+
+
+def _parse_serially(file_paths, streaming):
+    """Yield a BatchResult for each file, parsed in this process."""
+    for file_path in file_paths:
+        start = time.perf_counter()
+        try:
+            model = HtmlParser.load_from_file(file_path, streaming=streaming)
+        except Exception as e:
+            yield BatchResult(file_path, error=f"{type(e).__name__}: {e}",
+                              parse_seconds=time.perf_counter() - start)
+        else:
+            yield BatchResult(file_path, model, parse_seconds=time.perf_counter() - start)
+
+
+def parse_files(file_paths, workers=None, streaming=True, max_pending=None):
+    """Parse HTML files and yield a BatchResult for each, in input order.
+
+    With workers > 1 the files are parsed on a process pool. At most
+    max_pending files (default: twice the number of workers) are submitted
+    at a time, so only that many parsed models are ever waiting to be
+    collected, however many files there are. Without workers the files are
+    parsed one by one in this process, exactly as load_from_file would.
+    """
+    file_paths = list(file_paths)
+    if not workers or workers < 2 or len(file_paths) < 2:
+        yield from _parse_serially(file_paths, streaming)
+        return
+
+    max_pending = max(1, max_pending or workers * 2)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for file_path in file_paths:
+            if len(pending) >= max_pending:
+                done_path, future = pending.popleft()
+                yield _result_from_worker(done_path, future.result())
+            pending.append((file_path, pool.submit(_parse_in_worker, file_path, streaming)))
+        while pending:
+            done_path, future = pending.popleft()
+            yield _result_from_worker(done_path, future.result())
@@ -0,0 +1,350 @@
+import re
+
+# Comments, quoted strings and the punctuation that delimits rules. Each
+# alternative is matched without backtracking, so scanning is linear in the
+# size of the stylesheet no matter how many blocks it contains.
+_TOKEN_RE = re.compile(
+    r'/\*.*?(?:\*/|\Z)'
+    r'|"(?:[^"\\\n]|\\.)*"?'
+    r"|'(?:[^'\\\n]|\\.)*'?"
+    r'|[{};()]',
+    re.DOTALL,
+)
+_COMMENT_RE = re.compile(r'/\*.*?(?:\*/|\Z)', re.DOTALL)
+_SELECTOR_COMMA_RE = re.compile(r'\s*,\s*')
+
+# At-rules whose block contains nested rules that are merged rule by rule
+GROUPING_AT_RULES = ('@media', '@supports', '@document', '@container', '@layer', '@scope')
+
+# Grouping at-rules nested deeper than this keep their block verbatim, which
+# bounds recursion (and rescanning) on malformed or hostile stylesheets
+MAX_NESTING_DEPTH = 8
+
+# At-rules that may legitimately repeat with the same prelude; only exact
+# duplicates of these are collapsed
+REPEATABLE_AT_RULES = ('@font-face',)
+
+
+def _normalize(text):
+    """Collapse runs of whitespace so keys ignore formatting."""
+    return ' '.join(text.split())
+
+
+class CssRule:
+    """A single rule block of a stylesheet.
+
+    A rule is either a style rule (``.card { ... }``), a grouping at-rule
+    whose block holds nested rules (``@media ... { ... }``), another at-rule
+    with a block kept verbatim (``@keyframes``), or a statement
+    (``@import ...;``). Comments directly above a rule belong to it.
+    """
+
+    def __init__(self, prelude, body=None, children=None, comments=None, indent=""):
+        self.prelude = prelude
+        self.body = body
+        self.children = children
+        self.comments = comments or []
+        self.indent = indent
+        self.key = self._make_key()
+
+    def _make_key(self):
+        if not self.prelude.startswith('@'):
+            return _SELECTOR_COMMA_RE.sub(', ', _normalize(self.prelude))
+        name = self.prelude.split(None, 1)[0].lower().rstrip(';')
+        key = _normalize(self.prelude)
+        if name in REPEATABLE_AT_RULES and self.body is not None:
+            key += ' {' + _normalize(self.body) + '}'
+        return key
+
+    def same_content(self, other):
+        """True if other has the same body or the same nested rules."""
+        if self.children is not None or other.children is not None:
+            return self.children is not None and other.children is not None \
+                and self.children.serialize() == other.children.serialize()
+        return self.body == other.body
+
+    @property
+    def is_empty(self):
+        """True for grouping rules that no longer contain any rules."""
+        return self.children is not None and not len(self.children)
+
+    def declarations(self):
+        """Return the declarations of a style rule as an ordered dict."""
+        declarations = {}
+        for declaration in _split_declarations(_COMMENT_RE.sub('', self.body or '')):
+            name, sep, value = declaration.partition(':')
+            if not sep:
+                continue
+            name = name.strip()
+            if not name.startswith('--'):
+                name = name.lower()
+            declarations[name] = value.strip()
+        return declarations
+
+    def update(self, other, replace=False):
+        """Fold a rule with the same key into this one.
+
+        Grouping rules are merged rule by rule. Style rules either take the
+        other rule's body (replace=True) or combine declarations with the
+        other rule winning, as a later rule would in the cascade.
+        """
+        for comment in other.comments:
+            if comment not in self.comments:
+                self.comments.append(comment)
+
+        if self.children is not None and other.children is not None:
+            self.children.merge(other.children, replace=replace)
+            return
+
+        if self.children is None and other.children is None and self.body == other.body:
+            # Identical copies, as left behind by old saves: nothing to combine
+            self.prelude = other.prelude
+            self.indent = other.indent
+            return
+
+        if not replace and self.body is not None and other.body is not None \
+                and not self.prelude.startswith('@'):
+            merged = self.declarations()
+            incoming = other.declarations()
+            merged.update(incoming)
+            if merged != incoming:
+                self.body = self._render_declarations(merged, other.indent)
+                self.indent = other.indent
+                return
+
+        self.prelude = other.prelude
+        self.body = other.body
+        self.children = other.children
+        self.indent = other.indent
+
+    @staticmethod
+    def _render_declarations(declarations, indent):
+        lines = ''.join(f"{indent}    {name}: {value};\n" for name, value in declarations.items())
+        return f"\n{lines}{indent}"
+
+    def serialize(self):
+        """Return the CSS text of the rule, comments included."""
+        lines = [self.indent + comment for comment in self.comments]
+        if self.children is not None:
+            lines.append(f"{self.indent}{self.prelude} {{")
+            if len(self.children):
+                lines.append(self.children.serialize())
+            lines.append(f"{self.indent}}}")
+        elif self.body is None:
+            lines.append(self.indent + self.prelude)
+        else:
+            lines.append(f"{self.indent}{self.prelude} {{{self.body}}}")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"CssRule(key='{self.key}')"
+
+
+class CssStylesheet:
+    """Ordered collection of CSS rule blocks keyed by selector or at-rule.
+
+    Parsing collapses repeated rules with the same key only where that cannot
+    change the cascade: adjacent copies are folded into one, and an earlier
+    copy identical to a later one is dropped. Other copies stay where they
+    are, since a rule between them may override the first copy and lose to
+    the second. Serializing a parsed stylesheet and parsing it again yields
+    the same text, so repeated merge/serialize cycles produce output of a
+    fixed size.
+    """
+
+    def __init__(self, rules=None, trailing_comments=None):
+        self._rules = {}  # slot -> CssRule, in stylesheet order
+        self._last = {}  # key -> slot of the last rule with that key
+        self._next_slot = 0
+        self._dropped = False  # an earlier copy was removed since the last _collapse()
+        self.trailing_comments = trailing_comments or []
+        for rule in rules or []:
+            self.add(rule)
+        self._collapse()
+
+    @property
+    def rules(self):
+        """The rules of the stylesheet, in order."""
+        return list(self._rules.values())
+
+    @classmethod
+    def parse(cls, css_text, _depth=0):
+        """Parse CSS text into a stylesheet."""
+        stylesheet = cls()
+        if not css_text:
+            return stylesheet
+
+        comments = []
+        pos = 0  # start of the text not yet assigned to a rule
+        block_start = None
+        depth = 0
+        parens = 0
+
+        for match in _TOKEN_RE.finditer(css_text):
+            token = match.group()
+            if depth:
+                if token == '{':
+                    depth += 1
+                elif token == '}':
+                    depth -= 1
+                    if depth == 0:
+                        stylesheet._add_parsed(css_text, pos, block_start, match.start(),
+                                               comments, _depth)
+                        comments = []
+                        pos = match.end()
+                        parens = 0
+                continue
+
+            if token.startswith('/*'):
+                if not css_text[pos:match.start()].strip():
+                    comments.append(token)
+                    pos = match.end()
+            elif token == '(':
+                parens += 1
+            elif token == ')':
+                parens = max(parens - 1, 0)
+            elif token == '{' and not parens:
+                block_start = match.start()
+                depth = 1
+            elif token == ';' and not parens:
+                stylesheet._add_parsed(css_text, pos, None, match.end(), comments)
+                comments = []
+                pos = match.end()
+            elif token == '}':
+                # Stray closing brace: drop it along with anything before it
+                pos = match.end()
+
+        if depth:
+            # Unterminated block: keep what is there and close it
+            stylesheet._add_parsed(css_text, pos, block_start, len(css_text), comments, _depth)
+        elif css_text[pos:].strip():
+            stylesheet._add_parsed(css_text, pos, None, len(css_text), comments)
+        else:
+            stylesheet.trailing_comments.extend(comments)
+
+        stylesheet._collapse()
+        return stylesheet
+
+    def _add_parsed(self, css_text, start, block_start, end, comments, depth=0):
+        """Build a rule from css_text[start:end] and add it."""
+        head_end = block_start if block_start is not None else end
+        head = css_text[start:head_end]
+        prelude = head.strip()
+        if not prelude:
+            return
+
+        # Indentation of the line the rule starts on
+        leading = head[:len(head) - len(head.lstrip())]
+        indent = leading.rsplit('\n', 1)[-1]
+
+        if block_start is None:
+            rule = CssRule(prelude, comments=comments, indent=indent)
+        else:
+            body = css_text[block_start + 1:end]
+            name = prelude.split(None, 1)[0].lower()
+            if name in GROUPING_AT_RULES and depth < MAX_NESTING_DEPTH:
+                children = CssStylesheet.parse(body, depth + 1)
+                rule = CssRule(prelude, children=children, comments=comments, indent=indent)
+            else:
+                rule = CssRule(prelude, body=body, comments=comments, indent=indent)
+
+        if not rule.is_empty:
+            self.add(rule)
+
+    def add(self, rule):
+        """Add a rule, folding it into an earlier rule with the same key.
+
+        A rule is folded into the last rule with its key when nothing lies
+        between them. An earlier copy with the same content is dropped and the
+        combined rule moves to the position of the new one. Otherwise both
+        copies are kept.
+        """
+        slot = self._last.get(rule.key)
+        if slot is not None:
+            existing = self._rules[slot]
+            if slot == self._next_slot - 1:
+                existing.update(rule)
+                return
+            if existing.same_content(rule):
+                del self._rules[slot]
+                self._dropped = True
+                existing.update(rule)
+                rule = existing
+        self._append(rule)
+
+    def _append(self, rule):
+        self._rules[self._next_slot] = rule
+        self._last[rule.key] = self._next_slot
+        self._next_slot += 1
+
+    def _collapse(self):
+        """Add the rules again until dropping copies leaves no new neighbours to fold."""
+        while self._dropped:
+            rules = self.rules
+            self._rules, self._last, self._next_slot, self._dropped = {}, {}, 0, False
+            for rule in rules:
+                self.add(rule)
+
+    def merge(self, other, replace=True):
+        """Merge another stylesheet into this one.
+
+        Rules whose key already exists update the last copy where it stands;
+        with replace=True earlier copies of that key are removed. New rules
+        are appended in the order they appear in other.
+        """
+        if replace:
+            keys = {rule.key for rule in other.rules}
+            kept = {slot: rule for slot, rule in self._rules.items()
+                    if rule.key not in keys or self._last[rule.key] == slot}
+            self._dropped = len(kept) < len(self._rules)
+            self._rules = kept
+        existing_keys = set(self._last)
+        for rule in other.rules:
+            if rule.key in existing_keys:
+                self._rules[self._last[rule.key]].update(rule, replace=replace)
+            else:
+                self.add(rule)
+        for comment in other.trailing_comments:
+            if comment not in self.trailing_comments:
+                self.trailing_comments.append(comment)
+        self._collapse()
+
+    def get(self, key):
+        """Return the last rule with the given selector or at-rule key, or None."""
+        slot = self._last.get(_SELECTOR_COMMA_RE.sub(', ', _normalize(key)))
+        return self._rules[slot] if slot is not None else None
+
+    def __len__(self):
+        return len(self._rules)
+
+    def serialize(self):
+        """Return the stylesheet as CSS text."""
+        blocks = [rule.serialize() for rule in self._rules.values()]
+        blocks.extend(self.trailing_comments)
+        return '\n\n'.join(blocks)
+
+    def __repr__(self):
+        return f"CssStylesheet(rules={len(self._rules)})"
+
+
+def _split_declarations(body):
+    """Split a declaration block on semicolons outside strings and parentheses."""
+    declarations = []
+    start = 0
+    parens = 0
+    for match in _TOKEN_RE.finditer(body):
+        token = match.group()
+        if token == '(':
+            parens += 1
+        elif token == ')':
+            parens = max(parens - 1, 0)
+        elif token == ';' and not parens:
+            declarations.append(body[start:match.start()])
+            start = match.end()
+    declarations.append(body[start:])
+    return [declaration.strip() for declaration in declarations if declaration.strip()]
+
+
+def compact_css(css_text):
+    """Collapse duplicated rule blocks, empty at-rules and blank runs in CSS text."""
+    return CssStylesheet.parse(css_text).serialize()
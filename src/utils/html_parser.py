@@ -1,65 +1,38 @@
+from array import array
 from bs4 import BeautifulSoup
 import datetime
-from src.models.card_model import Card, Link, StartupPageModel
-
-class HtmlParser:
-    """Utility class for parsing and generating HTML for the Startup Page."""
-    
-    @staticmethod
-    def parse_html(html_content):
-        """Parse HTML content and return a StartupPageModel instance."""
-        soup = BeautifulSoup(html_content, 'lxml')
-        model = StartupPageModel()
-        
-        # Extract CSS styles
-        style_tag = soup.find('style')
-        if style_tag:
-            model.css_styles = style_tag.string
-        
-        # Extract last updated date
-        footer = soup.find('footer')
-        if footer:
-            last_updated_text = footer.get_text()
-            if 'Last updated:' in last_updated_text:
-                model.last_updated = last_updated_text.split('Last updated:')[1].strip()
-        
-        # Extract cards (sections)
-        for section in soup.select('main.main-grid > section.card'):
-            title_elem = section.select_one('h2.card-title')
-            if title_elem:
-                title = title_elem.get_text().strip()
-                card = Card(title=title)
-                
-                # Extract links from the main link-grid
-                for link_item in section.select('div.link-grid > div.link-item'):
-                    a_tag = link_item.find('a')
-                    if a_tag:
-                        name = a_tag.get_text().strip()
-                        url = a_tag.get('href', '')
-                        card.add_link(Link(name=name, url=url))
-                
-                # Handle subsections (nested link-grids)
-                subsection_grids = section.select('div.link-grid[style="margin-top: 1rem;"]')
-                if subsection_grids:
-                    # For simplicity, treating all additional link-grids as a single subsection
-                    # In a full implementation, would need to handle proper subsection titles
-                    subsection_title = "Additional Links"
-                    for link_item in subsection_grids[0].select('div.link-item'):
-                        a_tag = link_item.find('a')
-                        if a_tag:
-                            name = a_tag.get_text().strip()
-                            url = a_tag.get('href', '')
-                            card.add_subsection_link(subsection_title, Link(name=name, url=url))
-                
-                model.add_card(card)
-        
-        return model
-    
-    @staticmethod
-    def generate_html(model):
-        """Generate HTML content from a StartupPageModel instance."""
-        # Define our masonry layout CSS
-        masonry_css = """
+import functools
+import html
+import os
+import soupsieve
+from src.models.card_model import Card, StartupPageModel
+from src.utils.css_model import CssStylesheet
+from src.utils.html_renderer import render_card
+from src.utils.html_writer import PageLayout, atomic_write
+from src.utils.page_scanner import map_file, scan_file, scan_page
+from src.utils.parse_profile import NO_PROFILE
+from src.utils.stream_parser import (SUBSECTION_GRID_STYLE, card_background, link_from_anchor,
+                                     parse_card_fragment, parse_file_streaming, parse_html_streaming,
+                                     subsection_title)
+
+# Date formats of the header "Updated:" and footer "Last updated:" fields
+HEADER_DATE_FORMAT = '%A, %Y-%m-%d %H:%M'
+FOOTER_DATE_FORMAT = '%A, %B %d, %Y'
+
+# Unchanged parts of a page are copied from the old file in pieces of at most
+# this many bytes, so a save never holds more than one piece in memory
+COPY_CHUNK_SIZE = 1 << 18
+
+# Selectors used by parse_html, compiled once rather than on every call
+_CARD_SELECTOR = soupsieve.compile('main.main-grid > section.card')
+_CARD_TITLE_SELECTOR = soupsieve.compile('h2.card-title')
+_LINK_ITEM_SELECTOR = soupsieve.compile(
+    f'div.link-grid:not([style="{SUBSECTION_GRID_STYLE}"]) > div.link-item')
+_SUBSECTION_GRID_SELECTOR = soupsieve.compile(f'div.link-grid[style="{SUBSECTION_GRID_STYLE}"]')
+_SUBSECTION_LINK_SELECTOR = soupsieve.compile('div.link-item')
+
+# Masonry layout rules merged into every generated stylesheet
+MASONRY_CSS = """
 /* Masonry-style layout for cards */
 .main-grid {
     column-count: 3;
@@ -91,28 +64,9 @@ class HtmlParser:
     }
 }
 """
-    
-        # If we have existing CSS, force our masonry layout
-        if model.css_styles:
-            # Replace the original CSS with our modified version
-            # This is a simple approach - in a production environment, 
-            # a more sophisticated CSS parser would be better
-            
-            # First, try to find and remove existing main-grid and card style blocks
-            import re
-            
-            # Remove existing .main-grid and .card style blocks
-            model.css_styles = re.sub(r'\.main-grid\s*\{[^}]*\}', '', model.css_styles)
-            model.css_styles = re.sub(r'\.card\s*\{[^}]*\}', '', model.css_styles)
-            
-            # If media queries for main-grid exist, remove them too
-            model.css_styles = re.sub(r'@media[^{]*\{[^{]*\.main-grid\s*\{[^}]*\}[^}]*\}', '', model.css_styles)
-            
-            # Add our masonry CSS at the end
-            model.css_styles += masonry_css
-        
-        if not model.css_styles:
-            model.css_styles = """
+
+# Stylesheet used when the model has no CSS of its own
+DEFAULT_CSS = """
 :root {
     /* Light mode variables (default) - subdued version */
     --background: #e8e8e8;
@@ -350,8 +304,133 @@ footer {
     }
 }
 """
+
+
+class HtmlParser:
+    """Utility class for parsing and generating HTML for the Startup Page."""
+    
+    @staticmethod
+    def parse_html(html_content, profile=None):
+        """Parse HTML content and return a StartupPageModel instance.
+        
+        A ParseProfile passed as profile receives the time spent building the
+        tree, extracting the CSS, matching the card selector and building
+        the model, and the number of cards and links.
+        """
+        if profile is None:
+            profile = NO_PROFILE
+        with profile.phase('tree'):
+            soup = BeautifulSoup(html_content, 'lxml')
+        model = StartupPageModel()
+        
+        # Extract CSS styles
+        with profile.phase('css'):
+            style_tag = soup.find('style')
+            if style_tag:
+                model.css_styles = style_tag.string
+        
+        # Extract last updated date
+        with profile.phase('footer'):
+            footer = soup.find('footer')
+            if footer:
+                last_updated_text = footer.get_text()
+                if 'Last updated:' in last_updated_text:
+                    model.last_updated = last_updated_text.split('Last updated:')[1].strip()
         
-        template = f"""<!DOCTYPE html>
+        with profile.phase('select'):
+            sections = _CARD_SELECTOR.select(soup)
+        with profile.phase('model'):
+            HtmlParser._add_sections(model, sections)
+        
+        model.mark_clean()
+        profile.count_model(model)
+        return model
+    
+    @staticmethod
+    def _add_sections(model, sections):
+        """Add a Card to model for every section.card element with a title."""
+        for section in sections:
+            title_elem = _CARD_TITLE_SELECTOR.select_one(section)
+            if title_elem:
+                title = title_elem.get_text().strip()
+                card = Card(title=title, background_color=card_background(section.get('style')))
+                
+                # Extract links from the main link-grid
+                for link_item in _LINK_ITEM_SELECTOR.select(section):
+                    a_tag = link_item.find('a')
+                    if a_tag:
+                        name = a_tag.get_text().strip()
+                        url = a_tag.get('href', '')
+                        card.add_link(link_from_anchor(name, url, a_tag.get('style')))
+                
+                # Every subsection grid, titled by its data-subsection attribute
+                for index, grid in enumerate(_SUBSECTION_GRID_SELECTOR.select(section)):
+                    title = subsection_title(grid.get('data-subsection'), index)
+                    for link_item in _SUBSECTION_LINK_SELECTOR.select(grid):
+                        a_tag = link_item.find('a')
+                        if a_tag:
+                            name = a_tag.get_text().strip()
+                            url = a_tag.get('href', '')
+                            card.add_subsection_link(title, link_from_anchor(name, url, a_tag.get('style')))
+                
+                model.add_card(card)
+    
+    @staticmethod
+    def parse_html_streaming(html_content):
+        """Parse HTML content with lxml parse events instead of a BeautifulSoup tree.
+        
+        Produces the same StartupPageModel as parse_html, but Cards and Links are
+        emitted as each section.card closes and the DOM is never materialized.
+        """
+        return parse_html_streaming(html_content)
+    
+    @staticmethod
+    def prepare_css(model):
+        """Bring model.css_styles into the form written to disk and return it."""
+        # Force our masonry layout: its rules replace any existing rules with
+        # the same selector, so the stylesheet keeps a fixed size across saves
+        if model.css_styles:
+            stylesheet = CssStylesheet.parse(model.css_styles)
+            stylesheet.merge(CssStylesheet.parse(MASONRY_CSS))
+            model.css_styles = stylesheet.serialize()
+        
+        if not model.css_styles:
+            model.css_styles = DEFAULT_CSS
+        
+        return model.css_styles
+    
+    @staticmethod
+    def generate_html(model):
+        """Generate HTML content from a StartupPageModel instance."""
+        return ''.join(HtmlParser.iter_html(model))
+    
+    @staticmethod
+    def iter_html(model):
+        """Yield the HTML of a StartupPageModel in chunks.
+        
+        The head (with the stylesheet), each card and the tail are separate
+        chunks, so
+        the page never has to be held in memory as a whole.
+        """
+        HtmlParser.prepare_css(model)
+        now = datetime.datetime.now()
+        
+        yield HtmlParser._render_head(model, now)
+        for card in model.cards:
+            yield render_card(card)
+        yield HtmlParser._render_tail(now)
+    
+    @staticmethod
+    def write_html(model, out):
+        """Write the HTML of a StartupPageModel to a text stream."""
+        write = out.write
+        for chunk in HtmlParser.iter_html(model):
+            write(chunk)
+    
+    @staticmethod
+    def _render_head(model, now):
+        """Render everything up to and including the opening <main> tag."""
+        return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -375,71 +454,21 @@ footer {
             </div>
         </div>
         <div class="header-center">JAU's Startup Page</div>
-        <div class="header-right">Updated: {datetime.datetime.now().strftime('%A, %Y-%m-%d %H:%M')}</div>
+        <div class="header-right">Updated: {now.strftime(HEADER_DATE_FORMAT)}</div>
     </header>
 
     <main class="main-grid">
 """
-
-        # Add each card section
-        for card in model.cards:
-            # Define card style with custom background color if provided
-            card_style = ""
-            if hasattr(card, 'background_color') and card.background_color:
-                card_style = f" style=\"background-color: {card.background_color};\""
-                
-            template += f"""        <!-- {card.title} Section -->
-        <section class="card"{card_style}>
-            <h2 class="card-title">{card.title}</h2>
-            <div class="link-grid">
-"""
-            
-            # Add main links
-            for link in card.links:
-                # Build inline style if needed
-                style_attr = ""
-                if hasattr(link, 'font_size') and link.font_size or hasattr(link, 'font_color') and link.font_color:
-                    style = ""
-                    if hasattr(link, 'font_size') and link.font_size:
-                        style += f"font-size: {link.font_size}; "
-                    if hasattr(link, 'font_color') and link.font_color:
-                        style += f"color: {link.font_color}; "
-                    style_attr = f' style="{style.strip()}"'
-                
-                template += f"""                <div class="link-item">
-                    <a href="{link.url}"{style_attr}>{link.name}</a>
-                </div>
-"""
-            
-            template += "            </div>\n"
-            
-            # Add subsection links
-            if card.subsections:
-                for subsection_title, links in card.subsections.items():
-                    if links:
-                        template += f"""            <div class="link-grid" style="margin-top: 1rem;">
-"""
-                        for link in links:
-                            # Build inline style if needed
-                            style_attr = ""
-                            if hasattr(link, 'font_size') and link.font_size or hasattr(link, 'font_color') and link.font_color:
-                                style = ""
-                                if hasattr(link, 'font_size') and link.font_size:
-                                    style += f"font-size: {link.font_size}; "
-                                if hasattr(link, 'font_color') and link.font_color:
-                                    style += f"color: {link.font_color}; "
-                                style_attr = f' style="{style.strip()}"'
-                            
-                            template += f"""                <div class="link-item">
-                    <a href="{link.url}"{style_attr}>{link.name}</a>
-                </div>
-"""
-                        template += "            </div>\n"
-            
-            template += "        </section>\n\n"
-        
-        # Add footer and closing tags
-        template += f"""    </main>
+    
+    @staticmethod
+    def render_card(card):
+        """Render the HTML of a single card section, including its leading comment."""
+        return render_card(card)
+    
+    @staticmethod
+    def _render_tail(now):
+        """Render the closing </main> tag, footer and scripts."""
+        return f"""    </main>
 
     <footer>
         <div class="footer-content">
@@ -450,7 +479,7 @@ footer {
                 </div>
             </div>
             <div class="footer-center">
-                <p>JAU's Startup Page &copy; {datetime.datetime.now().year} | Last updated: {datetime.datetime.now().strftime('%A, %B %d, %Y')}</p>
+                <p>JAU's Startup Page &copy; {now.year} | Last updated: {now.strftime(FOOTER_DATE_FORMAT)}</p>
             </div>
         </div>
     </footer>
@@ -517,20 +546,213 @@ footer {
 </body>
 </html>
 """
-        
-        return template
 
     @staticmethod
-    def load_from_file(file_path):
-        """Load HTML from file and parse it."""
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-        return HtmlParser.parse_html(html_content)
+    def load_from_file(file_path, streaming=True, lazy=False, profile=None):
+        """Load HTML from file and parse it.
+        
+        By default the file is fed to the streaming parser in chunks; pass
+        streaming=False to parse it with BeautifulSoup instead.
+        
+        With lazy=True only the card titles and their byte offsets are read
+        up front; each card's links are parsed when first accessed (see
+        Card.lazy).
+        
+        A ParseProfile passed as profile receives the time spent in each
+        phase of loading and the number of bytes, cards and links read.
+        """
+        if profile is None:
+            profile = NO_PROFILE
+        stat = os.stat(file_path)
+        if lazy:
+            model, scan = HtmlParser._index_file(file_path, profile)
+        else:
+            model = HtmlParser._parse_file(file_path, streaming, profile)
+            with profile.phase('scan'):
+                scan = scan_file(file_path)
+        
+        # Remember where the file's cards are so a later save can skip unchanged ones
+        with profile.phase('layout'):
+            model.mark_clean()
+            model.layout = PageLayout.from_scan(file_path, stat, model.cards, scan)
+        profile.count('bytes', stat.st_size)
+        profile.count_model(model)
+        return model
+    
+    @staticmethod
+    def _index_file(file_path, profile=NO_PROFILE):
+        """Build a model of lazy cards from one scan of the memory-mapped file.
+        
+        Each card keeps a copy of its own bytes to parse later, so the model
+        does not depend on the file once loaded. Returns (model, scan).
+        """
+        model = StartupPageModel()
+        with map_file(file_path) as data:
+            with profile.phase('scan'):
+                scan = scan_page(data)
+            with profile.phase('css'):
+                if scan.style:
+                    # Like the parsers, an empty <style> element gives None
+                    model.css_styles = scan.text(data, scan.style) or None
+                if scan.footer_updated:
+                    model.last_updated = html.unescape(scan.text(data, scan.footer_updated)).strip()
+            with profile.phase('model'):
+                for span in scan.cards:
+                    model.add_card(Card.lazy(span.title, functools.partial(
+                        parse_card_fragment, data[span.start:span.end]), card_background(span.style)))
+        return model, scan
+    
+    @staticmethod
+    def _parse_file(file_path, streaming, profile=NO_PROFILE):
+        """Parse a file with the streaming or the BeautifulSoup parser."""
+        if streaming:
+            return parse_file_streaming(file_path, profile)
+        with profile.phase('read'):
+            with open(file_path, 'r', encoding='utf-8') as file:
+                html_content = file.read()
+        return HtmlParser.parse_html(html_content, profile)
     
     @staticmethod
     def save_to_file(model, file_path):
-        """Generate HTML from model and save to file."""
-        html_content = HtmlParser.generate_html(model)
-        with open(file_path, 'w', encoding='utf-8') as file:
-            file.write(html_content)
-
+        """Generate HTML from model and save it to file atomically.
+        
+        If the model was loaded from (or last saved to) this file and the file
+        has not changed since, only new and modified cards are rendered; every
+        other card is copied byte-for-byte from the existing file, at the byte
+        ranges remembered in model.layout. Otherwise the whole page is
+        rendered. Either way the page is written in chunks, and the positions
+        of its cards are recorded in the new layout.
+        """
+        bounds, regions = array('q'), {}
+        pieces = None
+        layout = model.layout
+        if layout is not None and layout.bounds is not None and layout.matches(file_path):
+            pieces = HtmlParser._plan_splice(model, file_path, bounds, regions)
+        
+        if pieces is not None:
+            chunks = HtmlParser._copy_pieces(file_path, pieces)
+        else:
+            bounds, regions = array('q'), {}
+            chunks = HtmlParser._iter_page_bytes(model, bounds, regions)
+        
+        atomic_write(file_path, chunks)
+        model.mark_clean()
+        model.layout = PageLayout(file_path, os.stat(file_path), model.cards, bounds, regions)
+        # Edits made before marking clean are no longer visible to the model
+        # file's layout, so it can no longer tell which of its lines are current
+        model.model_layout = None
+    
+    @staticmethod
+    def _iter_page_bytes(model, bounds, regions):
+        """Yield the encoded page like iter_html, recording where its parts are.
+        
+        The byte range of each card is appended to bounds, and those of the
+        stylesheet and dates are stored in regions (see PageLayout).
+        """
+        HtmlParser.prepare_css(model)
+        now = datetime.datetime.now()
+        
+        head = HtmlParser._render_head(model, now).encode('utf-8')
+        head_scan = scan_page(head)
+        for name in ('style', 'header_updated'):
+            if getattr(head_scan, name) is not None:
+                regions[name] = getattr(head_scan, name)
+        yield head
+        
+        pos = len(head)
+        for card in model.cards:
+            chunk = HtmlParser.render_card(card).encode('utf-8')
+            bounds.append(pos)
+            pos += len(chunk)
+            bounds.append(pos)
+            yield chunk
+        
+        tail = HtmlParser._render_tail(now).encode('utf-8')
+        tail_scan = scan_page(tail)
+        for name in ('footer_year', 'footer_updated'):
+            span = getattr(tail_scan, name)
+            if span is not None:
+                regions[name] = (pos + span[0], pos + span[1])
+        yield tail
+    
+    @staticmethod
+    def _plan_splice(model, file_path, bounds, regions):
+        """Return the pieces of the page with changed cards re-rendered, or None.
+        
+        Each piece is either bytes to write or a (start, end) range to copy
+        from the existing file. Where the cards and other regions of the new
+        page will be is recorded in bounds and regions. None means the file
+        cannot be spliced and the whole page has to be regenerated.
+        """
+        layout = model.layout
+        old_bounds, old_regions = layout.bounds, layout.regions
+        if not old_bounds or 'style' not in old_regions:
+            return None
+        
+        # Unchanged cards are copied from where they are in the file
+        card_pieces = (layout.card_bounds(card) or HtmlParser.render_card(card).encode('utf-8')
+                       for card in model.cards)
+        
+        now = datetime.datetime.now()
+        old_style = old_regions['style']
+        style = ("\n" + HtmlParser.prepare_css(model) + "\n    ").encode('utf-8')
+        with map_file(file_path) as data:
+            if data[old_style[0]:old_style[1]] == style:
+                style = old_style
+        
+        # (start, end, replacement pieces, region name or None for the cards)
+        edits = [(old_bounds[0], old_bounds[-1], card_pieces, None),
+                 old_style + ([style], 'style')]
+        if 'header_updated' in old_regions:
+            edits.append(old_regions['header_updated'] + (
+                [now.strftime(HEADER_DATE_FORMAT).encode('utf-8')], 'header_updated'))
+        if 'footer_updated' in old_regions:
+            edits.append(old_regions['footer_year'] + ([str(now.year).encode('utf-8')], 'footer_year'))
+            edits.append(old_regions['footer_updated'] + (
+                [now.strftime(FOOTER_DATE_FORMAT).encode('utf-8')], 'footer_updated'))
+        
+        pieces = []
+        out = 0  # position in the new file
+        
+        def add(piece):
+            nonlocal out
+            if not isinstance(piece, tuple):
+                pieces.append(piece)
+                out += len(piece)
+                return
+            start, end = piece
+            if pieces and isinstance(pieces[-1], tuple) and pieces[-1][1] == start:
+                pieces[-1] = (pieces[-1][0], end)
+            elif start < end:
+                pieces.append(piece)
+            out += end - start
+        
+        pos = 0  # position in the old file
+        for start, end, replacement, name in sorted(edits, key=lambda edit: edit[0]):
+            if start < pos:
+                return None
+            add((pos, start))
+            region_start = out
+            for piece in replacement:
+                if name is None:
+                    bounds.append(out)
+                add(piece)
+                if name is None:
+                    bounds.append(out)
+            if name is not None:
+                regions[name] = (region_start, out)
+            pos = end
+        add((pos, layout.size))
+        return pieces
+    
+    @staticmethod
+    def _copy_pieces(file_path, pieces):
+        """Yield the bytes of planned pieces, copying ranges from the memory-mapped file."""
+        with map_file(file_path) as data:
+            for piece in pieces:
+                if not isinstance(piece, tuple):
+                    yield piece
+                    continue
+                start, end = piece
+                for offset in range(start, end, COPY_CHUNK_SIZE):
+                    yield data[offset:min(offset + COPY_CHUNK_SIZE, end)]
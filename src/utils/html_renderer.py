@@ -0,0 +1,69 @@
+import functools
+from html import escape
+
+# Fixed text around the variable parts of a card, split out once so rendering
+# a link is a single concatenation of constants and attribute values
+_CARD_COMMENT = '        <!-- '
+_CARD_OPEN = ' Section -->\n        <section class="card"'
+_CARD_TITLE = '>\n            <h2 class="card-title">'
+_CARD_TITLE_CLOSE = '</h2>\n            <div class="link-grid">\n'
+_SUBSECTION_GRID_OPEN = '            <div class="link-grid" style="margin-top: 1rem;" data-subsection="'
+_SUBSECTION_GRID_OPEN_CLOSE = '">\n'
+_GRID_CLOSE = '            </div>\n'
+_CARD_CLOSE = '        </section>\n\n'
+_LINK_OPEN = '                <div class="link-item">\n                    <a href="'
+_LINK_PLAIN = '">'
+_LINK_CLOSE = '</a>\n                </div>\n'
+
+
+@functools.lru_cache(maxsize=256)
+def link_style_attr(font_size, font_color):
+    """Return the style attribute for a link's font size and color, or ''.
+
+    Pages use only a handful of style combinations, so each is built once.
+    """
+    style = ""
+    if font_size:
+        style += f"font-size: {font_size}; "
+    if font_color:
+        style += f"color: {font_color}; "
+    return f' style="{style.strip()}"' if style else ""
+
+
+@functools.lru_cache(maxsize=256)
+def card_style_attr(background_color):
+    """Return the style attribute for a card's background color, or ''."""
+    return f' style="background-color: {background_color};"' if background_color else ""
+
+
+@functools.lru_cache(maxsize=256)
+def _link_middle(font_size, font_color):
+    """Return the text between a styled link's URL and its name."""
+    return '"' + link_style_attr(font_size, font_color) + '>'
+
+
+def render_links(links):
+    """Return the link-item elements for a list of links."""
+    middle = _link_middle
+    parts = []
+    append = parts.append
+    for link in links:
+        font_size = link.font_size
+        font_color = link.font_color
+        append(f'{_LINK_OPEN}{link.url}'
+               f'{middle(font_size, font_color) if font_size or font_color else _LINK_PLAIN}'
+               f'{link.name}{_LINK_CLOSE}')
+    return ''.join(parts)
+
+
+def render_card(card):
+    """Return the HTML of a single card section, including its leading comment."""
+    title = card.title
+    html = (f'{_CARD_COMMENT}{title}{_CARD_OPEN}{card_style_attr(card.background_color)}'
+            f'{_CARD_TITLE}{title}{_CARD_TITLE_CLOSE}{render_links(card.links)}{_GRID_CLOSE}')
+    if card.subsections:
+        for subsection_title, links in card.subsections.items():
+            if links:
+                html += (f'{_SUBSECTION_GRID_OPEN}{escape(subsection_title)}{_SUBSECTION_GRID_OPEN_CLOSE}'
+                         f'{render_links(links)}{_GRID_CLOSE}')
+    return html + _CARD_CLOSE
@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+from array import array
+
+# Write buffer for atomic_write; chunks are usually one card each
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Parts of a page besides its cards whose positions a PageLayout remembers
+REGIONS = ('style', 'header_updated', 'footer_year', 'footer_updated')
+
+
+def _current_umask():
+    """Return the process umask (reading it means setting it, so it is restored)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def atomic_write(file_path, chunks):
+    """Write byte chunks to a temporary file and atomically replace file_path.
+
+    chunks may be any iterable, including a generator, and is consumed as it
+    is written. The temporary file is created next to the target so
+    os.replace() never crosses a filesystem; an existing file's permissions
+    are preserved, and a new file gets the mode open() would have given it.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(file_path) + '.',
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, tmp_path)
+        else:
+            # mkstemp creates the file 0600; use 0666 less the umask instead
+            os.chmod(tmp_path, 0o666 & ~_current_umask())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class PageLayout:
+    """What the model looked like when it was last read from or written to disk.
+
+    Holds the file's size and mtime, the Card objects in file order and where
+    they are: bytes bounds[2 * i] to bounds[2 * i + 1] of the file hold
+    cards[i]. regions maps other named parts of the file (e.g. 'style') to
+    their (start, end). The model is marked clean whenever a layout is taken,
+    so a save can copy the bytes of every card that is still clean and only
+    render the others, without reading the file again to find them. bounds
+    is None when the positions of the cards are not known.
+    """
+
+    def __init__(self, file_path, stat, cards, bounds=None, regions=None):
+        self.path = os.path.abspath(file_path)
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.cards = list(cards)
+        self.bounds = bounds
+        self.regions = regions or {}
+        self._positions = {id(card): i for i, card in enumerate(self.cards)}
+
+    @classmethod
+    def from_scan(cls, file_path, stat, cards, scan):
+        """Take a layout from a PageScan of the file.
+
+        The card positions are only kept when the scan found the model's
+        cards, with nothing else between them, and the page's stylesheet.
+        """
+        cards = list(cards)
+        spans = scan.cards
+        if (not spans or not scan.contiguous or scan.style is None
+                or [span.title for span in spans] != [card.title for card in cards]):
+            return cls(file_path, stat, cards)
+        bounds = array('q')
+        for span in spans:
+            bounds.append(span.start)
+            bounds.append(span.end)
+        regions = {name: getattr(scan, name) for name in REGIONS if getattr(scan, name) is not None}
+        return cls(file_path, stat, cards, bounds, regions)
+
+    def matches(self, file_path):
+        """True if file_path is the file this layout describes, unmodified."""
+        if os.path.abspath(file_path) != self.path:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def is_unchanged(self, card):
+        """True if card was in the file and has not been modified since."""
+        return id(card) in self._positions and not card.dirty
+
+    def card_bounds(self, card):
+        """Return the (start, end) of an unchanged card in the file, or None."""
+        i = self._positions.get(id(card))
+        if i is None or card.dirty or self.bounds is None:
+            return None
+        return self.bounds[2 * i], self.bounds[2 * i + 1]
@@ -0,0 +1,248 @@
+import contextlib
+import functools
+import json
+import os
+from array import array
+
+from src.models.card_model import Card, Link, StartupPageModel
+from src.utils.html_parser import HtmlParser
+from src.utils.html_writer import PageLayout, atomic_write
+from src.utils.page_scanner import map_file, scan_file
+from src.utils.parse_profile import NO_PROFILE
+
+MODEL_FORMAT = "startup-page-model"
+
+# Bump when the layout of the file changes incompatibly
+MODEL_FORMAT_VERSION = 2
+
+MODEL_SUFFIX = ".model.jsonl"
+
+
+class ModelFormatError(ValueError):
+    """Raised when a model file cannot be read."""
+
+
+def model_path_for(html_path):
+    """Return the path of the model file that belongs beside an HTML page."""
+    return os.path.splitext(html_path)[0] + MODEL_SUFFIX
+
+
+def html_path_for(model_path):
+    """Return the path of the HTML page a model file is exported to."""
+    if model_path.endswith(MODEL_SUFFIX):
+        return model_path[:-len(MODEL_SUFFIX)] + ".html"
+    return os.path.splitext(model_path)[0] + ".html"
+
+
+def is_model_file(file_path):
+    """True if file_path names a model file rather than an HTML page."""
+    return file_path.endswith(MODEL_SUFFIX)
+
+
+def _card_line(card):
+    """Serialize a card as one line of a model file."""
+    return (json.dumps(card.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _stale_cards(model, model_path):
+    """Return (layout, ids of the cards whose line in model_path must be written afresh).
+
+    layout is None when no line of the existing file can be reused. Call
+    this before the model is marked clean, since it relies on dirty flags.
+    """
+    layout = model.model_layout
+    if layout is None or layout.bounds is None or not layout.matches(model_path):
+        return None, None
+    return layout, {id(card) for card in model.cards if layout.card_bounds(card) is None}
+
+
+def _write_model(model, model_path, html_layout, old, stale):
+    """Write model_path, copying the lines of cards not in stale from it per layout old."""
+    html = None
+    if html_layout is not None:
+        html = {
+            "size": html_layout.size,
+            "mtime_ns": html_layout.mtime_ns,
+            "bounds": None if html_layout.bounds is None else html_layout.bounds.tolist(),
+            "regions": html_layout.regions,
+        }
+    header = {
+        "format": MODEL_FORMAT,
+        "version": MODEL_FORMAT_VERSION,
+        "css_styles": model.css_styles,
+        "dark_mode_enabled": model.dark_mode_enabled,
+        "last_updated": model.last_updated,
+        "html": html,
+    }
+    header_line = (json.dumps(header, ensure_ascii=False) + "\n").encode("utf-8")
+    bounds = array('q')
+
+    def lines():
+        yield header_line
+        pos = len(header_line)
+        with map_file(model_path) if old is not None else contextlib.nullcontext() as data:
+            for card in model.cards:
+                if old is None or id(card) in stale:
+                    line = _card_line(card)
+                else:
+                    start, end = old.card_bounds(card)
+                    line = data[start:end]
+                bounds.append(pos)
+                pos += len(line)
+                bounds.append(pos)
+                yield line
+
+    atomic_write(model_path, lines())
+    model.model_layout = PageLayout(model_path, os.stat(model_path), model.cards, bounds)
+
+
+def save_model(model, model_path, html_layout=None):
+    """Write a model as line-delimited JSON: a header line, then one line per card.
+
+    html_layout is the PageLayout of the HTML page exported from this exact
+    model state; it lets load_page() tell whether the page has been edited
+    since, and where its cards are. When the model was loaded from or last
+    saved to model_path and the file is unchanged since, only new and
+    modified cards are serialized; the other lines are copied as they are.
+    """
+    _write_model(model, model_path, html_layout, *_stale_cards(model, model_path))
+
+
+def _card_fields(line):
+    """Return the title, icon and background color from the start of a card line."""
+    # Quotes inside JSON strings are escaped, so this cannot match within one
+    links = line.find(b',"links":')
+    if links == -1:
+        return json.loads(line)
+    return json.loads(line[:links] + b"}")
+
+
+def _card_contents(line):
+    """Return (links, subsections) of a lazy card from its line."""
+    data = json.loads(line)
+    links = [Link.from_dict(link) for link in data.get("links", [])]
+    subsections = {title: [Link.from_dict(link) for link in section]
+                   for title, section in data.get("subsections", [])}
+    return links, subsections
+
+
+def _read_model(model_path, lazy=False):
+    """Return (header, model) read from a model file.
+
+    With lazy=True each card keeps a copy of its line and decodes its links
+    when first accessed (see Card.lazy). model.model_layout records where
+    each card's line is, so a later save_model() can copy unchanged ones.
+    """
+    stat = os.stat(model_path)
+    with map_file(model_path) as data:
+        end = data.find(b"\n") + 1 or len(data)
+        try:
+            header = json.loads(data[:end])
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ModelFormatError(f"{model_path}: invalid header: {e}") from e
+        if not isinstance(header, dict) or header.get("format") != MODEL_FORMAT:
+            raise ModelFormatError(f"{model_path}: not a startup page model file")
+        if header.get("version", 0) > MODEL_FORMAT_VERSION:
+            raise ModelFormatError(
+                f"{model_path}: format version {header['version']} is newer than supported")
+        # Version 1 wrote a card's links before its other fields
+        lazy = lazy and header.get("version", 0) >= 2
+
+        model = StartupPageModel()
+        model.css_styles = header.get("css_styles", "")
+        model.dark_mode_enabled = header.get("dark_mode_enabled", False)
+        model.last_updated = header.get("last_updated", "")
+        bounds = array('q')
+        line_number = 1
+        while end < len(data):
+            start = end
+            end = data.find(b"\n", start) + 1 or len(data)
+            line_number += 1
+            line = data[start:end]
+            if not line.strip():
+                continue
+            try:
+                if lazy:
+                    fields = _card_fields(line)
+                    card = Card.lazy(fields["title"], functools.partial(_card_contents, line),
+                                     fields.get("background_color", ""), fields.get("icon", ""))
+                else:
+                    card = Card.from_dict(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+                raise ModelFormatError(f"{model_path}:{line_number}: invalid card: {e}") from e
+            model.add_card(card)
+            bounds.append(start)
+            bounds.append(end)
+
+    model.mark_clean()
+    model.model_layout = PageLayout(model_path, stat, model.cards, bounds)
+    return header, model
+
+
+def load_model(model_path, lazy=False):
+    """Load a StartupPageModel from a model file."""
+    return _read_model(model_path, lazy)[1]
+
+
+def _html_matches(header, html_path):
+    """True if html_path is still the page exported when the model was saved."""
+    recorded = header.get("html")
+    if not recorded:
+        return False
+    try:
+        stat = os.stat(html_path)
+    except OSError:
+        return False
+    return stat.st_size == recorded.get("size") and stat.st_mtime_ns == recorded.get("mtime_ns")
+
+
+def _html_layout(recorded, html_path, model):
+    """Return the PageLayout of a page from the positions recorded in a model file."""
+    stat = os.stat(html_path)
+    if recorded.get("bounds") is None or len(recorded["bounds"]) != 2 * len(model.cards):
+        # Written by version 1, which did not record positions
+        return PageLayout.from_scan(html_path, stat, model.cards, scan_file(html_path))
+    regions = {name: tuple(span) for name, span in recorded.get("regions", {}).items()}
+    return PageLayout(html_path, stat, model.cards, array('q', recorded["bounds"]), regions)
+
+
+def load_page(file_path, lazy=False, profile=None):
+    """Load the model for a page from its model file, or parse its HTML.
+
+    file_path may name the HTML page or its model file. The model file is
+    used when it exists, unless the HTML page has been changed by something
+    other than the editor since it was exported; the page is then parsed
+    again so those changes are not lost. lazy and profile are passed on to
+    HtmlParser.load_from_file; reading a model file is timed as the
+    'model_file' phase. Returns (model, html_path).
+    """
+    if profile is None:
+        profile = NO_PROFILE
+    if is_model_file(file_path):
+        model_path, html_path = file_path, html_path_for(file_path)
+    else:
+        model_path, html_path = model_path_for(file_path), file_path
+
+    if os.path.exists(model_path):
+        with profile.phase('model_file'):
+            header, model = _read_model(model_path, lazy)
+        if _html_matches(header, html_path):
+            # The page is exactly what this model exports to, so a later save
+            # can still copy unchanged cards from it
+            model.layout = _html_layout(header["html"], html_path, model)
+            profile.count_model(model)
+            return model, html_path
+        if is_model_file(file_path) or not os.path.exists(html_path):
+            profile.count_model(model)
+            return model, html_path
+
+    return HtmlParser.load_from_file(html_path, lazy=lazy, profile=profile), html_path
+
+
+def save_page(model, html_path):
+    """Export a model to its HTML page and write the model file beside it."""
+    model_path = model_path_for(html_path)
+    # Saving the page marks the model clean, so find the changed cards first
+    old, stale = _stale_cards(model, model_path)
+    HtmlParser.save_to_file(model, html_path)
+    _write_model(model, model_path, model.layout, old, stale)
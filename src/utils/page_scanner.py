@@ -0,0 +1,210 @@
+import contextlib
+import html
+import mmap
+import os
+import re
+
+# Patterns run directly on the raw page bytes; offsets are byte offsets.
+_MAIN_OPEN_RE = re.compile(
+    rb'<main\b[^>]*\bclass\s*=\s*["\'](?:[^"\']*\s)?main-grid(?:\s[^"\']*)?["\'][^>]*>', re.I)
+_SECTION_TOKEN_RE = re.compile(rb'<section\b[^>]*>|</section\s*>|</main\s*>', re.I)
+_CARD_CLASS_RE = re.compile(rb'\bclass\s*=\s*["\'](?:[^"\']*\s)?card(?:\s[^"\']*)?["\']', re.I)
+_CARD_TITLE_RE = re.compile(
+    rb'<h2\b[^>]*\bclass\s*=\s*["\'](?:[^"\']*\s)?card-title(?:\s[^"\']*)?["\'][^>]*>(.*?)</h2\s*>',
+    re.I | re.S)
+_TAG_RE = re.compile(rb'<[^>]*>')
+_STYLE_RE = re.compile(rb'<style\b[^>]*>(.*?)</style\s*>', re.I | re.S)
+_HEADER_UPDATED_RE = re.compile(rb'<div class="header-right">Updated: ([^<]*)</div>')
+_FOOTER_UPDATED_RE = re.compile(rb'&copy; (\d{4}) \| Last updated: ([^<]*)</p>')
+_STYLE_ATTR_RE = re.compile(rb'\bstyle\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.I)
+_META_RE = re.compile(rb'<meta name="([^"]*)" content="([^"]*)"')
+_HEAD_END_RE = re.compile(rb'</head\s*>', re.I)
+_WHITESPACE_RE = re.compile(rb'\s*')
+
+# How far back to look for a "<!-- Title Section -->" comment above a card
+_COMMENT_LOOKBEHIND = 512
+
+
+class CardSpan:
+    """Byte range of one section.card, including its leading comment.
+
+    style is the section's style attribute, or None.
+    """
+
+    def __init__(self, start, end, title, style=None):
+        self.start = start
+        self.end = end
+        self.title = title
+        self.style = style
+
+    def __repr__(self):
+        return f"CardSpan(start={self.start}, end={self.end}, title='{self.title}')"
+
+
+class PageScan:
+    """Byte offsets of the editable regions of a startup page."""
+
+    def __init__(self):
+        self.cards = []  # CardSpan objects in document order
+        self.contiguous = True  # False if anything but whitespace sits between cards
+        self.style = None  # (start, end) of the first <style> element's content
+        self.header_updated = None  # (start, end) of the header "Updated:" text
+        self.footer_year = None  # (start, end) of the footer copyright year
+        self.footer_updated = None  # (start, end) of the footer "Last updated:" text
+        self.meta = {}  # name -> content of the <meta name=... content=...> tags in <head>
+
+    def text(self, data, span):
+        """Return the decoded text of a span found in data, or None."""
+        if span is None:
+            return None
+        return data[span[0]:span[1]].decode('utf-8', 'replace')
+
+
+def _line_start(data, pos):
+    """Return the offset of the start of the line containing pos."""
+    return data.rfind(b'\n', 0, pos) + 1
+
+
+def _comment_start(data, start, limit):
+    """Extend a span to cover a "<!-- ... -->" comment directly above it."""
+    lookbehind_start = max(limit, start - _COMMENT_LOOKBEHIND)
+    head = data[lookbehind_start:start].rstrip()
+    if not head.endswith(b'-->'):
+        return start
+    comment = head.rfind(b'<!--')
+    if comment == -1:
+        return start
+    comment_line = _line_start(data, lookbehind_start + comment)
+    if data[comment_line:lookbehind_start + comment].strip() or comment_line < limit:
+        return start
+    return comment_line
+
+
+@contextlib.contextmanager
+def map_file(file_path):
+    """Map a file read-only for scanning without reading it into memory.
+
+    Yields an mmap object (b'' for an empty file, which cannot be mapped).
+    Slicing it returns bytes; nothing taken from it may outlive the block.
+    """
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def scan_meta(data):
+    """Return {name: content} of the <meta name=... content=...> tags in <head>."""
+    head_end = _HEAD_END_RE.search(data)
+    end = head_end.start() if head_end else len(data)
+    meta = {}
+    for match in _META_RE.finditer(data, 0, end):
+        meta.setdefault(match.group(1).decode('utf-8', 'replace'),
+                        match.group(2).decode('utf-8', 'replace'))
+    return meta
+
+
+def scan_file(file_path):
+    """Scan a page on disk through a memory map; see scan_page()."""
+    with map_file(file_path) as data:
+        return scan_page(data)
+
+
+def _card_title(data, start, end):
+    match = _CARD_TITLE_RE.search(data, start, end)
+    if not match:
+        return None
+    return html.unescape(_TAG_RE.sub(b'', match.group(1)).decode('utf-8', 'replace')).strip()
+
+
+def _style_attr(tag):
+    """Return the decoded style attribute of an opening tag, or None."""
+    match = _STYLE_ATTR_RE.search(tag)
+    if not match:
+        return None
+    value = match.group(1) if match.group(1) is not None else match.group(2)
+    return html.unescape(value.decode('utf-8', 'replace'))
+
+
+def scan_page(data):
+    """Locate the cards, meta tags and timestamp fields of a page in its raw bytes.
+
+    data may be bytes or a memory map (see map_file()); it is never decoded
+    as a whole. Only cards the parser would load are reported: direct section.card
+    children of main.main-grid that contain an h2.card-title. Each span
+    starts at the line of the card's "<!-- ... -->" comment (or its
+    <section> tag) and ends after the blank lines following </section>.
+    """
+    scan = PageScan()
+    scan.meta = scan_meta(data)
+
+    match = _STYLE_RE.search(data)
+    if match:
+        scan.style = match.span(1)
+
+    match = _HEADER_UPDATED_RE.search(data)
+    if match:
+        scan.header_updated = match.span(1)
+
+    main = _MAIN_OPEN_RE.search(data)
+    if main:
+        _scan_cards(data, main.end(), scan)
+
+    match = _FOOTER_UPDATED_RE.search(data, scan.cards[-1].end if scan.cards else 0)
+    if match:
+        scan.footer_year = match.span(1)
+        scan.footer_updated = match.span(2)
+
+    return scan
+
+
+def _scan_cards(data, pos, scan):
+    depth = 0
+    card_start = None
+    card_tag = None
+    previous_end = None
+
+    for match in _SECTION_TOKEN_RE.finditer(data, pos):
+        token = match.group()
+        if token[1:2] != b'/':
+            if depth == 0 and _CARD_CLASS_RE.search(token):
+                card_start = match.start()
+                card_tag = token
+            depth += 1
+            continue
+        if token[2:3].lower() == b'm':
+            if depth == 0:
+                break
+            continue
+        if depth == 0:
+            continue
+        depth -= 1
+        if depth or card_start is None:
+            continue
+
+        section_end = match.end()
+        title = _card_title(data, card_start, section_end)
+        start = _line_start(data, card_start)
+        if data[start:card_start].strip():
+            start = card_start
+        if title is None:
+            # Untitled sections are skipped by the parser; any such content
+            # between cards means the spans cannot simply be re-ordered
+            scan.contiguous = False
+            card_start = None
+            continue
+
+        start = _comment_start(data, start, previous_end or 0)
+
+        # Take the rest of the line and any blank lines that follow
+        end = _WHITESPACE_RE.match(data, section_end).end()
+        newline = data.rfind(b'\n', section_end, end)
+        end = newline + 1 if newline != -1 else section_end
+
+        if previous_end is not None and data[previous_end:start].strip():
+            scan.contiguous = False
+        previous_end = end
+        scan.cards.append(CardSpan(start, end, title, _style_attr(card_tag)))
+        card_start = None
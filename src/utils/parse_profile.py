@@ -0,0 +1,83 @@
+import contextlib
+import json
+import time
+
+
+class ParseProfile:
+    """Wall time per phase and counters collected while loading a page.
+
+    Pass an instance as profile= to HtmlParser.parse_html or load_from_file.
+    Phases entered more than once (e.g. 'read' for each chunk of a file)
+    accumulate; phases are reported in the order they were first entered.
+    """
+
+    def __init__(self):
+        self.phases = {}  # phase name -> seconds
+        self.counters = {}  # counter name -> value
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the body of a with block as part of phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, value):
+        """Record the value of counter name, e.g. the number of cards."""
+        self.counters[name] = value
+
+    def count_model(self, model):
+        """Record the cards and links of a loaded model.
+
+        Links of lazy cards that have not been read yet are not counted.
+        """
+        self.count("cards", len(model.cards))
+        self.count("links", sum(
+            len(card.links) + sum(len(links) for links in card.subsections.values())
+            for card in model.cards if card.is_loaded))
+
+    @property
+    def total(self):
+        """Seconds spent in all phases."""
+        return sum(self.phases.values())
+
+    def to_dict(self):
+        """Return the phases in milliseconds and the counters."""
+        return {
+            "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            "total_ms": round(self.total * 1000, 3),
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self):
+        """Return to_dict() as JSON text."""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def summary(self):
+        """Return a one-line summary, e.g. for a status bar."""
+        phases = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.phases.items())
+        counters = ", ".join(f"{value} {name}" for name, value in self.counters.items())
+        return f"{self.total * 1000:.1f} ms: {phases}" + (f" ({counters})" if counters else "")
+
+    def __repr__(self):
+        return f"ParseProfile({self.summary()})"
+
+
+class _NoProfile:
+    """Stand-in used when profiling is off; every call does nothing."""
+
+    _phase = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def count(self, name, value):
+        pass
+
+    def count_model(self, model):
+        pass
+
+
+NO_PROFILE = _NoProfile()
@@ -0,0 +1,281 @@
+import bisect
+import re
+from urllib.parse import urlsplit
+
+from src.models.card_model import Link
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+# URL parts that match nearly every link and would only add noise
+_URL_STOP_WORDS = frozenset(('www', 'http', 'https', 'html', 'htm', 'index'))
+
+# Terms shorter than this are only matched as prefixes, never fuzzily
+_MIN_FUZZY_LENGTH = 3
+
+# Match quality, summed over the terms of a query to rank hits
+_EXACT, _PREFIX, _FUZZY = 3, 2, 1
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return _WORD_RE.findall(text.casefold())
+
+
+def tokenize_url(url):
+    """Split a URL into host and path tokens, dropping the scheme and noise words."""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return tokenize(url)
+    if not parts.netloc:
+        # Relative links or plain text
+        return tokenize(url)
+    host = parts.hostname or ''
+    tokens = tokenize(host) + tokenize(parts.path) + tokenize(parts.query)
+    return [token for token in tokens if token not in _URL_STOP_WORDS]
+
+
+def _deletes(token):
+    """Return the token with each one of its characters deleted."""
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by at most one insertion, deletion,
+    substitution or swap of adjacent characters."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    if a[i + 1:] == b[i + 1:]:
+        return True
+    return (i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i]
+            and a[i + 2:] == b[i + 2:])
+
+
+class SearchHit:
+    """A card or a link that matched a query.
+
+    link is None when the card itself matched through its title.
+    """
+
+    __slots__ = ('card', 'link', 'score')
+
+    def __init__(self, card, link, score):
+        self.card = card
+        self.link = link
+        self.score = score
+
+    def __repr__(self):
+        name = self.link.name if self.link is not None else None
+        return f"SearchHit(card='{self.card.title}', link='{name}', score={self.score})"
+
+
+class SearchIndex:
+    """Inverted index over card titles, link names and link URLs of a model.
+
+    The index is built on the first query, then listens to the model's
+    change journal and updates only the entries a change touches. Queries
+    match every term either as a token prefix or, with fuzzy=True, within
+    one edit of a whole token.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._postings = {}  # token -> set of uids of the cards and links containing it
+        self._entries = {}  # uid -> (card, link or None, tokens)
+        self._card_entries = {}  # card uid -> set of uids of entries for the card
+        self._vocabulary = []  # sorted tokens, for prefix lookups
+        self._delete_index = None  # token with one character deleted -> tokens
+        self._built = False
+        model.add_listener(self._on_change)
+
+    def close(self):
+        """Stop following changes of the model."""
+        self.model.remove_listener(self._on_change)
+
+    def __len__(self):
+        self._build()
+        return len(self._entries)
+
+    # Maintenance
+
+    def _build(self):
+        # Deferred so opening a page does not read the links of lazy cards
+        if not self._built:
+            self._built = True
+            for card in self.model.cards:
+                self._add_card(card)
+
+    def _on_change(self, change):
+        if not self._built:
+            return
+        op = change.op
+        if op == 'set':
+            target = change.target
+            field = change.detail[0]
+            if isinstance(target, Link):
+                if field in ('name', 'url') and target.uid in self._entries:
+                    self._remove_entry(target.uid)
+                    self._add_link(change.card, target)
+            elif target is change.card and field == 'title':
+                self._remove_entry(target.uid)
+                self._add_entry(target.uid, target, None, tokenize(target.title))
+        elif op == 'add_link':
+            self._add_link(change.card, change.target)
+        elif op == 'remove_link':
+            self._remove_entry(change.target.uid)
+        elif op == 'reorder_links':
+            # The new list may hold different links: index the card again
+            self._remove_card(change.card)
+            self._add_card(change.card)
+        elif op == 'add_card':
+            self._add_card(change.card)
+        elif op == 'remove_card':
+            self._remove_card(change.card)
+        elif op == 'reorder_cards':
+            cards = {card.uid: card for card in self.model.cards}
+            for uid in [uid for uid in self._card_entries if uid not in cards]:
+                self._remove_entries(self._card_entries.pop(uid))
+            for uid, card in cards.items():
+                if uid not in self._card_entries:
+                    self._add_card(card)
+
+    def _add_card(self, card):
+        self._add_entry(card.uid, card, None, tokenize(card.title))
+        for link in card.links:
+            self._add_link(card, link)
+        for links in card.subsections.values():
+            for link in links:
+                self._add_link(card, link)
+
+    def _remove_card(self, card):
+        self._remove_entries(self._card_entries.pop(card.uid, ()))
+
+    def _add_link(self, card, link):
+        self._add_entry(link.uid, card, link, tokenize(link.name) + tokenize_url(link.url))
+
+    def _add_entry(self, uid, card, link, tokens):
+        tokens = frozenset(tokens)
+        self._entries[uid] = (card, link, tokens)
+        self._card_entries.setdefault(card.uid, set()).add(uid)
+        for token in tokens:
+            uids = self._postings.get(token)
+            if uids is None:
+                uids = self._postings[token] = set()
+                bisect.insort(self._vocabulary, token)
+                if self._delete_index is not None:
+                    self._index_deletes(token)
+            uids.add(uid)
+
+    def _remove_entries(self, uids):
+        for uid in list(uids):
+            self._remove_entry(uid)
+
+    def _remove_entry(self, uid):
+        entry = self._entries.pop(uid, None)
+        if entry is None:
+            return
+        card, _, tokens = entry
+        card_entries = self._card_entries.get(card.uid)
+        if card_entries is not None:
+            card_entries.discard(uid)
+        for token in tokens:
+            uids = self._postings[token]
+            uids.discard(uid)
+            if not uids:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+                if self._delete_index is not None:
+                    self._unindex_deletes(token)
+
+    def _index_deletes(self, token):
+        if len(token) < _MIN_FUZZY_LENGTH:
+            return
+        for key in _deletes(token) | {token}:
+            self._delete_index.setdefault(key, set()).add(token)
+
+    def _unindex_deletes(self, token):
+        if len(token) < _MIN_FUZZY_LENGTH:
+            return
+        for key in _deletes(token) | {token}:
+            tokens = self._delete_index.get(key)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._delete_index[key]
+
+    # Queries
+
+    def _prefix_tokens(self, term):
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + '\U0010ffff', start)
+        return self._vocabulary[start:end]
+
+    def _fuzzy_tokens(self, term):
+        if len(term) < _MIN_FUZZY_LENGTH:
+            return set()
+        if self._delete_index is None:
+            # Built on the first fuzzy query, then kept up to date
+            self._delete_index = {}
+            for token in self._vocabulary:
+                self._index_deletes(token)
+        candidates = set()
+        for key in _deletes(term) | {term}:
+            candidates |= self._delete_index.get(key, set())
+        return {token for token in candidates if _within_one_edit(term, token)}
+
+    def _match_term(self, term, fuzzy):
+        """Return {uid: quality} of the entries matching one query term."""
+        matches = {}
+        if fuzzy:
+            for token in self._fuzzy_tokens(term):
+                for uid in self._postings[token]:
+                    matches[uid] = _FUZZY
+        for token in self._prefix_tokens(term):
+            quality = _EXACT if token == term else _PREFIX
+            for uid in self._postings[token]:
+                if matches.get(uid, 0) < quality:
+                    matches[uid] = quality
+        return matches
+
+    def _score(self, query, fuzzy):
+        """Return {uid: score} of the entries matching every term of query."""
+        self._build()
+        scores = {}
+        for i, term in enumerate(sorted(set(tokenize(query)), key=len, reverse=True)):
+            matches = self._match_term(term, fuzzy)
+            if i == 0:
+                scores = matches
+            else:
+                scores = {uid: score + matches[uid] for uid, score in scores.items()
+                          if uid in matches}
+            if not scores:
+                break
+        return scores
+
+    def search(self, query, fuzzy=False, limit=None):
+        """Return the SearchHits for every entry matching all terms of query.
+
+        Hits are ordered by score, then by position of their card on the page.
+        """
+        scores = self._score(query, fuzzy)
+        hits = []
+        for uid, score in scores.items():
+            card, link, _ = self._entries[uid]
+            hits.append(SearchHit(card, link, score))
+        index_of = self.model.index_of
+        hits.sort(key=lambda hit: (-hit.score, index_of(hit.card) or 0,
+                                   hit.link is not None, hit.link.uid if hit.link else 0))
+        return hits[:limit] if limit is not None else hits
+
+    def matching_cards(self, query, fuzzy=False):
+        """Return the uids of the cards with a title or link matching query."""
+        return {self._entries[uid][0].uid for uid in self._score(query, fuzzy)}
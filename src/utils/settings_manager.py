@@ -14,7 +14,8 @@ class SettingsManager:
             "last_file": None,  # Path to the last opened file
             "window_size": [1000, 700],  # Default window size
             "dark_mode": False,  # Default theme
-            "zoom_level": 1.0  # Default zoom level (100%)
+            "zoom_level": 1.0,  # Default zoom level (100%)
+            "profile_loading": False  # Show per-phase load timings after opening a file
         }
         
         # Create directory if it doesn't exist
@@ -0,0 +1,291 @@
+from lxml import etree
+
+from src.models.card_model import Card, Link, StartupPageModel
+from src.utils.parse_profile import NO_PROFILE
+
+# Strings inside these elements are not part of an element's visible text
+# (BeautifulSoup's get_text() skips them as well).
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+# Size of the chunks fed to the parser when reading from a file
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Style that marks a div.link-grid as a subsection grid
+SUBSECTION_GRID_STYLE = 'margin-top: 1rem;'
+
+# Title of subsection grids written without a data-subsection attribute
+UNTITLED_SUBSECTION = "Additional Links"
+
+# Markup around a lone card so it is parsed as a child of main.main-grid
+_FRAGMENT_OPEN = b'<main class="main-grid">'
+_FRAGMENT_CLOSE = b'</main>'
+
+
+class _LinkSlot:
+    """A div.link-item waiting for the first <a> inside it to close."""
+
+    def __init__(self):
+        self.anchor = None
+
+
+class _Anchor:
+    """Text, href and style collected for an <a> element."""
+
+    def __init__(self, href, style):
+        self.href = href
+        self.style = style
+        self.parts = []
+
+
+def style_declarations(style_attr):
+    """Return the declarations of a style attribute as {property: value}.
+
+    Property names are lowercased; the last declaration of a property wins,
+    as in the browser.
+    """
+    declarations = {}
+    if style_attr:
+        for declaration in style_attr.split(';'):
+            name, colon, value = declaration.partition(':')
+            if colon and value.strip():
+                declarations[name.strip().lower()] = value.strip()
+    return declarations
+
+
+def link_from_anchor(name, href, style_attr):
+    """Return the Link for an anchor, with the font size and color of its style."""
+    style = style_declarations(style_attr)
+    return Link(name=name, url=href, font_size=style.get('font-size', ''),
+                font_color=style.get('color', ''))
+
+
+def card_background(style_attr):
+    """Return the background color in a section.card's style attribute, or ''."""
+    return style_declarations(style_attr).get('background-color', '')
+
+
+def subsection_title(title_attr, index):
+    """Return the title of the index-th subsection grid of a card.
+
+    Grids written by the editor carry their title in data-subsection; older
+    pages have untitled grids, which are numbered after the first one.
+    """
+    if title_attr:
+        return title_attr
+    return UNTITLED_SUBSECTION if index == 0 else f"{UNTITLED_SUBSECTION} {index + 1}"
+
+
+class _CardState:
+    """Per-section state collected while a section.card is open."""
+
+    def __init__(self, depth, background_color):
+        self.depth = depth
+        self.background_color = background_color
+        self.title_parts = None
+        self.title_depth = None
+        self.main_slots = []
+        self.subsections = []  # (title, slots) of each subsection grid, in order
+        self.subsection_depth = None
+
+
+class StreamingPageTarget:
+    """lxml parser target that builds a StartupPageModel from parse events.
+
+    The target mirrors the selectors used by ``HtmlParser.parse_html``
+    (``main.main-grid > section.card``, ``h2.card-title``, links of the
+    ``div.link-grid`` elements and every subsection grid
+    ``div.link-grid[style="margin-top: 1rem;"]``) but never builds a tree:
+    each Card is created and added to the model when its section closes.
+    """
+
+    def __init__(self):
+        self.model = StartupPageModel()
+        self._stack = []  # (tag, classes) of the open elements
+        self._non_text_depth = 0
+
+        self._style_parts = None
+        self._style_depth = None
+        self._style_done = False
+
+        self._footer_parts = None
+        self._footer_depth = None
+        self._footer_done = False
+
+        self._card = None
+        self._open_slots = []  # (depth, slot) of the open div.link-items
+        self._anchor = None
+        self._anchor_depth = None
+
+    def start(self, tag, attrib):
+        parent = self._stack[-1] if self._stack else None
+        classes = attrib.get('class', '').split()
+        self._stack.append((tag, classes))
+        depth = len(self._stack)
+
+        if tag in _NON_TEXT_TAGS:
+            self._non_text_depth += 1
+
+        if tag == 'style' and not self._style_done and self._style_parts is None:
+            self._style_parts = []
+            self._style_depth = depth
+        elif tag == 'footer' and not self._footer_done and self._footer_parts is None:
+            self._footer_parts = []
+            self._footer_depth = depth
+
+        card = self._card
+        if card is None:
+            if (tag == 'section' and 'card' in classes and parent is not None
+                    and parent[0] == 'main' and 'main-grid' in parent[1]):
+                self._card = _CardState(depth, card_background(attrib.get('style')))
+            return
+
+        if tag == 'h2' and 'card-title' in classes and card.title_parts is None:
+            card.title_parts = []
+            card.title_depth = depth
+        elif tag == 'div':
+            if ('link-grid' in classes and card.subsection_depth is None
+                    and attrib.get('style') == SUBSECTION_GRID_STYLE):
+                title = subsection_title(attrib.get('data-subsection'), len(card.subsections))
+                card.subsections.append((title, []))
+                card.subsection_depth = depth
+            if 'link-item' in classes:
+                slot = _LinkSlot()
+                if card.subsection_depth is not None:
+                    card.subsections[-1][1].append(slot)
+                elif parent[0] == 'div' and 'link-grid' in parent[1]:
+                    card.main_slots.append(slot)
+                self._open_slots.append((depth, slot))
+        elif tag == 'a' and self._anchor is None:
+            anchor = _Anchor(attrib.get('href', ''), attrib.get('style'))
+            for _, slot in self._open_slots:
+                if slot.anchor is None:
+                    slot.anchor = anchor
+            self._anchor = anchor
+            self._anchor_depth = depth
+
+    def end(self, tag):
+        # lxml reports an end event for every start event, but guard against
+        # mismatches so a malformed page cannot desynchronise the stack.
+        while self._stack:
+            open_tag, _ = self._stack[-1]
+            self._close(len(self._stack), open_tag)
+            self._stack.pop()
+            if open_tag == tag:
+                break
+
+    def _close(self, depth, tag):
+        if tag in _NON_TEXT_TAGS:
+            self._non_text_depth -= 1
+
+        if depth == self._style_depth:
+            text = ''.join(self._style_parts)
+            # Match BeautifulSoup's Tag.string, which is None for an empty tag
+            self.model.css_styles = text if text else None
+            self._style_parts = None
+            self._style_depth = None
+            self._style_done = True
+        elif depth == self._footer_depth:
+            last_updated_text = ''.join(self._footer_parts)
+            if 'Last updated:' in last_updated_text:
+                self.model.last_updated = last_updated_text.split('Last updated:')[1].strip()
+            self._footer_parts = None
+            self._footer_depth = None
+            self._footer_done = True
+
+        card = self._card
+        if card is None:
+            return
+
+        if depth == self._anchor_depth:
+            self._anchor = None
+            self._anchor_depth = None
+        if self._open_slots and self._open_slots[-1][0] == depth:
+            self._open_slots.pop()
+        if depth == card.title_depth:
+            card.title_depth = None
+        if depth == card.subsection_depth:
+            card.subsection_depth = None
+        if depth == card.depth:
+            self._finish_card(card)
+            self._card = None
+
+    def _finish_card(self, state):
+        if state.title_parts is None:
+            return
+
+        card = Card(title=''.join(state.title_parts).strip(), background_color=state.background_color)
+        for slot in state.main_slots:
+            if slot.anchor is not None:
+                card.add_link(self._make_link(slot.anchor))
+        for title, slots in state.subsections:
+            for slot in slots:
+                if slot.anchor is not None:
+                    card.add_subsection_link(title, self._make_link(slot.anchor))
+        self.model.add_card(card)
+
+    @staticmethod
+    def _make_link(anchor):
+        return link_from_anchor(''.join(anchor.parts).strip(), anchor.href, anchor.style)
+
+    def data(self, data):
+        if self._style_parts is not None and len(self._stack) == self._style_depth:
+            self._style_parts.append(data)
+        if self._non_text_depth:
+            return
+        if self._footer_parts is not None:
+            self._footer_parts.append(data)
+        card = self._card
+        if card is not None:
+            if card.title_depth is not None:
+                card.title_parts.append(data)
+            if self._anchor is not None:
+                self._anchor.parts.append(data)
+
+    def close(self):
+        self.model.mark_clean()
+        return self.model
+
+
+def parse_html_streaming(html_content):
+    """Parse HTML content without building a tree and return a StartupPageModel."""
+    parser = etree.HTMLParser(target=StreamingPageTarget())
+    parser.feed(html_content)
+    return parser.close()
+
+
+def parse_file_streaming(file_path, profile=None):
+    """Parse an HTML file in chunks and return a StartupPageModel.
+
+    With a ParseProfile, reading the chunks and parsing them (which builds
+    the model as it goes) are timed as the 'read' and 'parse' phases.
+    """
+    if profile is None:
+        profile = NO_PROFILE
+    parser = etree.HTMLParser(target=StreamingPageTarget(), encoding='utf-8')
+    with open(file_path, 'rb') as file:
+        while True:
+            with profile.phase('read'):
+                chunk = file.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            with profile.phase('parse'):
+                parser.feed(chunk)
+    with profile.phase('parse'):
+        return parser.close()
+
+
+def parse_card_fragment(fragment):
+    """Parse the bytes of a single section.card and return (links, subsections).
+
+    Used to read the links of lazily loaded cards; the fragment is parsed
+    exactly as the card would be as part of the whole page.
+    """
+    parser = etree.HTMLParser(target=StreamingPageTarget(), encoding='utf-8')
+    parser.feed(_FRAGMENT_OPEN)
+    parser.feed(fragment)
+    parser.feed(_FRAGMENT_CLOSE)
+    model = parser.close()
+    if not model.cards:
+        return [], {}
+    card = model.cards[0]
+    return card.links, card.subsections
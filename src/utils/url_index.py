@@ -0,0 +1,160 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset((
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga',
+))
+TRACKING_PREFIXES = ('utm_',)
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url):
+    """Return a key under which URLs that lead to the same page compare equal.
+
+    The scheme and host are lowercased, default ports, trailing slashes,
+    empty fragments and tracking parameters (utm_*, fbclid, ...) are
+    dropped and the remaining query parameters are sorted. Strings that do
+    not parse as absolute URLs are only stripped of surrounding whitespace.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.username or parts.password:
+        host = parts.netloc.rsplit('@', 1)[0] + '@' + host
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        host += f':{port}'
+
+    path = parts.path.rstrip('/')
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ))
+    return urlunsplit((scheme, host, path, query, parts.fragment))
+
+
+class UrlIndex:
+    """Index of the links of a model by normalized URL.
+
+    Built on the first query and then kept up to date from the model's
+    change journal, so checking whether a URL is already on the page is a
+    single dict lookup.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._links = {}  # normalized URL -> {link uid: (card, link)}
+        self._keys = {}  # link uid -> normalized URL it is filed under
+        self._card_links = {}  # card uid -> set of uids of its indexed links
+        self._built = False
+        model.add_listener(self._on_change)
+
+    def close(self):
+        """Stop following changes of the model."""
+        self.model.remove_listener(self._on_change)
+
+    def _build(self):
+        # Deferred so opening a page does not read the links of lazy cards
+        if not self._built:
+            self._built = True
+            for card in self.model.cards:
+                self._add_card(card)
+
+    def _on_change(self, change):
+        if not self._built:
+            return
+        op = change.op
+        if op == 'set':
+            if change.detail[0] == 'url' and change.target.uid in self._keys:
+                self._remove_link(change.target.uid)
+                self._add_link(change.card, change.target)
+        elif op == 'add_link':
+            self._add_link(change.card, change.target)
+        elif op == 'remove_link':
+            self._remove_link(change.target.uid)
+        elif op == 'reorder_links':
+            # The new list may hold different links: index the card again
+            self._remove_card(change.card)
+            self._add_card(change.card)
+        elif op == 'add_card':
+            self._add_card(change.card)
+        elif op == 'remove_card':
+            self._remove_card(change.card)
+        elif op == 'reorder_cards':
+            cards = {card.uid: card for card in self.model.cards}
+            for uid in [uid for uid in self._card_links if uid not in cards]:
+                for link_uid in list(self._card_links.pop(uid)):
+                    self._remove_link(link_uid)
+            for uid, card in cards.items():
+                if uid not in self._card_links:
+                    self._add_card(card)
+
+    def _add_card(self, card):
+        self._card_links.setdefault(card.uid, set())
+        for link in card.links:
+            self._add_link(card, link)
+        for links in card.subsections.values():
+            for link in links:
+                self._add_link(card, link)
+
+    def _remove_card(self, card):
+        for uid in list(self._card_links.pop(card.uid, ())):
+            self._remove_link(uid)
+
+    def _add_link(self, card, link):
+        key = normalize_url(link.url)
+        self._links.setdefault(key, {})[link.uid] = (card, link)
+        self._keys[link.uid] = key
+        self._card_links.setdefault(card.uid, set()).add(link.uid)
+
+    def _remove_link(self, uid):
+        key = self._keys.pop(uid, None)
+        if key is None:
+            return
+        occurrences = self._links[key]
+        card, _ = occurrences.pop(uid)
+        if not occurrences:
+            del self._links[key]
+        card_links = self._card_links.get(card.uid)
+        if card_links is not None:
+            card_links.discard(uid)
+
+    def occurrences(self, url):
+        """Return (card, link) pairs for every link on the page with this URL."""
+        self._build()
+        return list(self._links.get(normalize_url(url), {}).values())
+
+    def clusters(self):
+        """Return {normalized URL: [(card, link), ...]} for every duplicated URL."""
+        self._build()
+        return {key: list(occurrences.values())
+                for key, occurrences in self._links.items() if len(occurrences) > 1}
+
+
+def duplicate_clusters(model):
+    """Group the links of a model by normalized URL in a single pass.
+
+    Returns {normalized URL: [(card, link), ...]} for URLs that appear more
+    than once, in the order the first occurrence appears on the page.
+    """
+    groups = {}
+    for card in model.cards:
+        for link in card.links:
+            groups.setdefault(normalize_url(link.url), []).append((card, link))
+        for links in card.subsections.values():
+            for link in links:
+                groups.setdefault(normalize_url(link.url), []).append((card, link))
+    return {key: occurrences for key, occurrences in groups.items() if len(occurrences) > 1}
@@ -9,6 +9,12 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QFont
 import re
 from src.models.card_model import Card, Link
+from src.utils.stream_parser import UNTITLED_SUBSECTION
+from src.utils.url_index import normalize_url
+
+# Color formats accepted by the link editor
+HEX_COLOR_RE = re.compile(r'^#([A-Fa-f0-9]{6}|[A-Fa-f0-9]{3})$')
+RGB_COLOR_RE = re.compile(r'^rgb\(\s*\d+\s*,\s*\d+\s*,\s*\d+\s*\)$')
 
 
 class LinkEditorDialog(QDialog):
@@ -161,12 +167,7 @@ class LinkEditorDialog(QDialog):
     def isValidColor(self, color):
         """Check if the provided color string is valid."""
         # Simple validation for hex and rgb formats
-        hex_pattern = r'^#([A-Fa-f0-9]{6}|[A-Fa-f0-9]{3})$'
-        rgb_pattern = r'^rgb\(\s*\d+\s*,\s*\d+\s*,\s*\d+\s*\)$'
-        
-        if re.match(hex_pattern, color) or re.match(rgb_pattern, color):
-            return True
-        return False
+        return bool(HEX_COLOR_RE.match(color) or RGB_COLOR_RE.match(color))
         
     def parseUrlDescription(self):
         """Parse a URL,Description pair and populate the fields."""
@@ -210,10 +211,11 @@ class LinkEditorDialog(QDialog):
 class CardEditorDialog(QDialog):
     """Dialog for editing a card with its links and subsections."""
     
-    def __init__(self, card=None, parent=None):
+    def __init__(self, card=None, parent=None, url_index=None):
         super().__init__(parent)
         
         self.card = card if card else Card()
+        self.url_index = url_index  # UrlIndex of the page, to flag duplicate links
         self.setWindowTitle("Edit Card")
         self.setMinimumSize(550, 350)
         
@@ -281,6 +283,7 @@ class CardEditorDialog(QDialog):
         self.mainLinksList = QListWidget()
         self.updateMainLinksList()
         self.mainLinksList.setMinimumHeight(120)  # Reduced from 200
+        self.mainLinksList.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.mainLinksList.setDragEnabled(True)
         self.mainLinksList.setAcceptDrops(True)
         self.mainLinksList.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
@@ -327,16 +330,27 @@ class CardEditorDialog(QDialog):
         subsectionsLayout.setContentsMargins(6, 6, 6, 6)  # Reduce margins
         subsectionsLayout.setSpacing(6)  # Reduce spacing
         
-        # Create a title label at the top
-        subsectionsLabel = QLabel("Additional Links:")
+        # Subsection selector at the top
+        subsectionSelectorLayout = QHBoxLayout()
+        subsectionSelectorLayout.setContentsMargins(0, 0, 0, 0)
+        subsectionsLabel = QLabel("Subsection:")
         subsectionsLabel.setStyleSheet("font-size: 12px; font-weight: bold;")  # Smaller font
-        subsectionsLabel.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        subsectionsLayout.addWidget(subsectionsLabel, 0, Qt.AlignmentFlag.AlignTop)
+        subsectionSelectorLayout.addWidget(subsectionsLabel)
+        
+        self.subsectionCombo = QComboBox()
+        self.subsectionCombo.currentIndexChanged.connect(self.updateSubsectionLinksList)
+        subsectionSelectorLayout.addWidget(self.subsectionCombo, 1)
+        
+        newSubsectionButton = QPushButton("New Subsection")
+        newSubsectionButton.clicked.connect(self.addSubsection)
+        subsectionSelectorLayout.addWidget(newSubsectionButton)
+        subsectionsLayout.addLayout(subsectionSelectorLayout, 0)
         
         # Create the list widget
         self.subsectionLinksList = QListWidget()
-        self.updateSubsectionLinksList()
+        self.refreshSubsectionCombo()
         self.subsectionLinksList.setMinimumHeight(120)  # Reduced from 200
+        self.subsectionLinksList.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.subsectionLinksList.setDragEnabled(True)
         self.subsectionLinksList.setAcceptDrops(True)
         self.subsectionLinksList.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
@@ -375,7 +389,7 @@ class CardEditorDialog(QDialog):
         # Add button layout at the bottom with no stretch factor
         subsectionsLayout.addLayout(subsectionButtonLayout, 0)
         
-        tabWidget.addTab(subsectionsTab, "Additional Links")
+        tabWidget.addTab(subsectionsTab, "Subsections")
         
         layout.addWidget(tabWidget)
         
@@ -409,7 +423,7 @@ class CardEditorDialog(QDialog):
     def onSubsectionLinksOrderChanged(self, parent, start, end, destination, row):
         """Handle reordering of subsection links in the list."""
         # Update the card's subsection links to reflect the new order
-        subsection_title = "Additional Links"
+        subsection_title = self.currentSubsection()
         new_order = []
         for i in range(self.subsectionLinksList.count()):
             item = self.subsectionLinksList.item(i)
@@ -417,7 +431,7 @@ class CardEditorDialog(QDialog):
             new_order.append(link)
         
         if subsection_title in self.card.subsections:
-            self.card.subsections[subsection_title] = new_order
+            self.card.set_subsection_links(subsection_title, new_order)
     
     def updateMainLinksList(self):
         """Update the list of main links."""
@@ -427,12 +441,42 @@ class CardEditorDialog(QDialog):
             item.setData(Qt.ItemDataRole.UserRole, link)
             self.mainLinksList.addItem(item)
     
+    def currentSubsection(self):
+        """Return the title of the subsection selected for editing."""
+        return self.subsectionCombo.currentText() or UNTITLED_SUBSECTION
+    
+    def refreshSubsectionCombo(self, select=None):
+        """List the card's subsections in order and select one of them.
+        
+        select defaults to the current selection. A title the card does not
+        have yet (a new, still empty subsection) is listed after the others;
+        a card without subsections offers the default title.
+        """
+        if select is None:
+            select = self.subsectionCombo.currentText()
+        titles = list(self.card.subsections) or [UNTITLED_SUBSECTION]
+        if select and select not in titles:
+            titles.append(select)
+        
+        self.subsectionCombo.blockSignals(True)
+        self.subsectionCombo.clear()
+        self.subsectionCombo.addItems(titles)
+        self.subsectionCombo.setCurrentIndex(titles.index(select) if select in titles else 0)
+        self.subsectionCombo.blockSignals(False)
+        self.updateSubsectionLinksList()
+    
+    def addSubsection(self):
+        """Ask for a title and select a new subsection with it."""
+        title, ok = QInputDialog.getText(self, "New Subsection", "Subsection title:")
+        title = title.strip()
+        if ok and title:
+            self.refreshSubsectionCombo(select=title)
+    
     def updateSubsectionLinksList(self):
-        """Update the list of subsection links."""
+        """Update the list with the links of the selected subsection."""
         self.subsectionLinksList.clear()
         
-        # For simplicity, we're just showing the first subsection (if it exists)
-        subsection_title = "Additional Links"
+        subsection_title = self.currentSubsection()
         if subsection_title in self.card.subsections:
             for link in self.card.subsections[subsection_title]:
                 item = QListWidgetItem(f"{link.name} - {link.url}")
@@ -460,32 +504,22 @@ class CardEditorDialog(QDialog):
             self.updateMainLinksList()
     
     def removeMainLink(self):
-        """Remove the selected main link."""
-        selected_item = self.mainLinksList.currentItem()
-        if not selected_item:
+        """Remove the selected main links."""
+        links = self.selectedLinks(self.mainLinksList)
+        if not links:
             QMessageBox.warning(self, "Warning", "Please select a link to remove.")
             return
         
-        link = selected_item.data(Qt.ItemDataRole.UserRole)
-        
-        # Ask for confirmation
-        confirm = QMessageBox.question(
-            self, "Confirm Removal", 
-            f"Are you sure you want to remove '{link.name}'?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        
-        if confirm == QMessageBox.StandardButton.Yes:
-            self.card.remove_link(link)
+        if self.confirmLinkRemoval(links):
+            self.card.remove_links(links)
             self.updateMainLinksList()
     
     def addSubsectionLink(self):
-        """Add a new link to the subsection."""
+        """Add a new link to the selected subsection."""
         dialog = LinkEditorDialog(parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            subsection_title = "Additional Links"
-            self.card.add_subsection_link(subsection_title, dialog.link)
-            self.updateSubsectionLinksList()
+            self.card.add_subsection_link(self.currentSubsection(), dialog.link)
+            self.refreshSubsectionCombo()
     
     def editSubsectionLink(self):
         """Edit the selected subsection link."""
@@ -501,25 +535,34 @@ class CardEditorDialog(QDialog):
             self.updateSubsectionLinksList()
     
     def removeSubsectionLink(self):
-        """Remove the selected subsection link."""
-        selected_item = self.subsectionLinksList.currentItem()
-        if not selected_item:
+        """Remove the selected subsection links."""
+        links = self.selectedLinks(self.subsectionLinksList)
+        if not links:
             QMessageBox.warning(self, "Warning", "Please select a link to remove.")
             return
         
-        link = selected_item.data(Qt.ItemDataRole.UserRole)
+        if self.confirmLinkRemoval(links):
+            # Removing the last link removes the subsection from the card
+            self.card.remove_links(links, self.currentSubsection())
+            self.refreshSubsectionCombo()
+    
+    def selectedLinks(self, list_widget):
+        """Return the links selected in a list widget, in list order."""
+        items = sorted(list_widget.selectedItems(), key=list_widget.row)
+        return [item.data(Qt.ItemDataRole.UserRole) for item in items]
+    
+    def confirmLinkRemoval(self, links):
+        """Ask before removing links; returns True if the user agreed."""
+        if len(links) == 1:
+            question = f"Are you sure you want to remove '{links[0].name}'?"
+        else:
+            question = f"Are you sure you want to remove {len(links)} links?"
         
-        # Ask for confirmation
         confirm = QMessageBox.question(
-            self, "Confirm Removal", 
-            f"Are you sure you want to remove '{link.name}'?",
+            self, "Confirm Removal", question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
-        
-        if confirm == QMessageBox.StandardButton.Yes:
-            subsection_title = "Additional Links"
-            self.card.remove_subsection_link(subsection_title, link)
-            self.updateSubsectionLinksList()
+        return confirm == QMessageBox.StandardButton.Yes
     
     def addMultipleMainLinks(self):
         """Add multiple links to the main section from URL,Description pairs."""
@@ -558,7 +601,7 @@ class CardEditorDialog(QDialog):
             text = textEdit.toPlainText()
             lines = text.strip().split('\n')
             
-            added_count = 0
+            new_links = []
             skipped_count = 0
             
             for line in lines:
@@ -571,26 +614,29 @@ class CardEditorDialog(QDialog):
                     name = parts[1].strip()
                     
                     if url and name:
-                        link = Link(name=name, url=url)
-                        self.card.add_link(link)
-                        added_count += 1
+                        new_links.append(Link(name=name, url=url))
                     else:
                         skipped_count += 1
                 else:
                     skipped_count += 1
             
+            links = self.confirmDuplicateLinks(new_links)
+            for link in links:
+                self.card.add_link(link)
+            
             self.updateMainLinksList()
             
             # Show results
             QMessageBox.information(
                 self,
                 "Links Added",
-                f"Added {added_count} links to main section.\n"
-                f"Skipped {skipped_count} invalid entries."
+                f"Added {len(links)} links to main section.\n"
+                f"Skipped {skipped_count} invalid entries"
+                f" and {len(new_links) - len(links)} duplicates."
             )
     
     def addMultipleSubsectionLinks(self):
-        """Add multiple links to the subsection from URL,Description pairs."""
+        """Add multiple links to the selected subsection from URL,Description pairs."""
         dialog = QDialog(self)
         dialog.setWindowTitle("Add Multiple Links")
         dialog.setMinimumSize(400, 300)
@@ -626,8 +672,8 @@ class CardEditorDialog(QDialog):
             text = textEdit.toPlainText()
             lines = text.strip().split('\n')
             
-            subsection_title = "Additional Links"
-            added_count = 0
+            subsection_title = self.currentSubsection()
+            new_links = []
             skipped_count = 0
             
             for line in lines:
@@ -640,24 +686,77 @@ class CardEditorDialog(QDialog):
                     name = parts[1].strip()
                     
                     if url and name:
-                        link = Link(name=name, url=url)
-                        self.card.add_subsection_link(subsection_title, link)
-                        added_count += 1
+                        new_links.append(Link(name=name, url=url))
                     else:
                         skipped_count += 1
                 else:
                     skipped_count += 1
             
-            self.updateSubsectionLinksList()
+            links = self.confirmDuplicateLinks(new_links)
+            for link in links:
+                self.card.add_subsection_link(subsection_title, link)
+            
+            self.refreshSubsectionCombo()
             
             # Show results
             QMessageBox.information(
                 self,
                 "Links Added",
-                f"Added {added_count} links to additional section.\n"
-                f"Skipped {skipped_count} invalid entries."
+                f"Added {len(links)} links to {subsection_title}.\n"
+                f"Skipped {skipped_count} invalid entries"
+                f" and {len(new_links) - len(links)} duplicates."
             )
     
+    def findDuplicateLinks(self, links):
+        """Return (link, card titles) for each link whose URL is already in use.
+        
+        A URL counts as used if it is on this card, anywhere on the page (via
+        the UrlIndex) or earlier in links itself.
+        """
+        this_card = self.card.title or "this card"
+        known = {}
+        card_links = list(self.card.links)
+        for section in self.card.subsections.values():
+            card_links.extend(section)
+        for link in card_links:
+            known.setdefault(normalize_url(link.url), set()).add(this_card)
+        
+        duplicates = []
+        for link in links:
+            key = normalize_url(link.url)
+            titles = set(known.get(key, ()))
+            if self.url_index is not None:
+                titles.update(card.title for card, _ in self.url_index.occurrences(link.url))
+            if titles:
+                duplicates.append((link, sorted(titles)))
+            known.setdefault(key, set()).add(this_card)
+        return duplicates
+    
+    def confirmDuplicateLinks(self, links):
+        """Ask whether links already on the page should be added again.
+        
+        Returns the links to add: all of them, or only the new ones.
+        """
+        duplicates = self.findDuplicateLinks(links)
+        if not duplicates:
+            return links
+        
+        lines = [f"{link.url} ({', '.join(titles)})" for link, titles in duplicates[:10]]
+        if len(duplicates) > 10:
+            lines.append(f"... and {len(duplicates) - 10} more")
+        reply = QMessageBox.question(
+            self, "Duplicate Links",
+            f"{len(duplicates)} of these links are already on the page:\n\n"
+            + "\n".join(lines) + "\n\nAdd them anyway?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            return links
+        
+        duplicate_ids = {id(link) for link, _ in duplicates}
+        return [link for link in links if id(link) not in duplicate_ids]
+    
     def accept(self):
         """Called when the user accepts the dialog."""
         title = self.titleEdit.text().strip()
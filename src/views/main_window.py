@@ -10,12 +10,15 @@ from PyQt6.QtWidgets import (
     QPushButton, QListWidget, QListWidgetItem, QTabWidget,
     QMessageBox, QFileDialog, QSplitter, QGroupBox, QScrollArea,
     QStatusBar, QToolBar, QApplication, QDialog, QAbstractItemView,
-    QInputDialog, QTextEdit
+    QInputDialog, QTextEdit, QLineEdit
 )
 from PyQt6.QtCore import Qt, QSize, pyqtSignal
 from PyQt6.QtGui import QAction, QIcon, QColor, QPalette, QTransform, QWheelEvent
 
-from src.utils.html_parser import HtmlParser
+from src.utils.model_store import load_page, save_page
+from src.utils.parse_profile import ParseProfile
+from src.utils.search_index import SearchIndex
+from src.utils.url_index import UrlIndex
 from src.utils.settings_manager import SettingsManager
 from src.utils.theme_manager import ThemeManager, ThemeDialog
 from src.views.card_editor import CardEditorDialog
@@ -242,6 +245,8 @@ class MainWindow(QMainWindow):
         super().__init__()
         
         self.model = StartupPageModel()
+        self.search_index = SearchIndex(self.model)
+        self.url_index = UrlIndex(self.model)
         self.current_file = None
         self.last_commit_date = last_commit_date or ""
         self.zoomIndicator = None  # Initialize the zoomIndicator attribute
@@ -332,6 +337,11 @@ class MainWindow(QMainWindow):
         addCardAction.triggered.connect(self.addCard)
         editMenu.addAction(addCardAction)
         
+        duplicatesAction = QAction("Find &Duplicate Links...", self)
+        duplicatesAction.setStatusTip("List links whose URL appears more than once")
+        duplicatesAction.triggered.connect(self.showDuplicateLinks)
+        editMenu.addAction(duplicatesAction)
+        
         # View menu
         viewMenu = menubar.addMenu("&View")
         
@@ -394,6 +404,14 @@ class MainWindow(QMainWindow):
         checkVersionAction.triggered.connect(self.checkForUpdates)
         helpMenu.addAction(checkVersionAction)
         
+        profileLoadingAction = QAction("&Profile File Loading", self)
+        profileLoadingAction.setCheckable(True)
+        profileLoadingAction.setChecked(self.settings_manager.get_setting("profile_loading", False))
+        profileLoadingAction.setStatusTip("Show how long each phase of opening a file takes")
+        profileLoadingAction.toggled.connect(
+            lambda checked: self.settings_manager.set_setting("profile_loading", checked))
+        helpMenu.addAction(profileLoadingAction)
+        
         helpMenu.addSeparator()
         
         aboutAction = QAction("&About", self)
@@ -481,12 +499,19 @@ class MainWindow(QMainWindow):
         cardListLabel.setStyleSheet("font-weight: bold; font-size: 14px;")
         self.scalable_components.append({"widget": cardListLabel, "base_font_size": 14})
         
+        self.searchBox = QLineEdit()
+        self.searchBox.setPlaceholderText("Search cards and links...")
+        self.searchBox.setClearButtonEnabled(True)
+        self.searchBox.textChanged.connect(self.filterCardList)
+        self.scalable_components.append({"widget": self.searchBox, "base_font_size": 9})
+        
         self.cardListWidget = QListWidget()
         self.cardListWidget.setMinimumWidth(250)
         self.cardListWidget.currentItemChanged.connect(self.onCardSelected)
         self.scalable_components.append({"widget": self.cardListWidget, "base_font_size": 9})
         
         # Enable drag and drop reordering
+        self.cardListWidget.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.cardListWidget.setDragEnabled(True)
         self.cardListWidget.setAcceptDrops(True)
         self.cardListWidget.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
@@ -517,6 +542,7 @@ class MainWindow(QMainWindow):
         self.scalable_components.append({"widget": openInBrowserButton, "base_font_size": 9})
         
         leftLayout.addWidget(cardListLabel)
+        leftLayout.addWidget(self.searchBox)
         leftLayout.addWidget(self.cardListWidget)
         leftLayout.addLayout(buttonLayout)
         leftLayout.addWidget(openInBrowserButton)
@@ -569,7 +595,7 @@ class MainWindow(QMainWindow):
     
     def addCard(self):
         """Add a new card to the page."""
-        dialog = CardEditorDialog(parent=self)
+        dialog = CardEditorDialog(parent=self, url_index=self.url_index)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             card = dialog.card
@@ -578,6 +604,7 @@ class MainWindow(QMainWindow):
             item = QListWidgetItem(card.title)
             item.setData(Qt.ItemDataRole.UserRole, card)
             self.cardListWidget.addItem(item)
+            self.filterCardList()
             
             self.statusBar().showMessage(f"Added new card: {card.title}")
     
@@ -589,48 +616,71 @@ class MainWindow(QMainWindow):
             return
         
         card = current_item.data(Qt.ItemDataRole.UserRole)
-        dialog = CardEditorDialog(card, parent=self)
-        
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            # Update item text
-            current_item.setText(card.title)
-            # Update preview
+        journal_position = len(self.model.journal)
+        dialog = CardEditorDialog(card, parent=self, url_index=self.url_index)
+        dialog.exec()
+        
+        # The editor changes the card in place, even if it is then cancelled,
+        # so refresh whenever the journal shows the card was touched
+        changes = self.model.journal[journal_position:]
+        if any(change.card is card for change in changes):
+            if any(change.op == 'set' and change.target is card and change.detail[0] == 'title'
+                   for change in changes):
+                current_item.setText(card.title)
             self.previewWidget.setCard(card)
+            self.filterCardList()
             
             self.statusBar().showMessage(f"Updated card: {card.title}")
     
     def removeCard(self):
-        """Remove the selected card."""
-        current_item = self.cardListWidget.currentItem()
-        if not current_item:
+        """Remove the selected cards."""
+        items = sorted(self.cardListWidget.selectedItems(), key=self.cardListWidget.row)
+        if not items:
             QMessageBox.warning(self, "Warning", "Please select a card to remove.")
             return
         
-        card = current_item.data(Qt.ItemDataRole.UserRole)
+        cards = [item.data(Qt.ItemDataRole.UserRole) for item in items]
+        if len(cards) == 1:
+            question = f"Are you sure you want to remove the card '{cards[0].title}'?"
+        else:
+            question = f"Are you sure you want to remove {len(cards)} cards?"
         
         # Ask for confirmation
         confirm = QMessageBox.question(
-            self, "Confirm Removal", 
-            f"Are you sure you want to remove the card '{card.title}'?",
+            self, "Confirm Removal", question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if confirm == QMessageBox.StandardButton.Yes:
-            self.model.remove_card(card)
-            self.cardListWidget.takeItem(self.cardListWidget.row(current_item))
+            self.model.remove_cards(cards)
+            for item in reversed(items):
+                self.cardListWidget.takeItem(self.cardListWidget.row(item))
             self.previewWidget.setCard(None)
             
-            self.statusBar().showMessage(f"Removed card: {card.title}")
+            if len(cards) == 1:
+                self.statusBar().showMessage(f"Removed card: {cards[0].title}")
+            else:
+                self.statusBar().showMessage(f"Removed {len(cards)} cards")
     
     def open_file(self, file_path):
-        """Open the specified file."""
+        """Open the specified page or model file."""
         try:
-            self.model = HtmlParser.load_from_file(file_path)
+            profile = ParseProfile() if self.settings_manager.get_setting("profile_loading", False) else None
+            # Cards are read as they are selected, edited or saved
+            model, file_path = load_page(file_path, lazy=True, profile=profile)
+            self.search_index.close()
+            self.url_index.close()
+            self.model = model
+            self.search_index = SearchIndex(model)
+            self.url_index = UrlIndex(model)
             self.current_file = file_path
             self.settings_manager.set_last_file(file_path)
             self.updateCardList()
             
-            self.statusBar().showMessage(f"Opened file: {file_path}")
+            if profile is not None:
+                self.statusBar().showMessage(f"Opened file: {file_path} in {profile.summary()}")
+            else:
+                self.statusBar().showMessage(f"Opened file: {file_path}")
             return True
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to open file: {str(e)}")
@@ -639,7 +689,8 @@ class MainWindow(QMainWindow):
     def openFile(self):
         """Open an HTML file."""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open HTML File", "", "HTML Files (*.html);;All Files (*)"
+            self, "Open HTML File", "",
+            "HTML Files (*.html);;Page Models (*.model.jsonl);;All Files (*)"
         )
         
         if file_path:
@@ -652,7 +703,7 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            HtmlParser.save_to_file(self.model, self.current_file)
+            save_page(self.model, self.current_file)
             self.settings_manager.set_last_file(self.current_file)
             self.statusBar().showMessage(f"Saved file: {self.current_file}")
         except Exception as e:
@@ -666,7 +717,7 @@ class MainWindow(QMainWindow):
         
         if file_path:
             try:
-                HtmlParser.save_to_file(self.model, file_path)
+                save_page(self.model, file_path)
                 self.current_file = file_path
                 self.settings_manager.set_last_file(file_path)
                 self.statusBar().showMessage(f"Saved file as: {file_path}")
@@ -680,6 +731,20 @@ class MainWindow(QMainWindow):
             item = QListWidgetItem(card.title)
             item.setData(Qt.ItemDataRole.UserRole, card)
             self.cardListWidget.addItem(item)
+        self.filterCardList()
+    
+    def filterCardList(self, text=None):
+        """Show only the cards whose title or links match the search box."""
+        query = (self.searchBox.text() if text is None else text).strip()
+        matches = self.search_index.matching_cards(query, fuzzy=True) if query else None
+        
+        for i in range(self.cardListWidget.count()):
+            item = self.cardListWidget.item(i)
+            card = item.data(Qt.ItemDataRole.UserRole)
+            item.setHidden(matches is not None and card.uid not in matches)
+        
+        if matches is not None:
+            self.statusBar().showMessage(f"{len(matches)} cards match '{query}'")
     
     def changeTheme(self):
         """Open theme selection dialog."""
@@ -765,6 +830,33 @@ class MainWindow(QMainWindow):
             about_html
         )
     
+    def showDuplicateLinks(self):
+        """Show every URL that appears more than once on the page."""
+        clusters = self.url_index.clusters()
+        if not clusters:
+            QMessageBox.information(self, "Duplicate Links", "No duplicate links found.")
+            return
+        
+        lines = []
+        for url, occurrences in clusters.items():
+            lines.append(url)
+            for card, link in occurrences:
+                lines.append(f"    [{card.title}] {link.name} -> {link.url}")
+            lines.append("")
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Duplicate Links ({len(clusters)} URLs)")
+        dialog.setMinimumSize(600, 400)
+        layout = QVBoxLayout(dialog)
+        report = QTextEdit()
+        report.setReadOnly(True)
+        report.setPlainText("\n".join(lines))
+        layout.addWidget(report)
+        closeButton = QPushButton("Close")
+        closeButton.clicked.connect(dialog.accept)
+        layout.addWidget(closeButton)
+        dialog.exec()
+    
     def viewSummary(self):
         """Open the SUMMARY.md file with the system's default application."""
         try:
@@ -1153,7 +1245,7 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Handle window close event."""
         # Check if there are unsaved changes
-        if self.model.cards:
+        if self.model.dirty:
             reply = QMessageBox.question(
                 self, "Confirm Exit", 
                 "Are you sure you want to exit? Any unsaved changes will be lost.",
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Batch Parse - Parse many startup pages on a process pool and report timings.
+
+Each file is parsed into a StartupPageModel by a worker process; the models
+come back as plain data and are rebuilt here. At most --max-pending files are
+in flight at once, which bounds memory however many files are given. The
+time spent parsing and rebuilding each file is printed, followed by totals.
+
+Usage:
+    python3 tools/batch_parse.py pages/*.html
+    python3 tools/batch_parse.py --workers 8 --max-pending 16 pages/*.html
+    python3 tools/batch_parse.py --json timings.json pages/*.html
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+# Add parent directory to path for importing project modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.batch_parser import BatchResult, parse_files
+
+
+def summarize(result: BatchResult) -> Dict:
+    """Return the JSON-serializable report of one file."""
+    report = {
+        "file": result.path,
+        "parse_ms": round(result.parse_seconds * 1000, 3),
+        "load_ms": round(result.load_seconds * 1000, 3),
+    }
+    if result.error is not None:
+        report["error"] = result.error
+    else:
+        report["cards"] = len(result.model.cards)
+        report["links"] = sum(len(card.links) + sum(len(links) for links in card.subsections.values())
+                              for card in result.model.cards)
+    return report
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Parse many startup pages on a process pool and report timings"
+    )
+    parser.add_argument("files", nargs="+", help="HTML files to parse")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count; 1 parses in this process)")
+    parser.add_argument("--max-pending", type=int,
+                        help="Files submitted at once (default: twice the workers)")
+    parser.add_argument("--bs4", action="store_true",
+                        help="Parse with BeautifulSoup instead of the streaming parser")
+    parser.add_argument("--json", help="Also write the per-file report to this file")
+    args = parser.parse_args()
+
+    missing = [file_path for file_path in args.files if not os.path.exists(file_path)]
+    if missing:
+        print(f"Error: File '{missing[0]}' not found.")
+        return 2
+
+    reports: List[Dict] = []
+    start = time.perf_counter()
+    for result in parse_files(args.files, workers=args.workers, streaming=not args.bs4,
+                              max_pending=args.max_pending):
+        report = summarize(result)
+        reports.append(report)
+        if result.error is not None:
+            print(f"{result.path}: error: {result.error}")
+        else:
+            print(f"{result.path}: {report['cards']} cards, {report['links']} links, "
+                  f"parse {report['parse_ms']:.1f} ms, load {report['load_ms']:.1f} ms")
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for report in reports if "error" in report)
+    parse_total = sum(report["parse_ms"] for report in reports)
+    print(f"\n{len(reports)} files in {elapsed * 1000:.1f} ms wall time "
+          f"({parse_total:.1f} ms parsing across {max(args.workers, 1)} workers), {failed} failed")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"wall_ms": round(elapsed * 1000, 3), "files": reports}, f, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Time parse, generate and save round-trips on synthetic and real pages.
+
+Synthetic pages are generated with 10, 100, 1k and 10k cards of ten links each
+(the largest has 100k links); Startup.html and index.html are measured
+as they are. For every page and operation the median wall time of several runs
+and the peak traced memory of one run are recorded. Saves go through
+model_store.save_page, as in the editor, which writes the HTML page and its
+model file.
+
+Results are compared with a stored baseline (tools/benchmark_baseline.json by
+default). The script exits with status 1 if any operation got slower or used
+more memory than the baseline by more than the threshold, or if an operation
+has no baseline to compare with.
+
+Usage:
+    python3 tools/benchmark.py
+    python3 tools/benchmark.py --sizes 10 100 --repeat 5
+    python3 tools/benchmark.py --save-baseline
+    python3 tools/benchmark.py --threshold 0.5 --json results.json
+    python3 tools/benchmark.py --throughput
+    python3 tools/benchmark.py --css
+    python3 tools/benchmark.py --round-trip
+    python3 tools/benchmark.py --link-check --latency 0.05
+"""
+
+import argparse
+import contextlib
+import html
+import importlib.util
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path for importing project modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.models.card_model import Card, Link, StartupPageModel
+from src.utils.html_parser import DEFAULT_CSS, MASONRY_CSS, HtmlParser
+from src.utils.html_renderer import render_card
+from src.utils.model_store import load_model, load_page, save_model, save_page
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Synthetic page sizes: name -> (cards, links per card)
+SYNTHETIC_SIZES = {
+    "10": (10, 10),
+    "100": (100, 10),
+    "1k": (1000, 10),
+    "10k": (10000, 10),
+}
+
+REAL_PAGES = {
+    "Startup.html": os.path.join(parent_dir, "Startup.html"),
+    "index.html": os.path.join(parent_dir, "index.html"),
+}
+
+# Differences below this many seconds are treated as noise; a busy machine
+# can stretch even the median of a few millisecond runs by this much
+MIN_SECONDS_DELTA = 0.015
+
+# Differences below this many KiB of peak memory are treated as noise
+MIN_KIB_DELTA = 256
+
+_WORDS = ("news", "mail", "search", "video", "music", "maps", "docs", "code", "shop",
+          "games", "sports", "weather", "travel", "bank", "photos", "cloud", "tools")
+_COLORS = ("", "", "", "#2c3e50", "#e74c3c", "#27ae60")
+_SIZES = ("", "", "", "12px", "14px", "16px")
+
+
+def make_model(cards: int, links_per_card: int, seed: int = 0) -> StartupPageModel:
+    """Build a deterministic synthetic model.
+
+    Some links carry font styles, some cards a background color, and every
+    fifth card has an "Additional Links" subsection.
+    """
+    rng = random.Random(seed)
+    model = StartupPageModel()
+    for i in range(cards):
+        card = Card(title=f"{rng.choice(_WORDS).title()} {i}",
+                    background_color=rng.choice(_COLORS))
+        for j in range(links_per_card):
+            word = rng.choice(_WORDS)
+            link = Link(name=f"{word.title()} {i}.{j}",
+                        url=f"https://{word}{rng.randrange(1000)}.example.com/{i}/{j}",
+                        font_size=rng.choice(_SIZES), font_color=rng.choice(_COLORS))
+            if i % 5 == 4 and j >= links_per_card - 2:
+                card.add_subsection_link("Additional Links", link)
+            else:
+                card.add_link(link)
+        model.add_card(card)
+    model.mark_clean()
+    return model
+
+
+def measure(func: Callable, setup: Optional[Callable] = None, repeat: int = 3) -> Dict[str, float]:
+    """Return the median time of repeat runs and the peak memory of one more run.
+
+    setup() runs before every call, untimed; its result is passed to func.
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": round(statistics.median(times), 6), "peak_kib": round(peak / 1024, 1)}
+
+
+def benchmark_page(html_path: str, workdir: str, repeat: int,
+                   soup_repeat: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """Run every operation against one page and return the measurements.
+
+    soup_repeat overrides repeat for the BeautifulSoup parse, the slowest one.
+    """
+    with open(html_path, "r", encoding="utf-8") as f:
+        html_content = f.read()
+
+    results = {}
+    results["parse_html"] = measure(lambda _: HtmlParser.parse_html(html_content),
+                                    repeat=soup_repeat or repeat)
+    results["parse_streaming"] = measure(lambda _: HtmlParser.parse_html_streaming(html_content),
+                                         repeat=repeat)
+
+    model = HtmlParser.parse_html_streaming(html_content)
+    results["generate_html"] = measure(lambda _: HtmlParser.generate_html(model), repeat=repeat)
+
+    target = os.path.join(workdir, "page.html")
+    shutil.copyfile(html_path, target)
+    results["load_from_file"] = measure(lambda _: HtmlParser.load_from_file(target), repeat=repeat)
+    results["load_lazy"] = measure(lambda _: HtmlParser.load_from_file(target, lazy=True),
+                                   repeat=repeat)
+
+    model_path = os.path.join(workdir, "page.model.jsonl")
+
+    def unsaved_model():
+        model.model_layout = None  # force every card to be serialized
+        return model
+
+    results["save_model"] = measure(lambda model: save_model(model, model_path),
+                                    setup=unsaved_model, repeat=repeat)
+    results["load_model"] = measure(lambda _: load_model(model_path), repeat=repeat)
+
+    def fresh_model():
+        model = HtmlParser.load_from_file(target)
+        model.layout = None  # force a full render
+        return model
+
+    results["save_page_full"] = measure(lambda model: save_page(model, target),
+                                        setup=fresh_model, repeat=repeat)
+    # save_page left a model file matching the page, as the editor opens it
+    results["load_page_lazy"] = measure(lambda _: load_page(target, lazy=True), repeat=repeat)
+
+    def edited_model():
+        model, _ = load_page(target, lazy=True)
+        if model.cards:
+            model.cards[len(model.cards) // 2].title += " (edited)"
+        return model
+
+    results["save_page_incremental"] = measure(lambda model: save_page(model, target),
+                                               setup=edited_model, repeat=repeat)
+    return results
+
+
+def run_benchmarks(sizes: List[str], repeat: int, include_real: bool = True,
+                   verbose: bool = True) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Benchmark the selected synthetic sizes and the real pages."""
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="startup-benchmark-")
+    try:
+        pages: List[Tuple[str, str, Optional[int]]] = []
+        for size in sizes:
+            cards, links_per_card = SYNTHETIC_SIZES[size]
+            path = os.path.join(workdir, f"synthetic-{size}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(HtmlParser.generate_html(make_model(cards, links_per_card)))
+            # BeautifulSoup on the 100k-link page takes minutes: run it once only
+            pages.append((f"synthetic-{size}", path, 1 if cards >= 10000 else None))
+        if include_real:
+            for name, path in REAL_PAGES.items():
+                if os.path.exists(path):
+                    pages.append((name, path, None))
+
+        for name, path, soup_repeat in pages:
+            if verbose:
+                print(f"Benchmarking {name}...", flush=True)
+            results[name] = benchmark_page(path, workdir, repeat, soup_repeat)
+            if verbose:
+                for op, values in results[name].items():
+                    print(f"  {op:22} {values['seconds'] * 1000:10.2f} ms {values['peak_kib']:12.1f} KiB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def legacy_render_card(card: Card) -> str:
+    """The card renderer generate_html used before src/utils/html_renderer.py,
+    kept as the reference for --throughput (with titled subsection grids)."""
+    def link_html(link):
+        style_attr = ""
+        if link.font_size or link.font_color:
+            style = ""
+            if link.font_size:
+                style += f"font-size: {link.font_size}; "
+            if link.font_color:
+                style += f"color: {link.font_color}; "
+            style_attr = f' style="{style.strip()}"'
+        return f"""                <div class="link-item">
+                    <a href="{link.url}"{style_attr}>{link.name}</a>
+                </div>
+"""
+
+    card_style = ""
+    if card.background_color:
+        card_style = f" style=\"background-color: {card.background_color};\""
+    parts = [f"""        <!-- {card.title} Section -->
+        <section class="card"{card_style}>
+            <h2 class="card-title">{card.title}</h2>
+            <div class="link-grid">
+"""]
+    parts.extend(link_html(link) for link in card.links)
+    parts.append("            </div>\n")
+    for title, links in card.subsections.items():
+        if links:
+            parts.append(f"""            <div class="link-grid" style="margin-top: 1rem;" data-subsection="{html.escape(title)}">\n""")
+            parts.extend(link_html(link) for link in links)
+            parts.append("            </div>\n")
+    parts.append("        </section>\n\n")
+    return ''.join(parts)
+
+
+def render_throughput(cards: int = 10000, links_per_card: int = 10, repeat: int = 5) -> None:
+    """Print links rendered per second by the legacy and the current card renderer."""
+    model = make_model(cards, links_per_card)
+    links = sum(len(card.links) + sum(len(links) for links in card.subsections.values())
+                for card in model.cards)
+    print(f"Rendering {cards} cards with {links} links:")
+    outputs = []
+    for name, renderer in (("legacy f-strings", legacy_render_card), ("html_renderer", render_card)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            html = "".join([renderer(card) for card in model.cards])
+            best = min(best, time.perf_counter() - start)
+        outputs.append(html)
+        print(f"  {name:18} {best * 1000:10.2f} ms {links / best:14,.0f} links/s")
+    if outputs[0] != outputs[1]:
+        print("  Warning: the renderers produced different output")
+
+
+def legacy_prepare_css(css: str) -> str:
+    """The regex-based masonry CSS cleanup generate_html used before CssStylesheet."""
+    css = re.sub(r'\.main-grid\s*\{[^}]*\}', '', css)
+    css = re.sub(r'\.card\s*\{[^}]*\}', '', css)
+    css = re.sub(r'@media[^{]*\{[^{]*\.main-grid\s*\{[^}]*\}[^}]*\}', '', css)
+    return css + MASONRY_CSS
+
+
+# Style blocks that make the legacy cleanup backtrack: name -> CSS for n copies
+PATHOLOGICAL_CSS = {
+    "bloated by saves": lambda n: DEFAULT_CSS + MASONRY_CSS * n,
+    "@media without block": lambda n: "@media screen and (max-width: 768px) " * n,
+    "unclosed .main-grid": lambda n: ".main-grid { column-count: 3; " * n,
+    "unclosed nested @media": lambda n: "@media (max-width: 600px) { .x { color: red; } " * n,
+}
+
+
+def css_cleanup(counts: Tuple[int, ...] = (1000, 4000, 16000), repeat: int = 3) -> None:
+    """Print legacy regex and CssStylesheet cleanup times on pathological style blocks."""
+    print("Preparing pathological stylesheets (legacy regex vs CssStylesheet):")
+    for name, make_css in PATHOLOGICAL_CSS.items():
+        for count in counts:
+            css = make_css(count)
+            times = []
+            for prepare in (legacy_prepare_css, lambda text: HtmlParser.prepare_css(make_styled_model(text))):
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    prepare(css)
+                    best = min(best, time.perf_counter() - start)
+                times.append(best)
+            print(f"  {name:24} {len(css) / 1024:8.0f} KiB  legacy {times[0] * 1000:9.2f} ms  "
+                  f"current {times[1] * 1000:9.2f} ms")
+
+
+def make_styled_model(css: str) -> StartupPageModel:
+    """Return an empty model with the given stylesheet."""
+    model = StartupPageModel()
+    model.css_styles = css
+    return model
+
+
+def make_subsection_model(cards: int, subsections: int, links_per_grid: int = 3) -> StartupPageModel:
+    """Build a model whose cards have several titled subsections and no styles."""
+    model = StartupPageModel()
+    for i in range(cards):
+        card = Card(title=f"Card {i}")
+        for j in range(links_per_grid):
+            card.add_link(Link(name=f"Main {i}.{j}", url=f"https://main.example.com/{i}/{j}"))
+        for k in range(subsections):
+            card.set_subsection_links(f'Group "{k}" & more', [
+                Link(name=f"Sub {i}.{k}.{j}", url=f"https://sub.example.com/{i}/{k}/{j}")
+                for j in range(links_per_grid)])
+        model.add_card(card)
+    model.mark_clean()
+    return model
+
+
+def round_trip(card_counts: Tuple[int, ...] = (100, 1000, 4000), subsections: int = 4,
+               repeat: int = 3) -> bool:
+    """Print generate -> parse times on subsection-heavy pages; return True if lossless."""
+    print(f"Round-tripping pages with {subsections} subsections per card:")
+    lossless = True
+    for cards in card_counts:
+        model = make_subsection_model(cards, subsections)
+        expected = [card.to_dict() for card in model.cards]
+        links = cards * 3 * (subsections + 1)
+        for name, parse in (("streaming", HtmlParser.parse_html_streaming),
+                            ("BeautifulSoup", HtmlParser.parse_html)):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                parsed = parse(HtmlParser.generate_html(model))
+                best = min(best, time.perf_counter() - start)
+            same = [card.to_dict() for card in parsed.cards] == expected
+            lossless = lossless and same
+            print(f"  {cards:6} cards {name:14} {best * 1000:9.2f} ms "
+                  f"{best / links * 1e6:7.2f} us/link  {'lossless' if same else 'DIFFERS'}")
+    return lossless
+
+
+def link_check_engines(links: int = 1000, hosts: int = 10, latency: float = 0.05,
+                       workers: int = 10, concurrency: int = 200, per_host: int = 8) -> None:
+    """Print the time each link checker engine takes for links spread over local stub hosts.
+
+    Needs requests and aiohttp, which the other benchmarks do not; the
+    benchmark is skipped when aiohttp is missing.
+    """
+    if importlib.util.find_spec("aiohttp") is None:
+        print("Skipping the link checker benchmark: aiohttp is not installed")
+        return
+    from linkchecker import LinkChecker
+    from stub_server import StubServer
+
+    print(f"Checking {links} links on {hosts} stub hosts with {latency * 1000:.0f} ms latency:")
+    with contextlib.ExitStack() as stack:
+        servers = [stack.enter_context(StubServer(latency)) for _ in range(hosts)]
+        urls = [servers[i % hosts].url(f"/page/{i}" if i % 20 else f"/status/404?{i}")
+                for i in range(links)]
+        engines = [("threads", f"{workers} workers", {"max_workers": workers}),
+                   ("async", f"{concurrency} in flight, {per_host} per host",
+                    {"concurrency": concurrency, "per_host": per_host})]
+        for engine, settings, options in engines:
+            requests_before = sum(server.requests for server in servers)
+            connections_before = sum(server.connections for server in servers)
+            with LinkChecker(timeout=30, engine=engine, **options) as checker:
+                start = time.perf_counter()
+                broken = sum(not is_valid for _, is_valid, _, _ in checker.check_urls(urls))
+                elapsed = time.perf_counter() - start
+            print(f"  {engine:8} {settings:28} {elapsed:8.2f} s  {links / elapsed:8.1f} links/s  "
+                  f"{broken} broken  "
+                  f"{sum(server.requests for server in servers) - requests_before} requests on "
+                  f"{sum(server.connections for server in servers) - connections_before} connections")
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every measurement that regressed past threshold.
+
+    An operation missing from the baseline is reported too, so a stale
+    baseline cannot hide a regression by leaving it unchecked.
+    """
+    regressions = []
+    for page, operations in results.items():
+        for op, values in operations.items():
+            old = baseline.get(page, {}).get(op)
+            if not old:
+                regressions.append(f"{page} {op}: not in the baseline")
+                continue
+            seconds, old_seconds = values["seconds"], old["seconds"]
+            if seconds > old_seconds * (1 + threshold) and seconds - old_seconds > MIN_SECONDS_DELTA:
+                regressions.append(f"{page} {op}: {old_seconds * 1000:.2f} ms -> {seconds * 1000:.2f} ms")
+            peak, old_peak = values["peak_kib"], old["peak_kib"]
+            if peak > old_peak * (1 + threshold) and peak - old_peak > MIN_KIB_DELTA:
+                regressions.append(f"{page} {op}: {old_peak:.1f} KiB -> {peak:.1f} KiB peak")
+    return regressions
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark parse/generate/save round-trips")
+    parser.add_argument("--sizes", nargs="*", choices=list(SYNTHETIC_SIZES),
+                        default=list(SYNTHETIC_SIZES), help="Synthetic page sizes to run")
+    parser.add_argument("--no-real", action="store_true",
+                        help="Skip Startup.html and index.html")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Timed runs per operation; the median is kept (default: 5)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write the results to the baseline file instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Allowed slowdown or memory growth as a fraction (default: 0.5)")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--throughput", action="store_true",
+                        help="Only compare card render throughput on a 100k-link model")
+    parser.add_argument("--css", action="store_true",
+                        help="Only compare CSS cleanup on pathological style blocks")
+    parser.add_argument("--round-trip", action="store_true",
+                        help="Only check generate -> parse on pages with many subsections")
+    parser.add_argument("--link-check", action="store_true",
+                        help="Only compare the link checker's thread-pool and async engines on stub servers")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Stub server response latency in seconds for --link-check (default: 0.05)")
+    args = parser.parse_args()
+
+    if args.link_check:
+        link_check_engines(latency=args.latency)
+        return 0
+
+    if args.throughput:
+        render_throughput(repeat=args.repeat)
+        return 0
+
+    if args.css:
+        css_cleanup(repeat=args.repeat)
+        return 0
+
+    if args.round_trip:
+        return 0 if round_trip(repeat=args.repeat) else 1
+
+    results = run_benchmarks(args.sizes, args.repeat, include_real=not args.no_real)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        baseline_results = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline_results = json.load(f).get("results", {})
+        baseline_results.update(results)
+        report["results"] = baseline_results
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressions over {args.threshold:.0%} or missing baselines:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compact CSS - Repair startup pages whose <style> block has grown with every save.
+
+Older versions of the editor appended the masonry layout CSS on each save, leaving
+hundreds of duplicated rule blocks, empty @media blocks and blank lines behind.
+This script collapses the first <style> block of each file into one copy of every
+rule. Everything outside the <style> block is left byte-for-byte unchanged.
+
+Usage:
+    python3 tools/compact_css.py Startup.html
+    python3 tools/compact_css.py --check Startup.html index.html
+"""
+
+import argparse
+import os
+import re
+import sys
+
+# Add parent directory to path for importing project modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.css_model import compact_css
+from src.utils.html_writer import atomic_write
+
+STYLE_RE = re.compile(r'(<style[^>]*>)(.*?)(</style>)', re.DOTALL | re.IGNORECASE)
+
+
+def compact_html(html_content):
+    """Return html_content with its first <style> block compacted."""
+    match = STYLE_RE.search(html_content)
+    if not match:
+        return html_content
+
+    css = compact_css(match.group(2))
+    return (html_content[:match.start(2)] + "\n" + css + "\n    " +
+            html_content[match.end(2):])
+
+
+def compact_file(file_path, check=False):
+    """Compact a file in place. Returns True if the file needed compacting."""
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        original = f.read()
+
+    compacted = compact_html(original)
+    if compacted == original:
+        print(f"{file_path}: already compact ({len(original.encode('utf-8'))} bytes)")
+        return False
+
+    before = len(original.encode('utf-8'))
+    after = len(compacted.encode('utf-8'))
+    if check:
+        print(f"{file_path}: needs compacting ({before} -> {after} bytes)")
+        return True
+
+    atomic_write(file_path, [compacted.encode('utf-8')])
+
+    print(f"{file_path}: compacted {before} -> {after} bytes")
+    return True
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Collapse duplicated CSS in the <style> block of startup pages"
+    )
+    parser.add_argument("files", nargs="+", help="HTML files to compact")
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Only report files that need compacting; exit 1 if any do"
+    )
+    args = parser.parse_args()
+
+    changed = False
+    for file_path in args.files:
+        if not os.path.exists(file_path):
+            print(f"Error: File '{file_path}' not found.")
+            return 2
+        changed = compact_file(file_path, check=args.check) or changed
+
+    return 1 if args.check and changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
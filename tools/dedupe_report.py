@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Dedupe Report - List links that appear more than once on startup pages.
+
+URLs are compared after normalization: scheme and host case, default ports,
+trailing slashes and tracking parameters such as utm_* are ignored. Every
+duplicate cluster is printed with the card and name of each occurrence.
+
+Usage:
+    python3 tools/dedupe_report.py Startup.html
+    python3 tools/dedupe_report.py --json Startup.html index.html
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add parent directory to path for importing project modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.html_parser import HtmlParser
+from src.utils.url_index import duplicate_clusters
+
+
+def report_file(file_path):
+    """Return the duplicate clusters of a file as JSON-serializable data."""
+    model = HtmlParser.load_from_file(file_path)
+    return [
+        {
+            "url": url,
+            "links": [
+                {"card": card.title, "name": link.name, "url": link.url}
+                for card, link in occurrences
+            ],
+        }
+        for url, occurrences in duplicate_clusters(model).items()
+    ]
+
+
+def print_report(file_path, clusters):
+    """Print the duplicate clusters of one file."""
+    if not clusters:
+        print(f"{file_path}: no duplicate links")
+        return
+
+    extra = sum(len(cluster["links"]) - 1 for cluster in clusters)
+    print(f"{file_path}: {len(clusters)} duplicated URLs, {extra} redundant links")
+    for cluster in clusters:
+        print(f"\n  {cluster['url']}")
+        for link in cluster["links"]:
+            print(f"    [{link['card']}] {link['name']} -> {link['url']}")
+    print()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Report duplicate and near-duplicate links on startup pages"
+    )
+    parser.add_argument("files", nargs="+", help="HTML files to check")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    reports = {}
+    for file_path in args.files:
+        if not os.path.exists(file_path):
+            print(f"Error: File '{file_path}' not found.")
+            return 2
+        try:
+            reports[file_path] = report_file(file_path)
+        except Exception as e:
+            print(f"Error parsing {file_path}: {e}")
+            return 2
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for file_path, clusters in reports.items():
+            print_report(file_path, clusters)
+
+    return 1 if any(reports.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
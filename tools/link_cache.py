@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Link Cache - Results of earlier link checks, kept in SQLite between runs.
+
+tools/linkchecker.py skips URLs whose result is younger than the cache TTL
+and revalidates older ones with conditional requests (If-None-Match /
+If-Modified-Since), so unchanged pages answer 304 without a body. Only URLs
+that answered with an HTTP status are cached; timeouts and connection errors
+are checked again on the next run.
+
+Usage:
+    python3 tools/link_cache.py            # show what the cache holds
+    python3 tools/link_cache.py --clear
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+def default_cache_file() -> Path:
+    """Return the cache database path under $XDG_CACHE_HOME, or ~/.cache without it."""
+    cache_home = os.environ.get("XDG_CACHE_HOME", "")
+    # The XDG spec says a relative path is invalid and must be ignored
+    base = Path(cache_home) if os.path.isabs(cache_home) else Path.home() / ".cache"
+    return base / "startup-dashboard-editor" / "link-cache.sqlite3"
+
+
+# Results younger than this are used without a request
+DEFAULT_TTL_HOURS = 24.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    url TEXT PRIMARY KEY,
+    is_valid INTEGER NOT NULL,
+    status_code INTEGER NOT NULL,
+    error_message TEXT NOT NULL,
+    final_url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL
+)
+"""
+
+
+class CachedLink(NamedTuple):
+    """A stored link check result and the validators to revalidate it with."""
+    url: str
+    is_valid: bool
+    status_code: int
+    error_message: str
+    final_url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    checked_at: float
+
+
+class LinkCache:
+    """SQLite-backed store of link check results with a time to live.
+
+    hits, revalidated and misses count lookups of fresh entries, stale
+    entries the server confirmed unchanged, and URLs that had to be checked
+    in full, including checks that failed with no answer. URLs that are not
+    checked at all (non-HTTP schemes) count as neither. Writes are
+    committed by flush() and close().
+    """
+
+    def __init__(self, path=None, ttl_hours: float = DEFAULT_TTL_HOURS):
+        self.path = Path(path) if path else default_cache_file()
+        self.ttl = ttl_hours * 3600
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.execute(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, url: str) -> Optional[CachedLink]:
+        """Return the stored entry for url, or None."""
+        row = self._db.execute("SELECT * FROM links WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        entry = CachedLink(*row)
+        return entry._replace(is_valid=bool(entry.is_valid))
+
+    def is_fresh(self, entry: CachedLink, now: Optional[float] = None) -> bool:
+        """Return True if entry is younger than the TTL."""
+        return (now if now is not None else time.time()) - entry.checked_at < self.ttl
+
+    def store(self, entry: CachedLink):
+        """Insert or replace the entry for entry.url."""
+        self._db.execute("INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?, ?, ?, ?, ?)", entry)
+
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups answered without a request."""
+        lookups = self.hits + self.revalidated + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+    def clear(self):
+        """Remove every entry."""
+        self._db.execute("DELETE FROM links")
+        self.flush()
+
+    def flush(self):
+        """Commit pending writes."""
+        self._db.commit()
+
+    def close(self):
+        """Commit pending writes and close the database."""
+        self.flush()
+        self._db.close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Show or clear the link checker's result cache")
+    parser.add_argument("--cache-file", default=str(default_cache_file()), help="Cache database")
+    parser.add_argument("--clear", action="store_true", help="Remove every cached result")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.cache_file):
+        print(f"No cache at {args.cache_file}")
+        return 0
+
+    try:
+        with LinkCache(args.cache_file) as cache:
+            if args.clear:
+                cache.clear()
+                print(f"Cleared {args.cache_file}")
+            else:
+                print(f"{args.cache_file}: {len(cache)} cached results")
+    except sqlite3.Error as e:
+        print(f"Error reading {args.cache_file}: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,24 +11,104 @@ Usage:
     python linkchecker.py --verbose file.html
     python linkchecker.py --timeout 10 file.html
     python linkchecker.py --workers 8 file.html
+    python linkchecker.py --engine async --concurrency 200 --per-host 8 file.html
+    python linkchecker.py --cache-ttl 12 file.html
+    python linkchecker.py --no-cache file.html
 """
 
 import argparse
+import asyncio
 import concurrent.futures
 import os
+import queue
+import sqlite3
 import sys
+import threading
 import time
-from typing import Dict, List, Set, Tuple, Optional
-from urllib.parse import urlparse, urljoin
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple, Optional
+from urllib.parse import urldefrag, urlparse, urljoin
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+
+# Add parent directory to path for importing project modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from link_cache import DEFAULT_TTL_HOURS, CachedLink, LinkCache
+from src.utils.url_index import normalize_url
+
+try:
+    import aiohttp
+except ImportError:  # Only needed for --engine async
+    aiohttp = None
+
+# "threads" checks links with requests on a thread pool of max_workers;
+# "async" keeps up to concurrency requests in flight on one aiohttp session
+ENGINES = ("threads", "async")
+
+CheckResult = Tuple[str, bool, int, str]
+
+
+class LinkOccurrence(NamedTuple):
+    """One anchor in a checked file: where it is and what it says."""
+    file_path: str
+    url: str
+    text: str
+    line: int
+    card: str  # Title of the enclosing card section, or ""
+
+
+class _Fetch(NamedTuple):
+    """What checking one URL returned: its result and cache validators."""
+    result: CheckResult
+    final_url: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+# Idle keep-alive connections the thread engine keeps open across all workers;
+# each worker's session caches connections to this many / max_workers hosts
+KEEP_ALIVE_CONNECTIONS = 1000
+
+
+class _RecordingPoolManager(PoolManager):
+    """PoolManager that keeps every connection pool it creates.
+
+    urllib3 pools count the connections they open and the requests they
+    send; keeping them lets those counts be read after a pool is evicted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_pools = []
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        self.created_pools.append(pool)
+        return pool
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose pool manager records its connection pools."""
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _RecordingPoolManager(num_pools=connections, maxsize=maxsize,
+                                                 block=block, **pool_kwargs)
 
 
 class LinkChecker:
     """Class to check for broken links in HTML files."""
 
-    def __init__(self, timeout: int = 5, verbose: bool = False, max_workers: int = 10):
+    def __init__(self, timeout: int = 5, verbose: bool = False, max_workers: int = 10,
+                 engine: str = "threads", concurrency: int = 100, per_host: int = 8,
+                 cache: Optional[LinkCache] = None):
         """
         Initialize the LinkChecker.
 
@@ -36,15 +116,40 @@ class LinkChecker:
             timeout: Timeout for HTTP requests in seconds
             verbose: Whether to print verbose output
             max_workers: Maximum number of concurrent workers for link checking
+            engine: "threads" or "async" (see ENGINES)
+            concurrency: Maximum requests in flight with the async engine
+            per_host: Maximum requests in flight to one host with the async engine
+            cache: Results of earlier runs to reuse and revalidate, if any
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(ENGINES)}")
+        if engine == "async" and aiohttp is None:
+            raise RuntimeError("The async engine needs aiohttp (pip install aiohttp)")
         self.timeout = timeout
         self.verbose = verbose
         self.max_workers = max_workers
+        self.engine = engine
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.cache = cache
         self.user_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         
+        # Worker threads live as long as the checker, each with its own
+        # requests.Session, so connections are reused across files without
+        # sharing a session between threads
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._adapters: List[_PooledAdapter] = []
+        self._adapters_lock = threading.Lock()
+        
+        # Connections opened and requests sent by the async engine
+        self._async_connections = 0
+        self._async_requests = 0
+        
         # Store results for reporting
         self.successful_links: Dict[str, List[str]] = {}
         self.broken_links: Dict[str, Dict[str, Tuple[str, int, str]]] = {}
+        self.broken_occurrences: Dict[str, Dict[str, List[LinkOccurrence]]] = {}
         self.skipped_links: Dict[str, Set[str]] = {}
 
     def _log(self, message: str):
@@ -52,20 +157,23 @@ class LinkChecker:
         if self.verbose:
             print(f"[INFO] {message}")
 
-    def _extract_links(self, html_content: str, base_url: str = "") -> List[Tuple[str, str]]:
+    def _extract_links(self, html_content: str, base_url: str = "",
+                       file_path: str = "") -> List[LinkOccurrence]:
         """
         Extract all links from HTML content.
         
         Args:
             html_content: HTML content to parse
             base_url: Base URL for resolving relative links
+            file_path: File the content was read from, recorded in each occurrence
 
         Returns:
-            List of tuples containing (link, link_text)
+            List of LinkOccurrence, one per anchor in document order
         """
         links = []
         try:
             soup = BeautifulSoup(html_content, 'html.parser')
+            card_titles = {}  # id of a section.card -> its title
             
             # Find all anchor tags with href attribute
             for anchor in soup.find_all('a', href=True):
@@ -80,56 +188,278 @@ class LinkChecker:
                 if base_url and not urlparse(href).netloc:
                     href = urljoin(base_url, href)
                     
-                links.append((href, link_text))
+                card = anchor.find_parent('section', class_='card')
+                card_title = ""
+                if card is not None:
+                    card_title = card_titles.get(id(card))
+                    if card_title is None:
+                        title = card.find('h2', class_='card-title')
+                        card_title = card_titles[id(card)] = title.get_text(strip=True) if title else ""
+                    
+                links.append(LinkOccurrence(file_path, href, link_text, anchor.sourceline or 0, card_title))
                 
         except Exception as e:
             print(f"Error parsing HTML: {e}")
             
         return links
         
-    def _check_link(self, url: str, link_text: str) -> Tuple[str, bool, int, str]:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop the worker threads and close their connections."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        with self._adapters_lock:
+            for adapter in self._adapters:
+                adapter.close()
+
+    def _session(self) -> requests.Session:
+        """Return this thread's session, creating it on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            # A worker has one request in flight at a time, so one connection
+            # per host is enough; the number of hosts kept is shared out
+            # between the workers
+            adapter = _PooledAdapter(pool_connections=max(1, KEEP_ALIVE_CONNECTIONS // self.max_workers),
+                                     pool_maxsize=1)
+            session = requests.Session()
+            session.headers['User-Agent'] = self.user_agent
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            with self._adapters_lock:
+                self._adapters.append(adapter)
+            self._local.session = session
+        return session
+
+    def connection_stats(self) -> Tuple[int, int]:
+        """
+        Count the connections opened and HTTP requests sent so far.
+
+        Returns:
+            Tuple of (connections_opened, requests_made); redirects and GET
+            retries after a failed HEAD count as requests
+        """
+        with self._adapters_lock:
+            pools = [pool for adapter in self._adapters for pool in adapter.poolmanager.created_pools]
+        return (sum(pool.num_connections for pool in pools) + self._async_connections,
+                sum(pool.num_requests for pool in pools) + self._async_requests)
+
+    def _status_result(self, url: str, status_code: int) -> CheckResult:
+        """Return the result tuple for a URL that answered with status_code."""
+        if status_code < 400:
+            self._log(f"✓ {url} ({status_code})")
+            return url, True, status_code, ""
+        self._log(f"✗ {url} ({status_code})")
+        return url, False, status_code, f"HTTP Error: {status_code}"
+
+    def _conditional_headers(self, cached: Optional[CachedLink]) -> Dict[str, str]:
+        """Return the headers that revalidate a cached valid result, if it has validators."""
+        headers = {}
+        if cached is not None and cached.is_valid:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+        return headers
+
+    def _fetched(self, url: str, status_code: int, final_url: str, response_headers,
+                 cached: Optional[CachedLink]) -> _Fetch:
+        """Return the _Fetch for a response; a 304 confirms the cached result."""
+        if status_code == 304 and cached is not None:
+            self._log(f"✓ {url} (not modified)")
+            return _Fetch((url, True, cached.status_code, ""), cached.final_url,
+                          response_headers.get('ETag', cached.etag),
+                          response_headers.get('Last-Modified', cached.last_modified),
+                          not_modified=True)
+        return _Fetch(self._status_result(url, status_code), final_url,
+                      response_headers.get('ETag'), response_headers.get('Last-Modified'))
+
+    def _check_link(self, url: str, cached: Optional[CachedLink] = None) -> _Fetch:
         """
         Check if a link is valid by sending a HEAD request.
         
         Args:
             url: URL to check
-            link_text: Text of the link for reporting
+            cached: Stale cache entry to revalidate with a conditional request
 
         Returns:
-            Tuple of (url, is_valid, status_code, error_message)
+            _Fetch holding (url, is_valid, status_code, error_message)
         """
-        headers = {'User-Agent': self.user_agent}
         try:
             # Skip checking non-HTTP URLs
             if not url.startswith(('http://', 'https://')):
-                return url, False, 0, "Skipped: Non-HTTP URL"
+                return _Fetch((url, False, 0, "Skipped: Non-HTTP URL"))
                 
+            session = self._session()
+            
             # Try HEAD request first (faster)
-            response = requests.head(url, timeout=self.timeout, headers=headers, allow_redirects=True)
+            response = session.head(url, timeout=self.timeout, allow_redirects=True,
+                                    headers=self._conditional_headers(cached))
             
             # If HEAD request fails, try GET request
             if response.status_code >= 400:
-                response = requests.get(url, timeout=self.timeout, headers=headers, allow_redirects=True)
+                response = session.get(url, timeout=self.timeout, allow_redirects=True)
                 
-            if response.status_code < 400:
-                self._log(f"✓ {url} ({response.status_code})")
-                return url, True, response.status_code, ""
-            else:
-                self._log(f"✗ {url} ({response.status_code})")
-                return url, False, response.status_code, f"HTTP Error: {response.status_code}"
+            return self._fetched(url, response.status_code, response.url, response.headers, cached)
                 
         except requests.exceptions.Timeout:
             self._log(f"✗ {url} (Timeout)")
-            return url, False, 0, f"Timeout after {self.timeout} seconds"
+            return _Fetch((url, False, 0, f"Timeout after {self.timeout} seconds"))
         except requests.exceptions.SSLError:
             self._log(f"✗ {url} (SSL Error)")
-            return url, False, 0, "SSL Certificate Error"
+            return _Fetch((url, False, 0, "SSL Certificate Error"))
         except requests.exceptions.ConnectionError:
             self._log(f"✗ {url} (Connection Error)")
-            return url, False, 0, "Connection Error"
+            return _Fetch((url, False, 0, "Connection Error"))
         except Exception as e:
             self._log(f"✗ {url} (Error: {str(e)})")
-            return url, False, 0, str(e)
+            return _Fetch((url, False, 0, str(e)))
+
+    async def _check_link_async(self, session, limit: asyncio.Semaphore,
+                                host_limits: Dict[str, asyncio.Semaphore],
+                                url: str, cached: Optional[CachedLink] = None) -> _Fetch:
+        """
+        Check a link on an aiohttp session, HEAD first and GET if that fails.
+
+        At most per_host requests to the URL's host and concurrency requests
+        in all run at once. The timeout starts once both slots are taken, so
+        waiting for a slot never counts against it.
+        """
+        if not url.startswith(('http://', 'https://')):
+            return _Fetch((url, False, 0, "Skipped: Non-HTTP URL"))
+
+        # The host slot is taken first so a request queued behind its host
+        # does not hold one of the global slots while it waits
+        async with host_limits[urlparse(url).netloc], limit:
+            try:
+                async with session.head(url, allow_redirects=True,
+                                        headers=self._conditional_headers(cached)) as response:
+                    status_code, final_url, headers = response.status, str(response.url), response.headers
+                if status_code >= 400:
+                    async with session.get(url, allow_redirects=True) as response:
+                        status_code, final_url, headers = response.status, str(response.url), response.headers
+            except asyncio.TimeoutError:
+                self._log(f"✗ {url} (Timeout)")
+                return _Fetch((url, False, 0, f"Timeout after {self.timeout} seconds"))
+            except aiohttp.ClientSSLError:
+                self._log(f"✗ {url} (SSL Error)")
+                return _Fetch((url, False, 0, "SSL Certificate Error"))
+            except aiohttp.ClientConnectionError:
+                self._log(f"✗ {url} (Connection Error)")
+                return _Fetch((url, False, 0, "Connection Error"))
+            except Exception as e:
+                self._log(f"✗ {url} (Error: {str(e)})")
+                return _Fetch((url, False, 0, str(e)))
+        return self._fetched(url, status_code, final_url, headers, cached)
+
+    async def _check_urls_async(self, checks: List[Tuple[str, Optional[CachedLink]]],
+                                on_result: Callable[[_Fetch], None]):
+        """Check urls on one keep-alive session, passing each result to on_result as it completes."""
+        limit = asyncio.Semaphore(self.concurrency)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async def on_connection(session, context, params):
+            self._async_connections += 1
+
+        async def on_request(session, context, params):
+            self._async_requests += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(on_connection)
+        trace.on_request_start.append(on_request)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[trace],
+                                         headers={'User-Agent': self.user_agent}) as session:
+            tasks = [asyncio.ensure_future(self._check_link_async(session, limit, host_limits, url, cached))
+                     for url, cached in checks]
+            for task in asyncio.as_completed(tasks):
+                on_result(await task)
+
+    def check_urls(self, urls: Iterable[str]) -> Iterator[CheckResult]:
+        """
+        Check URLs with the configured engine.
+
+        With a cache, URLs checked within its TTL are answered from it, and
+        older valid results are revalidated with conditional requests.
+
+        Args:
+            urls: URLs to check
+
+        Returns:
+            Iterator of (url, is_valid, status_code, error_message) tuples;
+            cached results first, then the rest in the order they complete
+        """
+        now = time.time()
+        checks = []
+        for url in urls:
+            cached = self.cache.get(url) if self.cache is not None else None
+            if cached is not None and self.cache.is_fresh(cached, now):
+                self.cache.hits += 1
+                self._log(f"{'✓' if cached.is_valid else '✗'} {url} (cached {cached.status_code})")
+                yield url, cached.is_valid, cached.status_code, cached.error_message
+            else:
+                checks.append((url, cached))
+
+        try:
+            for fetch in self._fetch_all(checks):
+                if self.cache is not None:
+                    self._cache_fetch(fetch)
+                yield fetch.result
+        finally:
+            if self.cache is not None:
+                self.cache.flush()
+
+    def _cache_fetch(self, fetch: _Fetch):
+        """Count a fetched lookup and record its result if the server answered."""
+        url, is_valid, status_code, error_message = fetch.result
+        if not url.startswith(('http://', 'https://')):
+            # Skipped without a request, so neither a hit nor a miss
+            return
+        if fetch.not_modified:
+            self.cache.revalidated += 1
+        else:
+            self.cache.misses += 1
+        if status_code == 0:
+            # Timeouts and connection errors are worth retrying next run
+            return
+        self.cache.store(CachedLink(url, is_valid, status_code, error_message, fetch.final_url,
+                                    fetch.etag, fetch.last_modified, time.time()))
+
+    def _fetch_all(self, checks: List[Tuple[str, Optional[CachedLink]]]) -> Iterator[_Fetch]:
+        """Check (url, cached entry) pairs with the configured engine, yielding as they complete."""
+        if self.engine == "threads":
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+            futures = [self._executor.submit(self._check_link, url, cached) for url, cached in checks]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+            return
+
+        # The event loop runs on its own thread so results can be reported
+        # here as they arrive, like the thread pool's
+        results = queue.Queue()
+
+        def run():
+            try:
+                asyncio.run(self._check_urls_async(checks, results.put))
+            except BaseException as e:
+                results.put(e)
+            finally:
+                results.put(None)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        while (result := results.get()) is not None:
+            if isinstance(result, BaseException):
+                raise result
+            yield result
+        thread.join()
 
     def check_file(self, file_path: str) -> bool:
         """
@@ -141,59 +471,84 @@ class LinkChecker:
         Returns:
             True if all links are valid, False otherwise
         """
-        if not os.path.exists(file_path):
-            print(f"Error: File '{file_path}' not found.")
-            return False
-            
-        try:
+        return self.check_files([file_path])
+
+    def check_files(self, file_paths: List[str]) -> bool:
+        """
+        Check all links in several HTML files, fetching each URL once.
+        
+        Links are gathered from every file first and grouped by normalized
+        URL (see index_links), so a URL that appears many times, in one file
+        or across files, is checked once and its result recorded for every
+        occurrence.
+        
+        Args:
+            file_paths: Paths to the HTML files
+
+        Returns:
+            True if every file was read and all its links are valid
+        """
+        all_read = True
+        occurrences: Dict[str, List[LinkOccurrence]] = {}
+        checked_files = []
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                print(f"Error: File '{file_path}' not found.")
+                all_read = False
+                continue
+                
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    html_content = f.read()
+            except Exception as e:
+                print(f"Error processing file {file_path}: {e}")
+                all_read = False
+                continue
+                
             # Initialize collections for this file
             self.successful_links[file_path] = []
             self.broken_links[file_path] = {}
+            self.broken_occurrences[file_path] = {}
             self.skipped_links[file_path] = set()
+            checked_files.append(file_path)
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-                
             # Extract links from the HTML file
             print(f"\nChecking links in {file_path}...")
-            links = self._extract_links(html_content)
+            links = self._extract_links(html_content, file_path=file_path)
             print(f"Found {len(links)} links to check")
-            
-            # Use a thread pool to check links concurrently
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = []
-                for url, link_text in links:
-                    futures.append(executor.submit(self._check_link, url, link_text))
-                    
-                # Process results as they complete
-                for i, future in enumerate(concurrent.futures.as_completed(futures), 1):
-                    url, is_valid, status_code, error_message = future.result()
-                    
-                    # Print progress
-                    if self.verbose:
-                        print(f"Progress: {i}/{len(links)}")
-                    else:
-                        sys.stdout.write(f"\rChecking links: {i}/{len(links)}")
-                        sys.stdout.flush()
-                        
-                    # Store results
-                    if not url.startswith(('http://', 'https://')):
-                        self.skipped_links[file_path].add(url)
-                    elif is_valid:
-                        self.successful_links[file_path].append(url)
-                    else:
-                        self.broken_links[file_path][url] = (
-                            next((text for link, text in links if link == url), ""),
-                            status_code,
-                            error_message
-                        )
-            
-            print("\nLink checking completed.")
-            return len(self.broken_links[file_path]) == 0
-            
-        except Exception as e:
-            print(f"Error processing file {file_path}: {e}")
-            return False
+            index_links(links, occurrences)
+        
+        # The first URL seen for each normalized URL is the one requested
+        checks = {anchors[0].url: key for key, anchors in occurrences.items()}
+        anchors_total = sum(len(anchors) for anchors in occurrences.values())
+        print(f"\nChecking {len(checks)} unique URLs for {anchors_total} links "
+              f"in {len(checked_files)} files...")
+        
+        # Process results as they complete
+        for i, (checked_url, is_valid, status_code, error_message) in enumerate(
+                self.check_urls(checks), 1):
+            # Print progress
+            if self.verbose:
+                print(f"Progress: {i}/{len(checks)}")
+            else:
+                sys.stdout.write(f"\rChecking links: {i}/{len(checks)}")
+                sys.stdout.flush()
+                
+            # Store the result for every anchor leading to this URL
+            for occurrence in occurrences[checks[checked_url]]:
+                file_path, url = occurrence.file_path, occurrence.url
+                if not url.startswith(('http://', 'https://')):
+                    self.skipped_links[file_path].add(url)
+                elif is_valid:
+                    self.successful_links[file_path].append(url)
+                else:
+                    if url not in self.broken_links[file_path]:
+                        self.broken_links[file_path][url] = (occurrence.text, status_code, error_message)
+                        self.broken_occurrences[file_path][url] = []
+                    self.broken_occurrences[file_path][url].append(occurrence)
+        
+        print("\nLink checking completed.")
+        return all_read and not any(self.broken_links[file_path] for file_path in checked_files)
 
     def report(self):
         """Generate a report of broken links."""
@@ -210,6 +565,13 @@ class LinkChecker:
         print(f"Valid links: {total_valid}")
         print(f"Broken links: {total_broken}")
         print(f"Skipped links: {total_skipped}")
+        if self.verbose:
+            connections, requests_made = self.connection_stats()
+            print(f"Connections opened: {connections} for {requests_made} requests")
+        if self.cache is not None:
+            cache = self.cache
+            print(f"Cache hit rate: {cache.hit_rate():.0%} ({cache.hits} cached, "
+                  f"{cache.revalidated} revalidated, {cache.misses} checked)")
         print("=" * 80)
         
         if total_broken > 0:
@@ -225,6 +587,7 @@ class LinkChecker:
                         print(f"✗ {url}")
                         print(f"  Text: {link_text[:60] + '...' if len(link_text) > 60 else link_text}")
                         print(f"  Error: {error_message}")
+                        print(f"  Found at: {describe_occurrences(self.broken_occurrences[file_path].get(url, []))}")
                         print()
         else:
             print("\nAll links are valid! 🎉")
@@ -240,6 +603,38 @@ class LinkChecker:
                         print(f"- {url}")
 
 
+def index_links(links: Iterable[LinkOccurrence],
+                index: Optional[Dict[str, List[LinkOccurrence]]] = None) -> Dict[str, List[LinkOccurrence]]:
+    """
+    Group link occurrences by the URL they lead to.
+    
+    URLs are compared after normalize_url() without their fragment, so
+    anchors that only differ in case, default port, trailing slash, fragment
+    or tracking parameters share an entry.
+    
+    Args:
+        links: Occurrences to add
+        index: Existing index to add them to, if any
+
+    Returns:
+        Dict of normalized URL -> occurrences in the order they were added
+    """
+    if index is None:
+        index = {}
+    for occurrence in links:
+        index.setdefault(normalize_url(urldefrag(occurrence.url).url), []).append(occurrence)
+    return index
+
+
+def describe_occurrences(occurrences: List[LinkOccurrence], limit: int = 5) -> str:
+    """Return where anchors are, e.g. "line 12 (News), line 40 (Tools)"."""
+    places = [f"line {occurrence.line}" + (f" ({occurrence.card})" if occurrence.card else "")
+              for occurrence in occurrences[:limit]]
+    if len(occurrences) > limit:
+        places.append(f"and {len(occurrences) - limit} more")
+    return ", ".join(places)
+
+
 def main():
     """Main function to parse arguments and run the link checker."""
     parser = argparse.ArgumentParser(
@@ -261,23 +656,59 @@ def main():
         "-w", "--workers", type=int, default=10,
         help="Maximum number of concurrent workers"
     )
+    parser.add_argument(
+        "-e", "--engine", choices=ENGINES, default="threads",
+        help="Check links on a thread pool or with asyncio and aiohttp"
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=100,
+        help="Maximum requests in flight with --engine async"
+    )
+    parser.add_argument(
+        "--per-host", type=int, default=8,
+        help="Maximum requests in flight to one host with --engine async"
+    )
+    parser.add_argument(
+        "--cache-ttl", type=float, default=DEFAULT_TTL_HOURS,
+        help="Hours a cached result is used without asking the server again"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Check every link without reading or updating the result cache"
+    )
     
     args = parser.parse_args()
     
+    if args.engine == "async" and aiohttp is None:
+        print("Error: --engine async needs aiohttp (pip install aiohttp)")
+        return 2
+    
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = LinkCache(ttl_hours=args.cache_ttl)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: link cache unavailable, checking every link: {e}")
+    
     # Create a link checker instance
     checker = LinkChecker(
         timeout=args.timeout,
         verbose=args.verbose,
-        max_workers=args.workers
+        max_workers=args.workers,
+        engine=args.engine,
+        concurrency=args.concurrency,
+        per_host=args.per_host,
+        cache=cache
     )
     
-    # Check each file
+    # Check the links of all files together, so URLs they share are checked once
     start_time = time.time()
-    results = []
-    
-    for file_path in args.files:
-        result = checker.check_file(file_path)
-        results.append(result)
+    try:
+        all_valid = checker.check_files(args.files)
+    finally:
+        checker.close()
+        if cache is not None:
+            cache.close()
     
     # Generate report
     checker.report()
@@ -287,7 +718,7 @@ def main():
     print(f"\nExecution time: {execution_time:.2f} seconds")
     
     # Return exit code: 0 if all links are valid, 1 otherwise
-    return 0 if all(results) else 1
+    return 0 if all_valid else 1
 
 
 if __name__ == "__main__":
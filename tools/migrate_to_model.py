@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Migrate to Model - Import startup pages into model files the editor loads directly.
+
+The editor keeps each page's canonical data in a line-delimited JSON model file
+beside the HTML (Startup.html -> Startup.model.jsonl) and exports the HTML from
+it on save. This script parses existing HTML pages once and writes their model
+files; pages that already have one are skipped unless --force is given.
+
+Usage:
+    python3 tools/migrate_to_model.py Startup.html
+    python3 tools/migrate_to_model.py --force Startup.html examples/*.html
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path for importing project modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.html_parser import HtmlParser
+from src.utils.model_store import model_path_for, save_model
+
+
+def migrate_file(html_path, force=False):
+    """Write the model file for one page. Returns True if it was written."""
+    model_path = model_path_for(html_path)
+    if os.path.exists(model_path) and not force:
+        print(f"{html_path}: {model_path} already exists, skipped")
+        return False
+
+    model = HtmlParser.load_from_file(html_path)
+    save_model(model, model_path, html_layout=model.layout)
+
+    links = sum(len(card.links) + sum(len(links) for links in card.subsections.values())
+                for card in model.cards)
+    print(f"{html_path}: wrote {model_path} ({len(model.cards)} cards, {links} links)")
+    return True
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Import startup pages into model files beside them"
+    )
+    parser.add_argument("files", nargs="+", help="HTML files to import")
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Overwrite existing model files"
+    )
+    args = parser.parse_args()
+
+    for html_path in args.files:
+        if not os.path.exists(html_path):
+            print(f"Error: File '{html_path}' not found.")
+            return 2
+        try:
+            migrate_file(html_path, force=args.force)
+        except Exception as e:
+            print(f"Error migrating {html_path}: {e}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
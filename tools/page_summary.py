@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Page Summary - Count the cards of startup pages without parsing them.
+
+Each file is memory-mapped and scanned as raw bytes for its section.card
+elements, card titles, <meta> version tags and footer date, so even very
+large pages are summarized at close to disk speed.
+
+Usage:
+    python3 tools/page_summary.py Startup.html
+    python3 tools/page_summary.py --titles pages/*.html
+    python3 tools/page_summary.py --json pages/*.html
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict
+
+# Add parent directory to path for importing project modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.page_scanner import map_file, scan_page
+
+
+def summarize_file(file_path: str) -> Dict:
+    """Return the card count, titles and version fields of one page."""
+    with map_file(file_path) as data:
+        scan = scan_page(data)
+        last_updated = scan.text(data, scan.footer_updated)
+    return {
+        "file": file_path,
+        "size": os.path.getsize(file_path),
+        "cards": len(scan.cards),
+        "titles": [span.title for span in scan.cards],
+        "version": scan.meta.get("version"),
+        "last_modified": scan.meta.get("last-modified"),
+        "last_updated": last_updated.strip() if last_updated else None,
+    }
+
+
+def print_summary(summary: Dict, titles: bool = False) -> None:
+    """Print the summary of one page."""
+    details = [f"{summary['cards']} cards", f"{summary['size'] / 1024:.1f} KiB"]
+    if summary["version"]:
+        details.append(f"version {summary['version']}")
+    if summary["last_updated"]:
+        details.append(f"last updated {summary['last_updated']}")
+    print(f"{summary['file']}: {', '.join(details)}")
+    if titles:
+        for title in summary["titles"]:
+            print(f"    {title}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Count the cards of startup pages without parsing them"
+    )
+    parser.add_argument("files", nargs="+", help="HTML files to summarize")
+    parser.add_argument("--titles", action="store_true", help="List the card titles")
+    parser.add_argument("--json", action="store_true", help="Print the summaries as JSON")
+    args = parser.parse_args()
+
+    summaries = []
+    for file_path in args.files:
+        if not os.path.exists(file_path):
+            print(f"Error: File '{file_path}' not found.")
+            return 2
+        try:
+            summaries.append(summarize_file(file_path))
+        except Exception as e:
+            print(f"Error scanning {file_path}: {e}")
+            return 1
+
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    else:
+        for summary in summaries:
+            print_summary(summary, titles=args.titles)
+        if len(summaries) > 1:
+            print(f"\n{sum(summary['cards'] for summary in summaries)} cards in {len(summaries)} files")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
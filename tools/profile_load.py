@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Profile Load - Show where the time goes when a startup page is loaded.
+
+Loads a page the way the editor does and prints the time spent in each phase
+(reading, parsing, building the model, ...) together with the number of cards,
+links and bytes loaded, as a summary line or as JSON.
+
+Usage:
+    python3 tools/profile_load.py Startup.html
+    python3 tools/profile_load.py --full --bs4 Startup.html
+    python3 tools/profile_load.py --json Startup.html > profile.json
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path for importing project modules
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.html_parser import HtmlParser
+from src.utils.parse_profile import ParseProfile
+
+
+def profile_load(file_path: str, lazy: bool = True, streaming: bool = True) -> ParseProfile:
+    """Load file_path once and return its profile."""
+    profile = ParseProfile()
+    HtmlParser.load_from_file(file_path, streaming=streaming, lazy=lazy, profile=profile)
+    return profile
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Show the time spent in each phase of loading a startup page"
+    )
+    parser.add_argument("file", help="HTML file to load")
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Parse every card up front instead of reading cards on demand as the editor does"
+    )
+    parser.add_argument(
+        "--bs4", action="store_true",
+        help="Parse with BeautifulSoup instead of the streaming parser (implies --full)"
+    )
+    parser.add_argument(
+        "--json", action="store_true",
+        help="Print the profile as JSON"
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"Error: File '{args.file}' not found.")
+        return 2
+
+    try:
+        profile = profile_load(args.file, lazy=not (args.full or args.bs4), streaming=not args.bs4)
+    except Exception as e:
+        print(f"Error loading {args.file}: {e}")
+        return 1
+
+    print(profile.to_json() if args.json else f"{args.file}: {profile.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Stub Server - A local HTTP server with configurable latency for link checker
+tests and benchmarks.
+
+Every request is answered after `latency` seconds. `/status/<code>` answers
+with that status code (any query string is ignored) and any other path with
+200. Responses carry an ETag and Last-Modified date, and requests whose
+If-None-Match or If-Modified-Since matches get 304. Connections are kept
+alive (HTTP/1.1), and the server counts the connections it accepted, the
+requests it answered, its 304 answers and the most requests it was answering
+at once, so tests can tell whether clients reuse connections, revalidate and
+respect concurrency limits.
+
+Usage:
+    python3 tools/stub_server.py --port 8000 --latency 0.05
+"""
+
+import argparse
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# Every stub page was last modified at this time
+LAST_MODIFIED = "Mon, 06 Jan 2025 12:00:00 GMT"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers HEAD and GET requests after the server's latency."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.record("connections")
+
+    def _respond(self, body: bool):
+        self.server.record("requests")
+        self.server.enter()
+        try:
+            time.sleep(self.server.latency)
+        finally:
+            self.server.leave()
+        status = 200
+        path = urlsplit(self.path).path
+        if path.startswith("/status/"):
+            try:
+                status = int(path.rsplit("/", 1)[1])
+            except ValueError:
+                status = 400
+        etag = f'"{path}"'
+        if status < 400 and (self.headers.get("If-None-Match") == etag or
+                             self.headers.get("If-Modified-Since") == LAST_MODIFIED):
+            self.server.record("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        payload = f"{status}\n".encode("ascii")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        if body:
+            self.wfile.write(payload)
+
+    def do_HEAD(self):
+        self._respond(body=False)
+
+    def do_GET(self):
+        self._respond(body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """A threaded HTTP server on localhost; use as a context manager.
+
+    Inside the with block the server runs on a background thread and
+    url(path) returns an absolute URL on it.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, latency: float = 0.0, port: int = 0):
+        super().__init__(("127.0.0.1", port), _StubHandler)
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def record(self, counter: str):
+        """Add one to the connections, requests or not_modified counter."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def enter(self):
+        """Note that a request started waiting out the latency."""
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self):
+        """Note that a request finished waiting."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def url(self, path: str = "/") -> str:
+        """Return the URL of path on this server."""
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self._thread.join()
+        self.server_close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Serve stub HTTP responses with a fixed latency")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Seconds to wait before answering each request")
+    args = parser.parse_args()
+
+    with StubServer(args.latency, args.port) as server:
+        print(f"Serving on {server.url()} with {args.latency * 1000:.0f} ms latency (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    print(f"{server.requests} requests on {server.connections} connections")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
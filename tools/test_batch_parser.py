@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for src/utils/batch_parser.py.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.batch_parser import parse_files
+from src.utils.html_parser import HtmlParser
+
+ROOT = Path(parent_dir)
+PAGES = [str(ROOT / 'Startup.html'), str(ROOT / 'index.html')] + \
+    sorted(str(path) for path in (ROOT / 'examples').glob('*.html'))
+
+
+def test_pool_results_match_load_from_file_in_input_order():
+    results = list(parse_files(PAGES, workers=2, max_pending=1))
+
+    assert [result.path for result in results] == PAGES
+    for result in results:
+        assert result.error is None
+        assert result.parse_seconds > 0
+        assert result.model.to_dict() == HtmlParser.load_from_file(result.path).to_dict()
+        assert not result.model.dirty
+
+
+def test_pool_results_can_be_saved_incrementally(tmp_path):
+    page = tmp_path / 'Startup.html'
+    page.write_bytes((ROOT / 'Startup.html').read_bytes())
+    other = tmp_path / 'other.html'
+    other.write_bytes(page.read_bytes())
+
+    model = next(parse_files([str(page), str(other)], workers=2)).model
+    assert model.layout is not None and model.layout.matches(str(page))
+
+
+def test_unreadable_file_is_reported_without_stopping_the_batch(tmp_path):
+    missing = str(tmp_path / 'missing.html')
+    for workers in (None, 2):
+        results = list(parse_files([missing, PAGES[0]], workers=workers))
+
+        assert results[0].model is None
+        assert 'missing.html' in results[0].error
+        assert results[1].error is None and results[1].model.cards
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the helpers of tools/benchmark.py (the benchmarks themselves are run
+with `make benchmark`).
+"""
+import os
+import sys
+import time
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(parent_dir, 'tools'))
+
+from benchmark import compare, make_model
+from src.utils.html_parser import HtmlParser
+
+
+def test_synthetic_model_round_trips():
+    model = make_model(20, 10)
+    assert len(model.cards) == 20
+    assert sum(len(card.links) + sum(map(len, card.subsections.values()))
+               for card in model.cards) == 200
+
+    parsed = HtmlParser.parse_html_streaming(HtmlParser.generate_html(model))
+    assert [card.title for card in parsed.cards] == [card.title for card in model.cards]
+
+
+def test_compare_flags_only_regressions_past_threshold():
+    baseline = {'page': {
+        'parse': {'seconds': 0.100, 'peak_kib': 1000.0},
+        'save': {'seconds': 0.001, 'peak_kib': 10.0},
+    }}
+    results = {'page': {
+        'parse': {'seconds': 0.140, 'peak_kib': 2000.0},
+        'save': {'seconds': 0.002, 'peak_kib': 20.0},  # below the noise floor
+        'new_op': {'seconds': 1.0, 'peak_kib': 1.0},
+    }}
+
+    regressions = compare(results, baseline, threshold=0.25)
+    assert len(regressions) == 3
+    assert sum(regression.startswith('page parse') for regression in regressions) == 2
+    assert compare(results, baseline, threshold=1.5) == ['page new_op: not in the baseline']
+
+
+def test_measure_keeps_the_median_run():
+    from benchmark import measure
+
+    delays = iter([0.0, 0.12, 0.0])
+    result = measure(lambda _: time.sleep(next(delays, 0.0)), repeat=3)
+    assert result['seconds'] < 0.02
+
+
+def test_card_renderer_matches_legacy_output():
+    from benchmark import legacy_render_card
+    from src.utils.html_renderer import render_card
+
+    for card in make_model(50, 12, seed=3).cards:
+        assert render_card(card) == legacy_render_card(card)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for dirty tracking and the change journal in src/models/card_model.py.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.models.card_model import Card, Link, StartupPageModel
+from src.utils.html_parser import HtmlParser
+
+STARTUP_HTML = Path(parent_dir) / 'Startup.html'
+
+
+def make_model():
+    model = StartupPageModel()
+    for title in ('One', 'Two', 'Three'):
+        card = Card(title=title)
+        card.add_link(Link(name=f'{title} link', url=f'https://{title.lower()}.example/'))
+        model.add_card(card)
+    model.mark_clean()
+    return model
+
+
+def test_loaded_model_is_clean():
+    for streaming in (True, False):
+        model = HtmlParser.load_from_file(str(STARTUP_HTML), streaming=streaming)
+        assert not model.dirty
+        assert model.journal == []
+        assert not any(card.dirty for card in model.cards)
+
+
+def test_setting_same_value_records_nothing():
+    model = make_model()
+    model.cards[0].title = 'One'
+    model.cards[0].links[0].url = 'https://one.example/'
+    assert not model.dirty
+
+
+def test_link_change_marks_its_card_and_model():
+    model = make_model()
+    events = []
+    model.add_listener(events.append)
+
+    link = model.cards[1].links[0]
+    link.name = 'Renamed'
+
+    assert model.dirty and link.dirty and model.cards[1].dirty
+    assert not model.cards[0].dirty
+    assert model.dirty_cards() == [model.cards[1]]
+    assert [(c.op, c.card, c.target, c.detail) for c in events] == [
+        ('set', model.cards[1], link, ('name', 'Two link', 'Renamed')),
+    ]
+
+    model.mark_clean()
+    assert not model.dirty and not link.dirty and not model.cards[1].dirty
+
+
+def test_structural_operations_are_journaled():
+    model = make_model()
+    first, second, third = model.cards
+    extra = Card(title='Four')
+
+    model.move_card(third, 0)
+    model.add_card(extra)
+    model.remove_card(first)
+    second.add_subsection_link('Additional Links', Link(name='Sub', url='https://sub.example/'))
+    second.set_subsection_links('Additional Links', [])
+    model.cards = list(reversed(model.cards))
+
+    assert [change.op for change in model.journal] == [
+        'move_card', 'add_card', 'remove_card', 'add_link', 'reorder_links', 'reorder_cards',
+    ]
+    assert model.dirty_cards() == [extra, second, third]
+
+    # Changes to a card that has been removed no longer reach the model
+    journal_length = len(model.journal)
+    first.title = 'Gone'
+    assert len(model.journal) == journal_length
+
+
+def test_save_marks_model_clean(tmp_path):
+    page = tmp_path / 'Startup.html'
+    page.write_bytes(STARTUP_HTML.read_bytes())
+    model = HtmlParser.load_from_file(str(page))
+
+    model.cards[0].links[0].font_color = '#ff0000'
+    assert model.dirty
+
+    HtmlParser.save_to_file(model, str(page))
+    assert not model.dirty
+    assert not model.cards[0].dirty and not model.cards[0].links[0].dirty
+
+
+def test_links_and_cards_use_slots_with_interned_styles():
+    size = ''.join(['1', '4px'])
+    first = Link(name='a', url='https://a.example/', font_size=size, font_color='#333')
+    second = Link(name='b', url='https://b.example/', font_size='14px')
+    card = Card(title='Card', background_color=''.join(['#fff', 'fff']))
+
+    assert not hasattr(first, '__dict__') and not hasattr(card, '__dict__')
+    assert first.font_size is second.font_size
+    assert card.background_color is Card(background_color='#ffffff').background_color
+
+
+def test_batched_card_removal_and_move():
+    model = StartupPageModel()
+    cards = [Card(title=f'Card {i}') for i in range(6)]
+    for card in cards:
+        model.add_card(card)
+
+    model.remove_cards([cards[4], cards[1], Card(title='Stranger')])
+    assert [card.title for card in model.cards] == ['Card 0', 'Card 2', 'Card 3', 'Card 5']
+    assert model.card_by_uid(cards[1].uid) is None
+    assert model.index_of(cards[3]) == 2
+
+    model.move_cards([cards[5], cards[0]], 1)
+    assert [card.title for card in model.cards] == ['Card 2', 'Card 5', 'Card 0', 'Card 3']
+    assert model.index_of(cards[0]) == 2
+    assert model.card_by_uid(cards[5].uid) is cards[5]
+
+
+def test_batched_link_removal():
+    card = Card(title='Card')
+    links = [Link(name=f'Link {i}', url=f'https://{i}.example/') for i in range(5)]
+    for link in links:
+        card.add_link(link)
+    card.add_subsection_link('Additional Links', Link(name='Sub', url='https://sub.example/'))
+
+    card.remove_links([links[3], links[0]])
+    assert [link.name for link in card.links] == ['Link 1', 'Link 2', 'Link 4']
+
+    card.remove_links(card.subsections['Additional Links'], 'Additional Links')
+    assert card.subsections == {}
+
+
+def test_removing_many_cards_is_not_quadratic():
+    model = StartupPageModel()
+    for i in range(20000):
+        model.add_card(Card(title=f'Card {i}'))
+
+    start = time.perf_counter()
+    model.remove_cards(model.cards[::2])
+    elapsed = time.perf_counter() - start
+
+    assert len(model.cards) == 10000
+    assert elapsed < 1.0
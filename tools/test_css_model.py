@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for src/utils/css_model.py and the CSS handling in HtmlParser.generate_html.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.css_model import CssStylesheet, compact_css
+from src.utils.html_parser import HtmlParser
+
+STARTUP_HTML = Path(parent_dir) / 'Startup.html'
+
+
+def test_identical_and_adjacent_duplicates_collapse_at_last_position():
+    css = """
+.card { color: red; padding: 1rem; }
+.title { color: blue; }
+/* again */
+.card { color: red; padding: 1rem; }
+.card { color: green; }
+@media (max-width: 768px) { }
+"""
+    stylesheet = CssStylesheet.parse(css)
+
+    assert [rule.key for rule in stylesheet.rules] == ['.title', '.card']
+    assert stylesheet.get('.card').declarations() == {'color': 'green', 'padding': '1rem'}
+    assert stylesheet.get('.card').comments == ['/* again */']
+
+
+def test_intervening_rule_still_wins_over_earlier_copy():
+    # An element with both classes is purple: .visited overrides the first
+    # .link, and the second .link does not set a color
+    css = """
+.link { color: red; }
+.visited { color: purple; }
+.link { font-weight: bold; }
+"""
+    stylesheet = CssStylesheet.parse(css)
+
+    assert [rule.key for rule in stylesheet.rules] == ['.link', '.visited', '.link']
+    assert [rule.declarations() for rule in stylesheet.rules] == [
+        {'color': 'red'}, {'color': 'purple'}, {'font-weight': 'bold'}]
+    assert stylesheet.get('.link').declarations() == {'font-weight': 'bold'}
+    output = stylesheet.serialize()
+    assert CssStylesheet.parse(output).serialize() == output
+
+
+def test_merge_replaces_nested_rules_in_place():
+    stylesheet = CssStylesheet.parse("""
+.main-grid { display: grid; }
+@media (max-width: 768px) { .header { text-align: center; } .main-grid { display: block; } }
+footer { margin: 0; }
+""")
+    stylesheet.merge(CssStylesheet.parse("""
+.main-grid { column-count: 3; }
+@media (max-width: 768px) { .main-grid { column-count: 1; } }
+"""))
+
+    assert [rule.key for rule in stylesheet.rules] == [
+        '.main-grid', '@media (max-width: 768px)', 'footer']
+    media = stylesheet.get('@media (max-width: 768px)')
+    assert media.children.get('.header') is not None
+    assert media.children.get('.main-grid').declarations() == {'column-count': '1'}
+    assert stylesheet.get('.main-grid').declarations() == {'column-count': '3'}
+
+
+def test_strings_and_comments_do_not_split_rules():
+    css = 'a::after { content: "}{;"; } /* { */ b { background: url(x;y.png); }'
+    stylesheet = CssStylesheet.parse(css)
+
+    assert [rule.key for rule in stylesheet.rules] == ['a::after', 'b']
+    assert stylesheet.get('b').declarations() == {'background': 'url(x;y.png)'}
+
+
+def test_deeply_nested_blocks_do_not_exhaust_recursion():
+    unclosed = CssStylesheet.parse('@media (max-width: 600px) { .x { color: red; } ' * 5000)
+    assert len(unclosed) == 1
+
+    balanced = CssStylesheet.parse('@media screen { ' * 5000 + '.x { color: red; }' + '}' * 5000)
+    text = balanced.serialize()
+    assert len(balanced) == 1
+    assert CssStylesheet.parse(text).serialize() == text
+
+
+def test_compaction_repairs_bloated_startup_page():
+    css = HtmlParser.parse_html(STARTUP_HTML.read_text(encoding='utf-8')).css_styles
+    compacted = compact_css(css)
+
+    assert css.count('Masonry-style layout') > 100
+    assert compacted.count('Masonry-style layout') == 1
+    assert len(compacted) < len(css) // 5
+    assert compact_css(compacted) == compacted
+
+
+def test_generate_html_output_has_fixed_size():
+    model = HtmlParser.load_from_file(str(STARTUP_HTML))
+
+    first = HtmlParser.generate_html(model)
+    reparsed = HtmlParser.parse_html(first)
+    second = HtmlParser.generate_html(reparsed)
+
+    assert len(second) == len(first)
+    assert reparsed.css_styles.count('.main-grid {') == 3
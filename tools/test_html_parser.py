@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Tests for src/utils/html_parser.py.
+"""
+import json
+import os
+import stat
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.models.card_model import Card, Link, StartupPageModel
+from src.utils.html_parser import HtmlParser
+from src.utils.page_scanner import scan_page
+from src.utils.parse_profile import ParseProfile
+
+ROOT = Path(parent_dir)
+PAGES = [ROOT / 'Startup.html', ROOT / 'index.html'] + sorted((ROOT / 'examples').glob('*.html'))
+
+
+def model_snapshot(model):
+    """Return a comparable representation of a StartupPageModel."""
+    def links(items):
+        return [(l.name, l.url, l.font_size, l.font_color) for l in items]
+
+    return {
+        'css_styles': model.css_styles,
+        'last_updated': model.last_updated,
+        'cards': [
+            (card.title, card.icon, card.background_color, links(card.links),
+             {title: links(items) for title, items in card.subsections.items()})
+            for card in model.cards
+        ],
+    }
+
+
+@pytest.mark.parametrize('page', PAGES, ids=lambda p: p.name)
+def test_streaming_parser_matches_beautifulsoup(page):
+    html_content = page.read_text(encoding='utf-8')
+    expected = model_snapshot(HtmlParser.parse_html(html_content))
+
+    assert model_snapshot(HtmlParser.parse_html_streaming(html_content)) == expected
+    assert model_snapshot(HtmlParser.load_from_file(str(page))) == expected
+
+
+def test_streaming_parser_matches_beautifulsoup_on_edge_cases():
+    html_content = """<html><head><style></style></head><body>
+    <main class="main-grid">
+        <section class="card"><div class="link-grid">
+            <div class="link-item"><a href="u">Untitled card</a></div>
+        </div></section>
+        <section class="card wide">
+            <h2 class="card-title"> Tools <b>Box</b><script>ignored</script></h2>
+            <div class="link-grid">
+                <div class="link-item"><span><a href="a1">One<!-- c --> A</a></span><a href="a2">Two</a></div>
+                <div class="link-item">No anchor</div>
+            </div>
+            <div class="link-grid" style="margin-top: 1rem;">
+                <div><div class="link-item"><a>Nested</a></div></div>
+                <div class="link-item"><a href="s2">Sub</a></div>
+            </div>
+            <div class="link-grid" style="margin-top: 1rem;">
+                <div class="link-item"><a href="s3">Second grid</a></div>
+            </div>
+        </section>
+    </main>
+    <footer>Last updated: Monday <script>x</script></footer>
+    <footer>Last updated: Tuesday</footer>
+    </body></html>"""
+
+    expected = model_snapshot(HtmlParser.parse_html(html_content))
+    assert model_snapshot(HtmlParser.parse_html_streaming(html_content)) == expected
+    assert [card[0] for card in expected['cards']] == ['Tools Box']
+
+    # Untitled grids are numbered, and their links are not repeated as main links
+    _, _, _, main_links, subsections = expected['cards'][0]
+    assert [link[0] for link in main_links] == ['One A']
+    assert {title: [link[0] for link in items] for title, items in subsections.items()} == {
+        'Additional Links': ['Nested', 'Sub'],
+        'Additional Links 2': ['Second grid'],
+    }
+
+
+@pytest.mark.parametrize('parse', [HtmlParser.parse_html, HtmlParser.parse_html_streaming],
+                         ids=['beautifulsoup', 'streaming'])
+def test_subsections_round_trip_with_titles_and_order(parse):
+    model = synthetic_model(3, 2)
+    for index, card in enumerate(model.cards):
+        for title in ('Zeta', 'Alpha & "Beta"', f'Weekend {index}'):
+            card.set_subsection_links(title, [Link(name=f'{title} {n}', url=f'https://{index}.example/{n}')
+                                              for n in range(3)])
+
+    parsed = parse(HtmlParser.generate_html(model))
+    assert model_snapshot(parsed)['cards'] == model_snapshot(model)['cards']
+    assert list(parsed.cards[0].subsections) == ['Zeta', 'Alpha & "Beta"', 'Weekend 0']
+
+
+
+def styled_model():
+    model = synthetic_model(3, 4)
+    for index, card in enumerate(model.cards):
+        card.background_color = ['', '#fafafa', 'rgb(10, 20, 30)'][index]
+        card.links[0].font_size = '14px'
+        card.links[1].font_color = '#ff0000'
+        card.links[2].font_size, card.links[2].font_color = '12pt', 'blue'
+        card.set_subsection_links('More', [Link(name='Styled', url='https://s.example/', font_color='#123456')])
+    return model
+
+
+@pytest.mark.parametrize('parse', [HtmlParser.parse_html, HtmlParser.parse_html_streaming],
+                         ids=['beautifulsoup', 'streaming'])
+def test_link_and_card_styles_round_trip(parse):
+    model = styled_model()
+    parsed = parse(HtmlParser.generate_html(model))
+
+    assert model_snapshot(parsed)['cards'] == model_snapshot(model)['cards']
+    assert parsed.cards[2].links[2].font_size == '12pt' and parsed.cards[2].links[2].font_color == 'blue'
+
+
+def test_lazy_load_keeps_card_and_link_styles(tmp_path):
+    page = tmp_path / 'Styled.html'
+    model = styled_model()
+    HtmlParser.save_to_file(model, str(page))
+
+    lazy = HtmlParser.load_from_file(str(page), lazy=True)
+    assert [card.background_color for card in lazy.cards] == ['', '#fafafa', 'rgb(10, 20, 30)']
+    assert not any(card.is_loaded for card in lazy.cards)
+    assert model_snapshot(lazy)['cards'] == model_snapshot(model)['cards']
+
+
+def main_region(data):
+    """Return the bytes between <main ...> and </main>."""
+    return data[data.index(b'<main'):data.index(b'</main>')]
+
+
+def card_region(data, title, next_title):
+    return data[data.index(b'<!-- ' + title):data.index(b'<!-- ' + next_title)]
+
+
+def test_incremental_save_only_rewrites_changed_cards(tmp_path):
+    page = tmp_path / 'Startup.html'
+    page.write_bytes((ROOT / 'Startup.html').read_bytes())
+    model = HtmlParser.load_from_file(str(page))
+    HtmlParser.save_to_file(model, str(page))  # the first save compacts the CSS
+    before = page.read_bytes()
+
+    model.cards[1].links[0].name = 'Edited'
+    HtmlParser.save_to_file(model, str(page))
+    after = page.read_bytes()
+
+    old_card = card_region(before, b'Local News', b'Weather')
+    new_card = card_region(after, b'Local News', b'Weather')
+    assert b'>Edited</a>' in new_card
+    assert main_region(after) == main_region(before).replace(old_card, new_card)
+    assert model_snapshot(HtmlParser.load_from_file(str(page)))['cards'] == model_snapshot(model)['cards']
+
+
+def test_incremental_save_handles_reordered_and_removed_cards(tmp_path):
+    page = tmp_path / 'Startup.html'
+    page.write_bytes((ROOT / 'Startup.html').read_bytes())
+    model = HtmlParser.load_from_file(str(page))
+    original = page.read_bytes()
+
+    model.move_card(model.cards[0], 2)
+    model.remove_card(model.cards[-1])
+    HtmlParser.save_to_file(model, str(page))
+    saved = page.read_bytes()
+
+    assert card_region(saved, b'Search Engines', b'Libraries') == \
+        card_region(original, b'Search Engines', b'Local News')
+    assert b'WebCams' not in main_region(saved)
+    assert model_snapshot(HtmlParser.load_from_file(str(page)))['cards'] == model_snapshot(model)['cards']
+
+
+def test_save_regenerates_page_modified_since_load(tmp_path):
+    page = tmp_path / 'Startup.html'
+    page.write_bytes((ROOT / 'Startup.html').read_bytes())
+    model = HtmlParser.load_from_file(str(page))
+
+    page.write_text('<html><body>replaced elsewhere</body></html>', encoding='utf-8')
+    HtmlParser.save_to_file(model, str(page))
+
+    assert b'replaced elsewhere' not in page.read_bytes()
+    assert model_snapshot(HtmlParser.load_from_file(str(page)))['cards'] == model_snapshot(model)['cards']
+
+
+def test_save_to_new_path_uses_umask_mode_and_keeps_existing_mode(tmp_path):
+    model = HtmlParser.load_from_file(str(ROOT / 'Startup.html'))
+    old_umask = os.umask(0o022)
+    try:
+        new_page = tmp_path / 'New.html'
+        HtmlParser.save_to_file(model, str(new_page))
+        assert stat.S_IMODE(new_page.stat().st_mode) == 0o644
+
+        new_page.chmod(0o640)
+        HtmlParser.save_to_file(model, str(new_page))
+        assert stat.S_IMODE(new_page.stat().st_mode) == 0o640
+    finally:
+        os.umask(old_umask)
+
+
+def test_write_html_streams_the_generated_page(tmp_path):
+    model = HtmlParser.load_from_file(str(PAGES[0]))
+    out = tmp_path / 'out.html'
+    with open(out, 'w', encoding='utf-8') as f:
+        HtmlParser.write_html(model, f)
+
+    generated = HtmlParser.generate_html(model).encode('utf-8')
+    assert main_region(out.read_bytes()) == main_region(generated)
+
+
+def assert_layout_matches_file(model, page):
+    """Check that model.layout records where a fresh scan finds the page's parts."""
+    scan = scan_page(page.read_bytes())
+    assert list(model.layout.bounds) == [pos for span in scan.cards for pos in (span.start, span.end)]
+    assert model.layout.regions == {name: getattr(scan, name) for name in
+                                    ('style', 'header_updated', 'footer_year', 'footer_updated')}
+
+
+def test_saves_remember_where_the_cards_were_written(tmp_path):
+    page = tmp_path / 'Startup.html'
+    model = HtmlParser.load_from_file(str(ROOT / 'Startup.html'), lazy=True)
+    HtmlParser.save_to_file(model, str(page))  # a new file is rendered in full
+    assert_layout_matches_file(model, page)
+
+    model.cards[1].links[0].name = 'A much longer name than the link had before'
+    model.move_card(model.cards[0], 3)
+    HtmlParser.save_to_file(model, str(page))
+    assert_layout_matches_file(model, page)
+
+    model.cards[2].title = 'Renamed'
+    HtmlParser.save_to_file(model, str(page))
+    assert_layout_matches_file(model, page)
+    assert model_snapshot(HtmlParser.load_from_file(str(page)))['cards'] == model_snapshot(model)['cards']
+
+
+def test_incremental_save_does_not_read_the_whole_page(tmp_path):
+    page = tmp_path / 'page.html'
+    model = synthetic_model(2000, 20)
+    HtmlParser.save_to_file(model, str(page))
+    model.cards[1000].links[0].name = 'Edited'
+
+    tracemalloc.start()
+    try:
+        HtmlParser.save_to_file(model, str(page))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert b'>Edited</a>' in page.read_bytes()
+    assert peak < page.stat().st_size / 4
+
+
+def synthetic_model(cards, links_per_card):
+    model = StartupPageModel()
+    for c in range(cards):
+        card = Card(title=f'Card {c}')
+        for n in range(links_per_card):
+            card.add_link(Link(name=f'Link {c}.{n}', url=f'https://example.com/{c}/{n}'))
+        model.add_card(card)
+    return model
+
+
+def test_iter_html_yields_the_generated_page_in_chunks():
+    model = HtmlParser.load_from_file(str(PAGES[0]))
+    chunks = list(HtmlParser.iter_html(model))
+
+    assert len(chunks) == len(model.cards) + 2
+    assert main_region(''.join(chunks).encode('utf-8')) == \
+        main_region(HtmlParser.generate_html(model).encode('utf-8'))
+
+
+def test_full_save_peak_memory_does_not_grow_with_page_size(tmp_path):
+    def save_peak(model):
+        tracemalloc.start()
+        try:
+            HtmlParser.save_to_file(model, str(tmp_path / 'page.html'))
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small = save_peak(synthetic_model(50, 20))
+    large = save_peak(synthetic_model(1000, 20))
+
+    # The large page is 20 times the size; only per-save overhead may differ
+    assert large < small * 2
+    assert (tmp_path / 'page.html').stat().st_size > 1000 * 20 * 50
+
+
+@pytest.mark.parametrize('page', PAGES, ids=lambda path: path.name)
+def test_lazy_load_matches_full_parse(page):
+    lazy = HtmlParser.load_from_file(str(page), lazy=True)
+
+    assert not any(card.is_loaded for card in lazy.cards)
+    assert lazy.to_dict() == HtmlParser.load_from_file(str(page)).to_dict()
+    assert not lazy.dirty
+
+
+def test_lazy_cards_load_on_access_and_save_incrementally(tmp_path):
+    page = tmp_path / 'Startup.html'
+    page.write_bytes((ROOT / 'Startup.html').read_bytes())
+    original = page.read_bytes()
+    expected = HtmlParser.load_from_file(str(page)).to_dict()
+
+    model = HtmlParser.load_from_file(str(page), lazy=True)
+    card = model.cards[0]
+    card.add_link(Link(name='New', url='https://new.example/'))
+    assert card.is_loaded and card.links[-1].name == 'New'
+    assert [link.to_dict() for link in card.links[:-1]] == expected['cards'][0]['links']
+
+    HtmlParser.save_to_file(model, str(page))
+    assert sum(card.is_loaded for card in model.cards) == 1
+    assert card_region(page.read_bytes(), b'Local News', b'Libraries') == \
+        card_region(original, b'Local News', b'Libraries')
+
+    expected['cards'][0]['links'].append({'name': 'New', 'url': 'https://new.example/'})
+    assert HtmlParser.load_from_file(str(page)).to_dict()['cards'] == expected['cards']
+
+
+@pytest.mark.parametrize('streaming', [True, False], ids=['streaming', 'bs4'])
+def test_profile_records_phases_and_counters(streaming):
+    page = ROOT / 'Startup.html'
+    profile = ParseProfile()
+    model = HtmlParser.load_from_file(str(page), streaming=streaming, profile=profile)
+
+    expected_phases = {'read', 'parse'} if streaming else {'tree', 'css', 'footer', 'select', 'model'}
+    assert expected_phases <= set(profile.phases)
+    assert profile.total == pytest.approx(sum(profile.phases.values()))
+    assert profile.counters == {
+        'bytes': page.stat().st_size,
+        'cards': len(model.cards),
+        'links': sum(len(card.links) + sum(map(len, card.subsections.values())) for card in model.cards),
+    }
+    assert model.to_dict() == HtmlParser.load_from_file(str(page), streaming=streaming).to_dict()
+    assert json.loads(profile.to_json())['counters']['cards'] == len(model.cards)
+
+
+def test_profile_of_lazy_load_counts_only_loaded_links():
+    profile = ParseProfile()
+    model = HtmlParser.load_from_file(str(ROOT / 'Startup.html'), lazy=True, profile=profile)
+
+    assert {'scan', 'model'} <= set(profile.phases)
+    assert profile.counters['cards'] == len(model.cards) and profile.counters['links'] == 0
+    assert not any(card.is_loaded for card in model.cards)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Tests for tools/linkchecker.py against local stub servers (tools/stub_server.py).
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(parent_dir, 'tools'))
+
+from link_cache import LinkCache, default_cache_file
+from linkchecker import LinkChecker, LinkOccurrence, describe_occurrences, index_links
+from stub_server import StubServer
+
+
+@pytest.fixture
+def server():
+    with StubServer(latency=0.01) as stub:
+        yield stub
+
+
+def check(checker, urls):
+    with checker:
+        return sorted(checker.check_urls(urls))
+
+
+def test_thread_engine_reports_status_of_each_url(server):
+    urls = [server.url('/ok'), server.url('/status/404'), server.url('/status/301'), 'ftp://example.com/']
+    results = {url: (is_valid, status, error) for url, is_valid, status, error in
+               check(LinkChecker(max_workers=4), urls)}
+
+    assert results[server.url('/ok')] == (True, 200, '')
+    assert results[server.url('/status/404')] == (False, 404, 'HTTP Error: 404')
+    assert results['ftp://example.com/'] == (False, 0, 'Skipped: Non-HTTP URL')
+
+
+def test_async_engine_matches_thread_engine(server):
+    pytest.importorskip('aiohttp')
+    urls = [server.url(f'/page/{i}') for i in range(40)] + [server.url('/status/500'), 'ftp://example.com/']
+
+    assert check(LinkChecker(engine='async', concurrency=50), urls) == \
+        check(LinkChecker(max_workers=8), urls)
+
+
+def test_async_engine_limits_requests_per_host_and_reuses_connections():
+    pytest.importorskip('aiohttp')
+    with StubServer(latency=0.02) as busy, StubServer(latency=0.02) as other:
+        urls = [busy.url(f'/page/{i}') for i in range(60)] + [other.url(f'/page/{i}') for i in range(10)]
+        checker = LinkChecker(engine='async', concurrency=100, per_host=4)
+        results = check(checker, urls)
+
+    assert all(is_valid for _, is_valid, _, _ in results)
+    assert busy.max_in_flight <= 4
+    assert busy.requests == 60 and busy.connections <= 4
+    assert checker.connection_stats() == (busy.connections + other.connections, 70)
+
+
+def test_async_engine_does_not_time_out_requests_waiting_for_a_slot():
+    pytest.importorskip('aiohttp')
+    with contextlib.ExitStack() as stack:
+        servers = [stack.enter_context(StubServer(latency=0.1)) for _ in range(5)]
+        urls = [server.url(f'/page/{i}') for server in servers for i in range(8)]
+        urls += [servers[0].url('/status/404')]
+        # 41 requests four at a time take about 1 s, twice the timeout
+        async_results = check(LinkChecker(engine='async', concurrency=4, per_host=4, timeout=0.5), urls)
+        thread_results = check(LinkChecker(max_workers=4, timeout=0.5), urls)
+
+    assert async_results == thread_results
+    assert sum(is_valid for _, is_valid, _, _ in async_results) == 40
+
+
+def test_thread_engine_reuses_one_connection_per_worker_and_host(server):
+    urls = [server.url(f'/page/{i}') for i in range(40)] + [server.url('/status/404')]
+    with LinkChecker(max_workers=4) as checker:
+        list(checker.check_urls(urls))
+        list(checker.check_urls(urls[:10]))  # a second file reuses the same workers
+
+        assert server.requests == 52  # HEAD for each URL, then GET for the 404s
+        assert server.connections <= 4
+        assert checker.connection_stats() == (server.connections, server.requests)
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        LinkChecker(engine='gevent')
+
+
+def test_check_file_reports_broken_links(server, tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text(f'<a href="{server.url("/ok")}">Fine</a>'
+                    f'<a href="{server.url("/status/404")}">Gone</a>', encoding='utf-8')
+    with LinkChecker(max_workers=2) as checker:
+        assert not checker.check_file(str(page))
+    assert checker.successful_links[str(page)] == [server.url('/ok')]
+    assert checker.broken_links[str(page)] == {server.url('/status/404'): ('Gone', 404, 'HTTP Error: 404')}
+
+
+def test_cache_skips_fresh_results_and_revalidates_stale_ones(server, tmp_path):
+    urls = [server.url(f'/page/{i}') for i in range(5)] + [server.url('/status/404')]
+    expected = check(LinkChecker(max_workers=2), urls)
+
+    with LinkCache(tmp_path / 'links.sqlite3', ttl_hours=1) as cache:
+        assert check(LinkChecker(max_workers=2, cache=cache), urls) == expected
+        assert (cache.hits, cache.revalidated, cache.misses) == (0, 0, 6)
+
+        requests = server.requests
+        assert check(LinkChecker(max_workers=2, cache=cache), urls) == expected
+        assert server.requests == requests and cache.hits == 6
+
+    # Past the TTL, valid results are revalidated and broken ones checked again
+    with LinkCache(tmp_path / 'links.sqlite3', ttl_hours=0) as cache:
+        assert check(LinkChecker(max_workers=2, cache=cache), urls) == expected
+        assert (cache.hits, cache.revalidated, cache.misses) == (0, 5, 1)
+        assert server.not_modified == 5
+        assert cache.get(urls[0]).final_url == urls[0] and cache.get(urls[0]).etag == '"/page/0"'
+
+
+def test_cache_does_not_keep_connection_errors(tmp_path):
+    with LinkCache(tmp_path / 'links.sqlite3') as cache:
+        results = check(LinkChecker(timeout=1, cache=cache), ['http://127.0.0.1:9/'])
+
+        assert results == [('http://127.0.0.1:9/', False, 0, 'Connection Error')]
+        assert cache.get('http://127.0.0.1:9/') is None
+        assert (cache.hits, cache.revalidated, cache.misses) == (0, 0, 1)
+
+
+def test_cache_does_not_count_skipped_urls(tmp_path):
+    urls = ['mailto:me@example.com', 'ftp://files.example.com/']
+    with LinkCache(tmp_path / 'links.sqlite3') as cache:
+        results = check(LinkChecker(cache=cache), urls)
+
+        assert [status for _, _, status, _ in results] == [0, 0]
+        assert (cache.hits, cache.revalidated, cache.misses) == (0, 0, 0)
+
+
+def test_cache_file_follows_xdg_cache_home(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert default_cache_file() == tmp_path / 'startup-dashboard-editor' / 'link-cache.sqlite3'
+
+    for value in ('', 'relative/cache'):
+        monkeypatch.setenv('XDG_CACHE_HOME', value)
+        assert default_cache_file() == \
+            Path.home() / '.cache' / 'startup-dashboard-editor' / 'link-cache.sqlite3'
+
+
+def test_check_files_fetches_each_url_once_across_files(server, tmp_path):
+    shared, gone = server.url('/shared'), server.url('/status/404')
+    first = tmp_path / 'index.html'
+    first.write_text(f'<a href="{shared}">A</a><a href="{shared}/#top">A again</a>'
+                     f'<a href="{gone}">Gone</a><a href="{gone}">Gone again</a>', encoding='utf-8')
+    second = tmp_path / 'Startup.html'
+    second.write_text(f'<a href="{shared}?utm_source=page">B</a><a href="{gone}">Still gone</a>'
+                      f'<a href="{server.url("/only-here")}">C</a>', encoding='utf-8')
+
+    with LinkChecker(max_workers=4) as checker:
+        assert not checker.check_files([str(first), str(second)])
+
+    assert server.requests == 4  # HEAD for each of 3 URLs, then GET for the 404
+    assert checker.successful_links[str(first)] == [shared, f'{shared}/#top']
+    assert sorted(checker.successful_links[str(second)]) == \
+        sorted([f'{shared}?utm_source=page', server.url('/only-here')])
+    assert checker.broken_links[str(first)] == {gone: ('Gone', 404, 'HTTP Error: 404')}
+    assert checker.broken_links[str(second)] == {gone: ('Still gone', 404, 'HTTP Error: 404')}
+
+
+def test_check_files_continues_past_missing_files(server, tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text(f'<a href="{server.url("/ok")}">Fine</a>', encoding='utf-8')
+
+    with LinkChecker(max_workers=2) as checker:
+        assert not checker.check_files([str(tmp_path / 'missing.html'), str(page)])
+    assert checker.successful_links[str(page)] == [server.url('/ok')]
+
+
+def test_extracted_links_record_line_and_card():
+    page = ('<main>\n'
+            '<section class="card"><h2 class="card-title">News</h2>\n'
+            '<a href="https://a.example/">A</a>\n'
+            '<a href="https://a.example#top">A again</a></section>\n'
+            '<a href="https://b.example/x/?utm_source=feed">B</a>\n'
+            '<a href="mailto:me@example.com">Mail</a></main>\n')
+    links = LinkChecker()._extract_links(page, file_path='page.html')
+
+    assert links == [
+        LinkOccurrence('page.html', 'https://a.example/', 'A', 3, 'News'),
+        LinkOccurrence('page.html', 'https://a.example#top', 'A again', 4, 'News'),
+        LinkOccurrence('page.html', 'https://b.example/x/?utm_source=feed', 'B', 5, ''),
+    ]
+    assert [len(anchors) for anchors in index_links(links).values()] == [2, 1]
+    assert describe_occurrences(links[:2]) == 'line 3 (News), line 4 (News)'
+
+
+def report_seconds(server, tmp_path, anchors, unique=200):
+    """Time checking and reporting a page of broken anchors leading to unique URLs."""
+    page = tmp_path / f'{anchors}.html'
+    page.write_text('\n'.join(f'<a href="{server.url(f"/status/404?k={i % unique}")}#a{i}">Link {i}</a>'
+                              for i in range(anchors)), encoding='utf-8')
+    with LinkChecker(max_workers=8) as checker, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        assert not checker.check_files([str(page)])
+        checker.report()
+        elapsed = time.perf_counter() - start
+    assert len(checker.broken_links[str(page)]) == anchors
+    return elapsed
+
+
+def test_broken_link_reporting_scales_linearly_to_50k_anchors(tmp_path):
+    with StubServer() as server:
+        report_seconds(server, tmp_path, 1000)  # warm up connections and imports
+        small = report_seconds(server, tmp_path, 5000)
+        large = report_seconds(server, tmp_path, 50000)
+
+    # Ten times the anchors: about ten times the time when linear, a
+    # hundred times when each broken result scans all links
+    assert large < small * 25
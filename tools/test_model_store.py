@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for src/utils/model_store.py.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.models.card_model import Card, Link
+from src.utils.html_parser import HtmlParser
+from src.utils.model_store import (ModelFormatError, load_model, load_page, model_path_for,
+                                   save_model, save_page)
+
+STARTUP_HTML = Path(parent_dir) / 'Startup.html'
+
+
+def copy_page(tmp_path):
+    page = tmp_path / 'Startup.html'
+    page.write_bytes(STARTUP_HTML.read_bytes())
+    return page
+
+
+def test_model_file_round_trips_styles_and_subsections(tmp_path):
+    page = copy_page(tmp_path)
+    model = HtmlParser.load_from_file(str(page))
+    card = model.cards[0]
+    card.background_color = '#fafafa'
+    card.links[0].font_color = '#ff0000'
+    card.add_subsection_link('Weekend Reading', Link(name='Essay', url='https://essay.example/'))
+    save_page(model, str(page))
+
+    loaded, html_path = load_page(str(page))
+    assert html_path == str(page)
+    assert loaded.to_dict() == model.to_dict()
+    assert 'Weekend Reading' in loaded.cards[0].subsections
+    assert not loaded.dirty
+
+    # Opening the model file itself gives the same model and the same page
+    loaded, html_path = load_page(model_path_for(str(page)))
+    assert html_path == str(page)
+    assert loaded.to_dict() == model.to_dict()
+
+
+def test_page_is_reparsed_after_outside_edit(tmp_path):
+    page = copy_page(tmp_path)
+    model = HtmlParser.load_from_file(str(page))
+    save_page(model, str(page))
+
+    page.write_text(page.read_text(encoding='utf-8').replace('Search Engines', 'Finders'),
+                    encoding='utf-8')
+    loaded, _ = load_page(str(page))
+    assert loaded.cards[0].title == 'Finders'
+
+
+def test_reparsed_page_keeps_styles(tmp_path):
+    page = copy_page(tmp_path)
+    model = HtmlParser.load_from_file(str(page))
+    model.cards[0].background_color = '#fafafa'
+    model.cards[0].links[0].font_size = '14px'
+    model.cards[0].links[0].font_color = '#ff0000'
+    save_page(model, str(page))
+
+    page.write_text(page.read_text(encoding='utf-8').replace('Search Engines', 'Finders'),
+                    encoding='utf-8')
+    loaded, _ = load_page(str(page))
+    card = loaded.cards[0]
+    assert (card.title, card.background_color) == ('Finders', '#fafafa')
+    assert (card.links[0].font_size, card.links[0].font_color) == ('14px', '#ff0000')
+
+
+def test_save_after_loading_model_file_is_incremental(tmp_path):
+    page = copy_page(tmp_path)
+    save_page(HtmlParser.load_from_file(str(page)), str(page))
+
+    loaded, _ = load_page(str(page))
+    assert loaded.layout is not None and loaded.layout.matches(str(page))
+
+
+def test_invalid_model_file_is_rejected(tmp_path):
+    path = tmp_path / 'bad.model.jsonl'
+    path.write_text('{"format": "something-else"}\n', encoding='utf-8')
+    with pytest.raises(ModelFormatError):
+        load_model(str(path))
+
+    card = Card(title='Only')
+    model = HtmlParser.parse_html('<main class="main-grid"></main>')
+    model.add_card(card)
+    save_model(model, str(path))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{not json}\n')
+    with pytest.raises(ModelFormatError, match=':3:'):
+        load_model(str(path))
+
+
+def test_lazy_model_file_decodes_cards_on_demand(tmp_path):
+    page = copy_page(tmp_path)
+    model = HtmlParser.load_from_file(str(page))
+    model.cards[1].icon = 'star'
+    model.cards[1].background_color = '#fafafa'
+    save_page(model, str(page))
+
+    loaded, _ = load_page(str(page), lazy=True)
+    assert not any(card.is_loaded for card in loaded.cards)
+    assert [(card.title, card.icon, card.background_color) for card in loaded.cards] == \
+        [(card.title, card.icon, card.background_color) for card in model.cards]
+    assert loaded.to_dict() == model.to_dict()
+
+
+def test_model_save_rewrites_only_changed_cards(tmp_path):
+    page = copy_page(tmp_path)
+    save_page(HtmlParser.load_from_file(str(page)), str(page))
+    model_path = Path(model_path_for(str(page)))
+    before = model_path.read_bytes().splitlines()
+
+    loaded, _ = load_page(str(page), lazy=True)
+    loaded.cards[2].title = 'Renamed'
+    save_model(loaded, str(model_path))
+
+    after = model_path.read_bytes().splitlines()
+    assert [i for i, (old, new) in enumerate(zip(before[1:], after[1:])) if old != new] == [2]
+    assert load_model(str(model_path)).cards[2].title == 'Renamed'
+
+
+def test_model_save_after_page_save_rewrites_every_card(tmp_path):
+    page = copy_page(tmp_path)
+    model = HtmlParser.load_from_file(str(page))
+    model_path = model_path_for(str(page))
+    save_model(model, model_path)
+
+    # Saving the page alone marks the edit clean, so the model file must
+    # not be trusted to tell which of its lines are current
+    model.cards[0].title = 'Finders'
+    HtmlParser.save_to_file(model, str(page))
+    save_model(model, model_path, html_layout=model.layout)
+    assert load_model(model_path).cards[0].title == 'Finders'
+
+
+def test_version_1_model_file_still_loads(tmp_path):
+    path = tmp_path / 'old.model.jsonl'
+    path.write_text(
+        '{"format": "startup-page-model", "version": 1, "css_styles": "", '
+        '"dark_mode_enabled": false, "last_updated": "", "html": null}\n'
+        '{"title":"Old","links":[{"name":"A","url":"https://a.example/"}],"icon":"star"}\n',
+        encoding='utf-8')
+    for lazy in (False, True):
+        card = load_model(str(path), lazy=lazy).cards[0]
+        assert (card.title, card.icon, card.links[0].url) == ('Old', 'star', 'https://a.example/')
+
+
+def test_save_page_keeps_unedited_lazy_cards_unloaded(tmp_path):
+    page = copy_page(tmp_path)
+    # No model file yet, so the HTML page is opened and every model line is new
+    model, _ = load_page(str(page), lazy=True)
+    model.cards[1].title = 'Renamed'
+    save_page(model, str(page))
+    assert [card.is_loaded for card in model.cards[2:]] == [False] * len(model.cards[2:])
+    assert not model.cards[0].is_loaded
+
+    # Reopened from the model file: unedited lines are copied, not decoded
+    model, _ = load_page(str(page), lazy=True)
+    model.cards[0].add_link(Link(name='New', url='https://new.example/'))
+    save_page(model, str(page))
+    assert [card.is_loaded for card in model.cards[1:]] == [False] * len(model.cards[1:])
+
+    loaded, _ = load_page(str(page))
+    assert (loaded.cards[0].links[-1].url, loaded.cards[1].title) == ('https://new.example/', 'Renamed')
+    assert [card.title for card in loaded.cards] == [card.title for card in model.cards]
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for src/utils/page_scanner.py.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.utils.html_parser import HtmlParser
+from src.utils.page_scanner import scan_file, scan_meta, scan_page
+
+STARTUP_HTML = Path(parent_dir) / 'Startup.html'
+
+VERSIONED_HEAD = b'''<!DOCTYPE html>
+<html><head>
+    <meta charset="UTF-8">
+    <meta name="version" content="2.4.1">
+    <meta name="last-modified" content="2025-06-01">
+</head><body>
+<meta name="version" content="not in head">
+</body></html>'''
+
+
+def spans(scan):
+    return [(card.start, card.end, card.title) for card in scan.cards]
+
+
+def test_mapped_scan_matches_scan_of_bytes():
+    mapped = scan_file(str(STARTUP_HTML))
+    scanned = scan_page(STARTUP_HTML.read_bytes())
+
+    assert spans(mapped) == spans(scanned)
+    assert mapped.style == scanned.style and mapped.footer_updated == scanned.footer_updated
+    assert [card.title for card in mapped.cards] == \
+        [card.title for card in HtmlParser.load_from_file(str(STARTUP_HTML)).cards]
+
+
+def test_meta_tags_are_read_from_head_only(tmp_path):
+    assert scan_meta(VERSIONED_HEAD) == {'version': '2.4.1', 'last-modified': '2025-06-01'}
+
+    page = tmp_path / 'page.html'
+    page.write_bytes(VERSIONED_HEAD)
+    assert scan_file(str(page)).meta['version'] == '2.4.1'
+
+
+def test_empty_file_scans_as_empty_page(tmp_path):
+    page = tmp_path / 'empty.html'
+    page.write_bytes(b'')
+    scan = scan_file(str(page))
+
+    assert scan.cards == [] and scan.meta == {} and scan.style is None
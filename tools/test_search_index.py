@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for src/utils/search_index.py.
+"""
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.models.card_model import Card, Link, StartupPageModel
+from src.utils.html_parser import HtmlParser
+from src.utils.search_index import SearchIndex, tokenize_url
+
+STARTUP_HTML = Path(parent_dir) / 'Startup.html'
+
+
+def hit_names(hits):
+    return [(hit.card.title, hit.link.name if hit.link else None) for hit in hits]
+
+
+def test_url_tokens_skip_scheme_and_www():
+    assert tokenize_url('https://www.GitHub.com/user/repo?tab=stars') == [
+        'github', 'com', 'user', 'repo', 'tab', 'stars']
+
+
+def test_prefix_and_fuzzy_queries_on_startup_page():
+    model = HtmlParser.load_from_file(str(STARTUP_HTML))
+    index = SearchIndex(model)
+
+    hits = index.search('search eng')
+    assert ('Search Engines', None) in hit_names(hits)
+
+    # "gogle" is one edit away from "google"
+    assert not index.search('gogle')
+    fuzzy = index.search('gogle', fuzzy=True)
+    assert fuzzy and all('google' in (hit.link.url.lower() + hit.link.name.lower())
+                         for hit in fuzzy if hit.link)
+
+
+def test_index_follows_model_changes():
+    model = StartupPageModel()
+    card = Card(title='News')
+    link = Link(name='Example', url='https://example.org/')
+    card.add_link(link)
+    model.add_card(card)
+    index = SearchIndex(model)
+
+    link.url = 'https://weather.example.net/forecast'
+    assert index.search('org') == []
+    assert hit_names(index.search('forecast')) == [('News', 'Example')]
+
+    other = Card(title='Tools')
+    other.add_link(Link(name='Forecast tool', url='https://tools.example/'))
+    model.add_card(other)
+    assert [hit.card.title for hit in index.search('forecast')] == ['News', 'Tools']
+
+    card.remove_link(link)
+    model.remove_card(other)
+    assert index.search('forecast') == []
+    assert len(index) == 1  # only the title of "News" is left
+
+    index.close()
+    model.add_card(other)
+    assert index.search('tools') == []
+
+
+def test_queries_on_ten_thousand_links_take_under_a_frame():
+    rng = random.Random(8)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9)))
+             for _ in range(3000)]
+    model = StartupPageModel()
+    for _ in range(200):
+        card = Card(title=' '.join(rng.sample(words, 2)))
+        for _ in range(50):
+            card.add_link(Link(name=' '.join(rng.sample(words, 2)),
+                               url=f'https://{rng.choice(words)}.com/{rng.choice(words)}'))
+        model.add_card(card)
+    index = SearchIndex(model)
+    index.search(words[0], fuzzy=True)  # builds the fuzzy lookup table
+
+    for query in ('a', words[1][:2], words[2], words[3][:-1] + 'q', f'{words[4]} {words[5]}'):
+        for fuzzy in (False, True):
+            start = time.perf_counter()
+            index.matching_cards(query, fuzzy=fuzzy)
+            assert time.perf_counter() - start < 0.016
+
+
+def test_index_is_built_on_first_query_without_reading_lazy_cards_early():
+    model = HtmlParser.load_from_file(str(STARTUP_HTML), lazy=True)
+    index = SearchIndex(model)
+    model.cards[0].title = 'Finders'
+    assert not any(card.is_loaded for card in model.cards)
+
+    assert ('Finders', None) in hit_names(index.search('finders'))
+    assert all(card.is_loaded for card in model.cards)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for src/utils/url_index.py.
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path so we can import src
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, parent_dir)
+
+from src.models.card_model import Card, Link, StartupPageModel
+from src.utils.url_index import UrlIndex, duplicate_clusters, normalize_url
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('HTTPS://Example.COM/', 'https://example.com'),
+    ('http://example.com:80/path/', 'http://example.com/path'),
+    ('https://example.com:8443/Path', 'https://example.com:8443/Path'),
+    ('https://example.com/?b=2&utm_source=feed&a=1&fbclid=x', 'https://example.com?a=1&b=2'),
+    ('https://example.com/#', 'https://example.com'),
+    ('https://example.com/#section', 'https://example.com#section'),
+    ('  mailto:someone@example.com ', 'mailto:someone@example.com'),
+    ('relative/page.html', 'relative/page.html'),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def make_model():
+    model = StartupPageModel()
+    news = Card(title='News')
+    news.add_link(Link(name='Example', url='https://example.com/'))
+    news.add_link(Link(name='Other', url='https://other.example/'))
+    tools = Card(title='Tools')
+    tools.add_link(Link(name='Example again', url='HTTPS://EXAMPLE.com?utm_medium=x'))
+    tools.add_subsection_link('Additional Links', Link(name='Other', url='https://other.example'))
+    model.add_card(news)
+    model.add_card(tools)
+    return model
+
+
+def test_duplicate_clusters_group_by_normalized_url():
+    clusters = duplicate_clusters(make_model())
+    assert {url: [(card.title, link.name) for card, link in occurrences]
+            for url, occurrences in clusters.items()} == {
+        'https://example.com': [('News', 'Example'), ('Tools', 'Example again')],
+        'https://other.example': [('News', 'Other'), ('Tools', 'Other')],
+    }
+
+
+def test_index_follows_model_changes():
+    model = make_model()
+    index = UrlIndex(model)
+    news, tools = model.cards
+    assert index.clusters().keys() == duplicate_clusters(model).keys()
+
+    tools.links[0].url = 'https://unique.example/'
+    assert [card.title for card, _ in index.occurrences('https://example.com')] == ['News']
+
+    model.remove_card(tools)
+    assert index.clusters() == {}
+    assert index.occurrences('https://unique.example/') == []
+
+    added = Link(name='Copy', url='https://other.example/?utm_campaign=spring')
+    news.add_link(added)
+    assert [link.name for _, link in index.occurrences('https://OTHER.example')] == ['Other', 'Copy']
+
+    news.remove_links([added])
+    assert len(index.occurrences('https://other.example')) == 1
@@ -22,6 +22,20 @@ from typing import Tuple, Optional
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
+from src.utils.page_scanner import map_file, scan_meta
+
+# Version metadata meta tags: meta name -> version_info key
+META_NAMES = {
+    'version': 'version',
+    'last-modified': 'last_modified',
+    'github-repo': 'github_repo',
+}
+
+# version_info key -> pattern capturing the content, for pages fetched as text
+META_PATTERNS = {
+    key: re.compile(rf'<meta name="{name}" content="([^"]*)"') for name, key in META_NAMES.items()
+}
+
 class VersionChecker:
     """Check version of local Startup.html against GitHub repository."""
     
@@ -40,20 +54,10 @@ class VersionChecker:
         """Extract version metadata from HTML content."""
         version_info = {}
         
-        # Extract version meta tag
-        version_match = re.search(r'<meta name="version" content="([^"]*)"', html_content)
-        if version_match:
-            version_info['version'] = version_match.group(1)
-        
-        # Extract last-modified meta tag
-        modified_match = re.search(r'<meta name="last-modified" content="([^"]*)"', html_content)
-        if modified_match:
-            version_info['last_modified'] = modified_match.group(1)
-        
-        # Extract github-repo meta tag
-        repo_match = re.search(r'<meta name="github-repo" content="([^"]*)"', html_content)
-        if repo_match:
-            version_info['github_repo'] = repo_match.group(1)
+        for key, pattern in META_PATTERNS.items():
+            match = pattern.search(html_content)
+            if match:
+                version_info[key] = match.group(1)
         
         return version_info
     
@@ -64,10 +68,10 @@ class VersionChecker:
         if not os.path.exists(self.local_file_path):
             raise FileNotFoundError(f"Local file not found: {self.local_file_path}")
         
-        with open(self.local_file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        version_info = self.extract_version_info(content)
+        # Only the <head> of the memory-mapped file is scanned
+        with map_file(self.local_file_path) as data:
+            meta = scan_meta(data)
+        version_info = {key: meta[name] for name, key in META_NAMES.items() if name in meta}
         
         # Add file stats
         stat = os.stat(self.local_file_path)